@@ -0,0 +1,337 @@
+"""
+Analisis batch banyak file logger sekaligus.
+
+Setiap file dibaca secara streaming (read-only) di proses terpisah lewat
+process pool. Kolom 'Nilai KN' dan 'Timestamp' dimuat ke array NumPy lalu
+statistik per file dan per specimen dihitung secara vektor: puncak,
+rata-rata, laju pembebanan dan kuat tekan dari luas penampang specimen.
+Hasil semua file ditulis ke satu laporan Excel.
+
+Sheet format SERIAL (No, Timestamp, Nilai KN, Sumber, Raw Data/Keterangan)
+dan format manual (No, Timestamp, Nilai KN, Keterangan) sama-sama didukung,
+dengan nilai teks lama ('12,5') maupun sel angka. Deret SERIAL dipecah
+menjadi specimen dengan ambang yang sama seperti specimenDetector.py;
+setiap nilai manual dianggap hasil satu specimen (nilai puncak yang dicatat).
+
+Contoh:
+    python batchAnalysis.py pressure_data*.xlsx
+    python batchAnalysis.py data/ --luas 17671 --output laporan.xlsx
+"""
+import argparse
+import glob
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from cellFormat import baris_bertipe, format_kolom, ke_angka, ke_waktu, sel_write_only
+from specimenDetector import AMBANG_MULAI, MIN_SAMPEL, RASIO_GAGAL, SegmentPolicy
+
+# Luas penampang default: kubus beton 150 x 150 mm (mm²)
+LUAS_SPECIMEN = 22500.0
+LAPORAN = "laporan_analisis.xlsx"
+
+HEADER_FILE = ["File", "Format", "Baris", "Baris Serial", "Baris Manual", "Mulai", "Selesai",
+               "Durasi (s)", "Puncak KN", "Rata-rata KN", "Jumlah Specimen", "Kuat Tekan Maks (MPa)", "Error"]
+HEADER_SPECIMEN = ["File", "No", "Sumber", "Mulai", "Selesai", "Jumlah Sampel", "Puncak KN",
+                   "Rata-rata KN", "Laju (kN/s)", "Kuat Tekan (MPa)", "Akhir"]
+
+
+def _numpy():
+    """Modul NumPy, dengan pesan jelas jika belum terpasang"""
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("NumPy diperlukan untuk analisis batch (pip install numpy)") from None
+    return np
+
+
+def muat_kolom(excel_file):
+    """
+    Memuat kolom Timestamp, Nilai KN dan sumber sheet pertama sebagai array
+
+    Args:
+        excel_file (str): File Excel logger
+
+    Returns:
+        dict: {'format': 'SERIAL' atau 'MANUAL', 't': datetime64[s], 'kn': float64,
+               'manual': bool per baris}
+    """
+    np = _numpy()
+    from openpyxl import load_workbook
+
+    wb = load_workbook(excel_file, read_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = list(next(rows, None) or [])
+        if "Nilai KN" not in header:
+            raise ValueError("kolom 'Nilai KN' tidak ditemukan di sheet pertama")
+        i_kn = header.index("Nilai KN")
+        i_ts = header.index("Timestamp") if "Timestamp" in header else None
+        i_sumber = header.index("Sumber") if "Sumber" in header else None
+
+        waktu = []
+        kn = []
+        sumber = []
+        for row in rows:
+            if len(row) <= i_kn:
+                continue
+            nilai = ke_angka(row[i_kn])
+            if not isinstance(nilai, (int, float)) or isinstance(nilai, bool):
+                continue
+            kn.append(nilai)
+            ts = ke_waktu(row[i_ts]) if i_ts is not None and i_ts < len(row) else None
+            waktu.append(ts if hasattr(ts, "year") else None)
+            sumber.append(row[i_sumber] if i_sumber is not None and i_sumber < len(row) else None)
+    finally:
+        wb.close()
+
+    if i_sumber is None:
+        manual = np.ones(len(kn), dtype=bool)
+    else:
+        manual = np.array([s == "MANUAL" for s in sumber], dtype=bool)
+    return {
+        "format": "SERIAL" if i_sumber is not None else "MANUAL",
+        "t": np.array(waktu, dtype="datetime64[s]"),
+        "kn": np.array(kn, dtype=np.float64),
+        "manual": manual,
+    }
+
+
+def segmen_specimen(t, kn, policy):
+    """
+    Memecah deret nilai menjadi specimen, dengan aturan SpecimenDetector
+
+    Specimen mulai saat nilai >= ambang_mulai dan berakhir (termasuk sampel
+    penutupnya) saat nilai turun lebih dari rasio_gagal dari puncak berjalan
+    atau di bawah ambang_akhir. Specimen berikutnya baru bisa mulai setelah
+    ada nilai lain di bawah ambang_akhir. Pencarian di dalam setiap specimen
+    dilakukan secara vektor.
+
+    Args:
+        t (ndarray): Waktu datetime64
+        kn (ndarray): Nilai kN
+        policy (SegmentPolicy): Ambang deteksi
+
+    Returns:
+        list: (awal, akhir eksklusif, keterangan akhir) per specimen
+    """
+    np = _numpy()
+    n = len(kn)
+    atas = np.flatnonzero(kn >= policy.ambang_mulai)
+    bawah = np.flatnonzero(kn < policy.ambang_akhir)
+    segmen = []
+    i = 0
+    siap = True
+    while True:
+        if not siap:
+            # Menunggu nilai di bawah ambang_akhir setelah specimen sebelumnya
+            k = np.searchsorted(bawah, i)
+            if k == len(bawah):
+                break
+            i = int(bawah[k])
+        k = np.searchsorted(atas, i)
+        if k == len(atas):
+            break
+        a = int(atas[k])
+
+        # Sampel penutup paling lambat nilai pertama di bawah ambang_akhir
+        k = np.searchsorted(bawah, a)
+        batas = int(bawah[k]) + 1 if k < len(bawah) else n
+        seg = kn[a:batas]
+        puncak = np.maximum.accumulate(seg)
+        batas_turun = puncak * policy.rasio_gagal
+        tutup = np.flatnonzero((seg[1:] <= puncak[1:] - batas_turun[1:])
+                               | (seg[1:] < policy.ambang_akhir))
+        if len(tutup):
+            j = int(tutup[0]) + 1
+            # Jatuh sekaligus dalam satu sampel = gagal, turun bertahap = beban dilepas
+            akhir = "GAGAL" if seg[j - 1] - seg[j] >= batas_turun[j] else "UNLOADING"
+            b = a + j + 1
+        else:
+            akhir = "SESI BERAKHIR"
+            b = n
+        if b - a >= policy.min_sampel:
+            segmen.append((a, b, akhir))
+        i = b
+        siap = False
+    return segmen
+
+
+def analisis_file(excel_file, luas=LUAS_SPECIMEN, policy=None):
+    """
+    Statistik satu file logger
+
+    Args:
+        excel_file (str): File Excel logger
+        luas (float): Luas penampang specimen (mm²) untuk kuat tekan
+        policy (SegmentPolicy): Ambang segmentasi (default: SegmentPolicy())
+
+    Returns:
+        dict: {'file': baris ringkasan (list), 'specimen': daftar baris specimen}
+    """
+    np = _numpy()
+    policy = policy or SegmentPolicy()
+    nama = os.path.basename(excel_file)
+    try:
+        data = muat_kolom(excel_file)
+    except Exception as e:
+        return {"file": [nama, None, 0, 0, 0, None, None, None, None, None, 0, None, str(e)],
+                "specimen": []}
+
+    t, kn, manual = data["t"], data["kn"], data["manual"]
+    serial = ~manual
+    t_s, kn_s = t[serial], kn[serial]
+    specimen = []
+
+    for a, b, akhir in segmen_specimen(t_s, kn_s, policy):
+        seg = kn_s[a:b]
+        i_puncak = int(np.argmax(seg))
+        puncak = float(seg[i_puncak])
+        dt = (t_s[a + i_puncak] - t_s[a]) / np.timedelta64(1, "s")
+        laju = (puncak - float(seg[0])) / dt if dt > 0 else None
+        specimen.append([nama, len(specimen) + 1, "SERIAL", _waktu(t_s[a]), _waktu(t_s[b - 1]), b - a,
+                         round(puncak, 3), round(float(seg.mean()), 3),
+                         round(laju, 4) if laju is not None else None,
+                         round(puncak * 1000 / luas, 2), akhir])
+
+    # Setiap nilai manual adalah hasil (puncak) satu specimen
+    kn_m = kn[manual]
+    mpa_m = np.round(kn_m * 1000 / luas, 2)
+    for nilai, mpa, ts in zip(kn_m.tolist(), mpa_m.tolist(), t[manual]):
+        specimen.append([nama, len(specimen) + 1, "MANUAL", _waktu(ts), _waktu(ts), 1, nilai, nilai,
+                         None, mpa, "MANUAL"])
+
+    valid = t[~np.isnat(t)]
+    mulai = _waktu(valid.min()) if len(valid) else None
+    selesai = _waktu(valid.max()) if len(valid) else None
+    durasi = float((valid.max() - valid.min()) / np.timedelta64(1, "s")) if len(valid) else None
+    kuat = max((s[9] for s in specimen), default=None)
+    ringkas = [nama, data["format"], len(kn), int(serial.sum()), int(manual.sum()), mulai, selesai, durasi,
+               round(float(kn.max()), 3) if len(kn) else None,
+               round(float(kn_s.mean()), 3) if len(kn_s) else None,
+               len(specimen), kuat, None]
+    return {"file": ringkas, "specimen": specimen}
+
+
+def _waktu(nilai):
+    """datetime64 ke datetime untuk sel Excel, None untuk NaT"""
+    np = _numpy()
+    if np.isnat(nilai):
+        return None
+    return nilai.astype("datetime64[s]").item()
+
+
+def _analisis(args):
+    """Pembungkus analisis_file untuk process pool"""
+    return analisis_file(*args)
+
+
+def kumpulkan_file(pola, kecuali=()):
+    """
+    Daftar file Excel dari nama file, pola glob atau folder
+
+    Args:
+        pola (list): Nama file, pola (misal 'pressure_data*.xlsx') atau folder
+        kecuali (tuple): File yang dilewati, misal laporan itu sendiri
+
+    Returns:
+        list: Nama file unik, urut
+    """
+    kecuali = {os.path.abspath(f) for f in kecuali}
+    files = []
+    for p in pola:
+        if os.path.isdir(p):
+            cocok = sorted(glob.glob(os.path.join(p, "*.xlsx")))
+        else:
+            cocok = sorted(glob.glob(p)) or [p]
+        files.extend(f for f in cocok if os.path.abspath(f) not in kecuali)
+    return list(dict.fromkeys(files))
+
+
+def analisis_banyak(files, luas=LUAS_SPECIMEN, policy=None, proses=None):
+    """
+    Menganalisis banyak file secara paralel
+
+    Args:
+        files (list): File Excel logger
+        luas (float): Luas penampang specimen (mm²)
+        policy (SegmentPolicy): Ambang segmentasi (default: SegmentPolicy())
+        proses (int): Jumlah proses (default: jumlah CPU; 1 = tanpa pool)
+
+    Returns:
+        list: Hasil analisis_file() per file, urutan sama dengan files
+    """
+    _numpy()
+    tugas = [(f, luas, policy) for f in files]
+    if proses == 1 or len(files) < 2:
+        return [_analisis(t) for t in tugas]
+    with ProcessPoolExecutor(max_workers=proses) as pool:
+        return list(pool.map(_analisis, tugas))
+
+
+def tulis_laporan(hasil, output):
+    """
+    Menulis ringkasan per file dan per specimen ke satu file Excel
+
+    Args:
+        hasil (list): Hasil analisis_banyak()
+        output (str): File Excel laporan (ditimpa)
+    """
+    from openpyxl import Workbook
+
+    from excelWriter import simpan_atomik
+
+    wb = Workbook(write_only=True)
+    for judul, header, kunci in (("Ringkasan File", HEADER_FILE, "file"),
+                                 ("Specimen", HEADER_SPECIMEN, "specimen")):
+        ws = wb.create_sheet(judul)
+        ws.append(header)
+        formats = format_kolom(header)
+        for h in hasil:
+            rows = [h[kunci]] if kunci == "file" else h[kunci]
+            for row in rows:
+                ws.append(sel_write_only(ws, baris_bertipe(row, formats), formats))
+    simpan_atomik(wb, output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analisis batch file logger tekanan ke satu laporan Excel")
+    parser.add_argument("file", nargs="+", help="File Excel, pola (misal 'pressure_data*.xlsx') atau folder")
+    parser.add_argument("--output", default=LAPORAN, help=f"File laporan (default: {LAPORAN})")
+    parser.add_argument("--luas", type=float, default=LUAS_SPECIMEN,
+                        help=f"Luas penampang specimen dalam mm² (default: {LUAS_SPECIMEN:g}, kubus 150 mm)")
+    parser.add_argument("--ambang", type=float, default=AMBANG_MULAI, help="Ambang mulai pembebanan kN")
+    parser.add_argument("--rasio-gagal", type=float, default=RASIO_GAGAL, help="Penurunan dari puncak = gagal")
+    parser.add_argument("--min-sampel", type=int, default=MIN_SAMPEL)
+    parser.add_argument("--proses", type=int, default=None, help="Jumlah proses (default: jumlah CPU)")
+    args = parser.parse_args(argv)
+
+    if args.luas <= 0:
+        parser.error("--luas harus lebih dari 0")
+    files = kumpulkan_file(args.file, kecuali=(args.output,))
+    if not files:
+        print("Error: tidak ada file yang cocok", file=sys.stderr)
+        return 2
+
+    policy = SegmentPolicy(ambang_mulai=args.ambang, rasio_gagal=args.rasio_gagal, min_sampel=args.min_sampel)
+    hasil = analisis_banyak(files, args.luas, policy, args.proses)
+    tulis_laporan(hasil, args.output)
+
+    print(f"{'File':<32} | {'Format':<6} | {'Baris':>7} | {'Specimen':>8} | {'Puncak KN':>9} | MPa maks")
+    gagal = 0
+    for h in hasil:
+        r = h["file"]
+        if r[12]:
+            gagal += 1
+            print(f"{r[0]:<32} | ⚠ {r[12]}")
+            continue
+        puncak = f"{r[8]:.3f}" if r[8] is not None else "-"
+        kuat = f"{r[11]:.2f}" if r[11] is not None else "-"
+        print(f"{r[0]:<32} | {r[1]:<6} | {r[2]:>7} | {r[10]:>8} | {puncak:>9} | {kuat}")
+    jumlah = sum(len(h["specimen"]) for h in hasil)
+    print(f"✓ {len(hasil) - gagal} file, {jumlah} specimen -> {args.output}")
+    return 1 if gagal == len(hasil) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,259 @@
+"""
+Input manual sekaligus dari blok teks yang ditempel atau file CSV.
+
+Setiap baris berisi satu nilai kN, boleh disertai keterangan dan
+timestamp, misal hasil salinan dari log kertas atau CSV mesin lain:
+
+    25,5
+    31.2; retak miring
+    2026-10-16 08:15:00; 28,75; specimen B3
+    16/10/2026 08:20	30,1	specimen B4
+
+Kolom dipisah ';' atau tab (',' hanya untuk file CSV yang punya header,
+karena koma juga dipakai sebagai pemisah desimal). Jika ada header, kolom
+dipilih dari namanya ('Nilai KN'/'kN', 'Timestamp'/'Waktu'/'Tanggal',
+'Keterangan'). Tanpa header urutan kolom bebas: kolom angka pertama menjadi
+nilai kN, kolom tanggal menjadi timestamp, sisanya keterangan. Tanpa
+pemisah kolom, kata pertama adalah nilai dan sisanya keterangan.
+
+Semua baris diperiksa dulu; baris yang salah dilaporkan dan baris yang
+valid disimpan sekaligus dalam satu penulisan.
+"""
+import csv
+import math
+from datetime import datetime
+
+from cellFormat import ke_angka, ke_waktu
+
+# Format tanggal selain ISO yang diterima
+FORMAT_TANGGAL = ('%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y',
+                  '%d-%m-%Y %H:%M:%S', '%d-%m-%Y %H:%M', '%d-%m-%Y')
+
+KETERANGAN_DEFAULT = "Input batch"
+
+# Potongan nama kolom header (huruf kecil)
+HEADER_NILAI = ("nilai", "kn", "beban", "load", "value")
+HEADER_WAKTU = ("timestamp", "waktu", "tanggal", "time", "date")
+HEADER_KETERANGAN = ("keterangan", "catatan", "comment", "note")
+
+
+def baca_waktu(teks):
+    """
+    Timestamp dari teks ISO ('2026-10-16 08:15[:00]') atau 'DD/MM/YYYY HH:MM[:SS]'
+
+    Args:
+        teks (str): Isi kolom
+
+    Returns:
+        datetime: Waktu tanpa mikrodetik, atau None jika bukan tanggal
+    """
+    teks = teks.strip()
+    waktu = ke_waktu(teks)
+    if isinstance(waktu, datetime):
+        return waktu.replace(microsecond=0)
+    for fmt in FORMAT_TANGGAL:
+        try:
+            return datetime.strptime(teks, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _baca_nilai(teks):
+    """Nilai kN dari teks, None jika bukan angka yang valid"""
+    nilai = ke_angka(teks)
+    if not isinstance(nilai, float) or not math.isfinite(nilai):
+        return None
+    return nilai
+
+
+def _kolom(baris, pemisah=None):
+    """Memecah satu baris teks menjadi kolom"""
+    if pemisah is None:
+        pemisah = ';' if ';' in baris else '\t' if '\t' in baris else None
+    if pemisah is not None:
+        return [k.strip() for k in baris.split(pemisah)]
+
+    # Tanpa pemisah: 'nilai keterangan...' atau 'tanggal jam nilai keterangan...'
+    kata = baris.split()
+    for n in (2, 1):
+        if len(kata) > n and baca_waktu(" ".join(kata[:n])) is not None:
+            return [" ".join(kata[:n]), kata[n], " ".join(kata[n + 1:])]
+    return [kata[0], " ".join(kata[1:])] if kata else []
+
+
+def _cari_header(kolom, nama):
+    """Index kolom header pertama yang namanya mengandung salah satu potongan"""
+    for i, judul in enumerate(kolom):
+        judul = (judul or "").strip().lower()
+        if any(n in judul for n in nama):
+            return i
+    return None
+
+
+def baca_header(kolom):
+    """
+    Posisi kolom dari baris header
+
+    Args:
+        kolom (list): Isi kolom baris pertama
+
+    Returns:
+        dict: {'nilai', 'waktu', 'keterangan'} berisi index kolom, atau None
+              jika bukan header yang dikenal (tidak ada kolom nilai)
+    """
+    i_nilai = _cari_header(kolom, HEADER_NILAI)
+    if i_nilai is None:
+        return None
+    return {
+        "nilai": i_nilai,
+        "waktu": _cari_header(kolom, HEADER_WAKTU),
+        "keterangan": _cari_header(kolom, HEADER_KETERANGAN),
+    }
+
+
+def parse_kolom(kolom, header=None):
+    """
+    Nilai, keterangan dan timestamp dari kolom-kolom satu baris
+
+    Args:
+        kolom (list): Isi kolom (str)
+        header (dict): Posisi kolom dari baca_header(), None = tebak dari isi
+
+    Returns:
+        tuple: (nilai float, keterangan str atau None, timestamp datetime atau None)
+
+    Raises:
+        ValueError: Jika tidak ada nilai kN atau timestamp tidak valid
+    """
+    if header is not None:
+        return _parse_dengan_header(kolom, header)
+
+    nilai = None
+    waktu = None
+    keterangan = []
+    for isi in kolom:
+        isi = (isi or "").strip()
+        if not isi:
+            continue
+        if nilai is None:
+            angka = _baca_nilai(isi)
+            if angka is not None:
+                nilai = angka
+                continue
+        if waktu is None:
+            w = baca_waktu(isi)
+            if w is not None:
+                waktu = w
+                continue
+        keterangan.append(isi)
+
+    if nilai is None:
+        raise ValueError("tidak ada nilai kN yang valid")
+    return nilai, " ".join(keterangan) or None, waktu
+
+
+def _parse_dengan_header(kolom, header):
+    """parse_kolom() untuk baris dengan posisi kolom yang diketahui"""
+    def isi(kunci):
+        i = header[kunci]
+        return (kolom[i] or "").strip() if i is not None and i < len(kolom) else ""
+
+    teks_nilai = isi("nilai")
+    nilai = _baca_nilai(teks_nilai)
+    if nilai is None:
+        raise ValueError(f"nilai kN tidak valid: '{teks_nilai}'" if teks_nilai else "kolom nilai kN kosong")
+    waktu = None
+    if isi("waktu"):
+        waktu = baca_waktu(isi("waktu"))
+        if waktu is None:
+            raise ValueError(f"timestamp tidak dikenal: '{isi('waktu')}'")
+    return nilai, isi("keterangan") or None, waktu
+
+
+def parse_baris(lines, pemisah=None):
+    """
+    Memeriksa semua baris sebelum ada yang disimpan
+
+    Baris kosong dilewati, begitu juga baris pertama tanpa angka jika
+    dikenali sebagai header (ada kolom nilai). Baris pertama tanpa angka
+    lainnya dilaporkan sebagai baris tidak valid.
+
+    Args:
+        lines (iterable): Baris teks, atau list kolom (dari csv.reader)
+        pemisah (str): Pemisah kolom, None = deteksi per baris
+
+    Returns:
+        tuple: (valid, salah); valid berisi (nomor baris, nilai, keterangan, timestamp),
+               salah berisi (nomor baris, isi baris, alasan)
+    """
+    valid = []
+    salah = []
+    header = None
+    for n, baris in enumerate(lines, 1):
+        if isinstance(baris, str):
+            teks = baris.strip()
+            kolom = _kolom(teks, pemisah) if teks else []
+        else:
+            kolom = list(baris)
+            teks = ";".join(kolom)
+        if not any(k.strip() for k in kolom):
+            continue
+        if not valid and not salah and header is None and all(_baca_nilai(k) is None for k in kolom):
+            # Baris pertama tanpa angka: header jika ada kolom nilai
+            header = baca_header(kolom)
+            if header is not None:
+                continue
+        try:
+            valid.append((n, *parse_kolom(kolom, header)))
+        except ValueError as e:
+            salah.append((n, teks, str(e)))
+    return valid, salah
+
+
+def baca_csv(path):
+    """
+    Membaca dan memeriksa file CSV
+
+    Pemisah kolom ';' atau tab dipakai jika ada di file. Koma hanya
+    dianggap pemisah jika baris pertama berupa header berkoma, karena
+    '25,5' tanpa header adalah angka dengan koma desimal.
+
+    Args:
+        path (str): Nama file CSV atau teks
+
+    Returns:
+        tuple: (valid, salah) seperti parse_baris()
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        contoh = f.read(4096)
+        f.seek(0)
+        pertama = contoh.splitlines()[0] if contoh else ""
+        if ';' in contoh:
+            pemisah = ';'
+        elif '\t' in contoh:
+            pemisah = '\t'
+        elif ',' in pertama and all(_baca_nilai(k) is None for k in pertama.split(',')):
+            pemisah = ','
+        else:
+            # Satu nilai per baris, atau 'nilai keterangan' dipisah spasi
+            return parse_baris(f)
+        return parse_baris(csv.reader(f, delimiter=pemisah))
+
+
+def baris_writer(valid, nomor_awal, keterangan_default=KETERANGAN_DEFAULT, waktu_default=None):
+    """
+    Baris siap simpan ['No', 'Timestamp', 'Nilai KN', 'Keterangan']
+
+    Args:
+        valid (list): Hasil parse_baris()
+        nomor_awal (int): Nomor 'No' baris pertama
+        keterangan_default (str): Keterangan jika kolom kosong
+        waktu_default (datetime): Timestamp jika kolom kosong (default: sekarang)
+
+    Returns:
+        list: Baris untuk writer
+    """
+    waktu_default = waktu_default or datetime.now().replace(microsecond=0)
+    return [[nomor_awal + i, waktu or waktu_default, nilai, keterangan or keterangan_default]
+            for i, (_, nilai, keterangan, waktu) in enumerate(valid)]
@@ -0,0 +1,437 @@
+"""
+Memutar ulang trace mentah dari mesin tekan ke baca_dan_simpan_ke_excel
+lewat port serial virtual (pty di Linux/Mac, atau pasangan port null-modem
+virtual seperti com0com di Windows), lalu mengukur:
+
+- baris/detik yang tersimpan
+- latency dari byte dikirim sampai baris tersimpan di file (tidak untuk
+  mode stream: shard baru tertulis ke disk saat ditutup)
+- frame yang hilang
+- puncak RSS proses logger dibanding ukuran file
+
+Contoh:
+    python benchReplay.py --rate 10 100 0 --isi-awal 0 20000
+    python benchReplay.py --rekam COM3 --durasi 60 --trace traces/mesin1.txt
+    python benchReplay.py --json hasil.json --baseline baseline.json
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+TRACE_DEFAULT = os.path.join(DIR, "traces", "ovalue_contoh.txt")
+
+
+def baca_trace(path):
+    """
+    Membaca trace mentah, satu frame per baris (terminator asli dipertahankan)
+
+    Args:
+        path (str): File trace
+
+    Returns:
+        list: Daftar frame (bytes)
+    """
+    with open(path, "rb") as f:
+        return [line for line in f if line.strip()]
+
+
+def rekam_trace(port, baud, path, durasi):
+    """
+    Merekam frame mentah dari mesin asli ke file trace
+
+    Args:
+        port (str): Nama port mesin
+        baud (int): Baud rate
+        path (str): File trace tujuan
+        durasi (float): Lama perekaman dalam detik
+    """
+    import serial
+
+    batas = time.monotonic() + durasi
+    jumlah = 0
+    with serial.Serial(port, baud, timeout=0.5) as ser, open(path, "wb") as f:
+        while time.monotonic() < batas:
+            if line := ser.readline():
+                f.write(line)
+                jumlah += 1
+    print(f"✓ {jumlah} frame direkam ke {path}")
+
+
+def isi_file_awal(excel_file, jumlah, storage="excel"):
+    """
+    Membuat file Excel berisi sejumlah baris agar ukuran file bisa divariasikan
+
+    Args:
+        excel_file (str): Nama file Excel
+        jumlah (int): Jumlah baris data
+        storage (str): 'sqlite' = isi database, selain itu isi workbook
+    """
+    if storage == "sqlite":
+        from sqliteWriter import buat_skema, buka_database, database_path
+        con = buka_database(database_path(excel_file))
+        buat_skema(con, ["No", "Timestamp", "Nilai KN", "Sumber", "Raw Data/Keterangan"], "Pressure Data")
+        con.execute("BEGIN")
+        con.executemany("INSERT INTO data (no, timestamp, nilai_kn, sumber, keterangan) VALUES (?, ?, ?, ?, ?)",
+                        ((no, "2026-01-01 00:00:00", 12.5, "SERIAL", "ovalue 12,5 kN")
+                         for no in range(1, jumlah + 1)))
+        con.execute("COMMIT")
+        con.close()
+        return
+
+    from openpyxl import Workbook
+
+    from resumeIndex import tulis_index
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Pressure Data")
+    ws.append(["No", "Timestamp", "Nilai KN", "Sumber", "Raw Data/Keterangan"])
+    waktu = datetime(2026, 1, 1)
+    for no in range(1, jumlah + 1):
+        ws.append([no, waktu, 12.5, "SERIAL", "ovalue 12,5 kN"])
+    wb.save(excel_file)
+    tulis_index(excel_file, jumlah + 1, jumlah, "2026-01-01 00:00:00")
+
+
+def _last_no_tersimpan(excel_file, storage):
+    """Nomor 'No' terakhir yang sudah tersimpan di file, dari index/manifest/database"""
+    if storage == "sqlite":
+        import sqlite3
+
+        from sqliteWriter import buka_database, database_path
+        try:
+            con = buka_database(database_path(excel_file), baca_saja=True)
+            try:
+                return con.execute("SELECT COALESCE(MAX(no), 0) FROM data").fetchone()[0]
+            finally:
+                con.close()
+        except sqlite3.Error:
+            return 0
+    if storage == "stream":
+        from shardedWriter import baca_manifest
+        try:
+            closed = [s for s in baca_manifest(excel_file) if s.get("closed")]
+        except (OSError, ValueError):
+            return 0
+        return closed[-1]["last_no"] if closed else 0
+
+    try:
+        with open(excel_file + ".idx", "r", encoding="utf-8") as f:
+            return int(json.load(f).get("last_no") or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _rss_kb(pid):
+    """RSS proses saat ini dalam kB (Linux), None jika tidak tersedia"""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _buka_port_virtual():
+    """
+    Membuat pasangan pty mentah
+
+    Returns:
+        tuple: (fd master untuk menulis, nama port untuk logger)
+    """
+    import pty
+    import tty
+
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    return master, os.ttyname(slave)
+
+
+def jalankan_replay(frames, rate, baud=9600, excel_file="bench_pressure_data.xlsx",
+                    storage="excel", flush_rows=50, flush_interval=5.0,
+                    isi_awal=0, port_pasangan=None, batas_tunggu=30.0):
+    """
+    Menjalankan satu putaran replay terhadap proses logger terpisah
+
+    Args:
+        frames (list): Frame trace yang dikirim
+        rate (float): Frame per detik, 0 = secepat baud rate
+        baud (int): Baud rate logger (juga batas kecepatan kirim)
+        excel_file (str): File Excel hasil benchmark (ditimpa)
+        storage (str): Mode penyimpanan logger ('excel', 'stream' atau 'sqlite')
+        flush_rows (int): FlushPolicy.max_rows
+        flush_interval (float): FlushPolicy.max_interval
+        isi_awal (int): Jumlah baris yang sudah ada di file sebelum mulai
+        port_pasangan (tuple): (port kirim, port logger) untuk null-modem virtual
+        batas_tunggu (float): Detik menunggu baris terakhir tersimpan
+
+    Returns:
+        dict: Hasil pengukuran
+    """
+    _bersihkan(excel_file)
+    if isi_awal:
+        isi_file_awal(excel_file, isi_awal, storage)
+
+    if port_pasangan:
+        import serial
+        kirim_ser = serial.Serial(port_pasangan[0], baud)
+        tulis = kirim_ser.write
+        port_logger = port_pasangan[1]
+    else:
+        master, port_logger = _buka_port_virtual()
+        kirim_ser = None
+        tulis = lambda b: os.write(master, b)
+
+    kode = (
+        "import signal, sys; sys.path.insert(0, {dir!r})\n"
+        # Windows: Ctrl+Break dari proses benchmark diperlakukan seperti Ctrl+C
+        "if hasattr(signal, 'SIGBREAK'): signal.signal(signal.SIGBREAK, signal.default_int_handler)\n"
+        "import connectionPortsTest as c\n"
+        "from excelWriter import FlushPolicy\n"
+        "c.baca_dan_simpan_ke_excel({port!r}, {baud}, 8, {file!r}, "
+        "FlushPolicy({rows}, {interval}), storage={storage!r})\n"
+    ).format(dir=DIR, port=port_logger, baud=baud, file=excel_file,
+             rows=flush_rows, interval=flush_interval, storage=storage)
+    proc = subprocess.Popen([sys.executable, "-c", kode], stdin=subprocess.DEVNULL,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0)
+
+    # Logger siap saat journal sudah dibuka
+    batas = time.monotonic() + batas_tunggu
+    while not os.path.exists(_file_hasil(excel_file, storage) + ".journal"):
+        if proc.poll() is not None or time.monotonic() > batas:
+            raise RuntimeError(f"Logger gagal mulai: {proc.stderr.read().decode(errors='ignore')}") # type: ignore
+        time.sleep(0.01)
+
+    no_awal = _last_no_tersimpan(excel_file, storage)
+    ovalue = [f for f in frames if b"ovalue" in f.lower()]
+    waktu_kirim = []
+    waktu_simpan = {}
+    peak_rss = [0]
+    berhenti = threading.Event()
+
+    def pantau():
+        """Mencatat kapan setiap baris tersimpan dan puncak RSS"""
+        while not berhenti.is_set():
+            tersimpan = _last_no_tersimpan(excel_file, storage) - no_awal
+            sekarang = time.monotonic()
+            for i in range(len(waktu_simpan), min(tersimpan, len(waktu_kirim))):
+                waktu_simpan[i] = sekarang
+            rss = _rss_kb(proc.pid)
+            if rss:
+                peak_rss[0] = max(peak_rss[0], rss)
+            time.sleep(0.005)
+
+    pemantau = threading.Thread(target=pantau, daemon=True)
+    pemantau.start()
+
+    # Kirim frame; rate 0 berarti dibatasi baud (10 bit per byte)
+    detik_per_byte = 10.0 / baud
+    jeda = 1.0 / rate if rate else 0.0
+    mulai = time.monotonic()
+    berikut = mulai
+    for frame in frames:
+        if b"ovalue" in frame.lower():
+            waktu_kirim.append(time.monotonic())
+        tulis(frame)
+        berikut += max(jeda, len(frame) * detik_per_byte)
+        tidur = berikut - time.monotonic()
+        if tidur > 0:
+            time.sleep(tidur)
+    durasi_kirim = time.monotonic() - mulai
+
+    # Tunggu semua baris tersimpan (paling lama flush_interval + batas_tunggu).
+    # Mode stream tidak ditunggu: shard baru muncul di disk saat logger berhenti.
+    batas = time.monotonic() + flush_interval + batas_tunggu
+    while storage != "stream" and len(waktu_simpan) < len(ovalue) and time.monotonic() < batas:
+        time.sleep(0.01)
+
+    # Hentikan logger seperti Ctrl+C: sesi diakhiri dan sisa buffer disimpan
+    proc.send_signal(signal.CTRL_BREAK_EVENT if os.name == "nt" else signal.SIGINT)
+    proc.wait(timeout=flush_interval + batas_tunggu)
+    berhenti.set()
+    pemantau.join()
+    if kirim_ser is not None:
+        kirim_ser.close()
+    else:
+        os.close(master)
+
+    tersimpan = _last_no_tersimpan(excel_file, storage) - no_awal
+    # Latency stream hanya mengukur penutupan shard, jadi tidak dilaporkan
+    latency = [] if storage == "stream" else sorted(waktu_simpan[i] - waktu_kirim[i] for i in waktu_simpan)
+    waktu_akhir = max(waktu_simpan.values()) if waktu_simpan else time.monotonic()
+
+    return {
+        "rate": rate,
+        "storage": storage,
+        "isi_awal": isi_awal,
+        "frame_dikirim": len(ovalue),
+        "baris_tersimpan": tersimpan,
+        "frame_hilang": max(0, len(ovalue) - tersimpan),
+        "durasi_kirim_s": round(durasi_kirim, 3),
+        "baris_per_detik": round(tersimpan / max(waktu_akhir - mulai, 1e-9), 1),
+        "latency_p50_ms": _persentil_ms(latency, 0.50),
+        "latency_p95_ms": _persentil_ms(latency, 0.95),
+        "latency_max_ms": _persentil_ms(latency, 1.0),
+        "peak_rss_mb": round(peak_rss[0] / 1024, 1) if peak_rss[0] else None,
+        "ukuran_file_kb": round(_ukuran_file(excel_file, storage) / 1024, 1),
+    }
+
+
+def _persentil_ms(nilai_urut, p):
+    """Persentil dari daftar latency terurut, dalam milidetik"""
+    if not nilai_urut:
+        return None
+    i = min(len(nilai_urut) - 1, int(p * (len(nilai_urut) - 1) + 0.5))
+    return round(nilai_urut[i] * 1000, 1)
+
+
+def _file_hasil(excel_file, storage):
+    """File yang ditulis logger: workbook, atau database untuk mode sqlite"""
+    if storage == "sqlite":
+        from sqliteWriter import database_path
+        return database_path(excel_file)
+    return excel_file
+
+
+def _ukuran_file(excel_file, storage):
+    """Total ukuran file hasil (semua shard untuk mode stream, termasuk WAL untuk sqlite)"""
+    if storage == "sqlite":
+        db_file = _file_hasil(excel_file, storage)
+        return sum(os.path.getsize(p) for p in (db_file, db_file + "-wal") if os.path.exists(p))
+    if storage == "stream":
+        from shardedWriter import baca_manifest
+        return sum(os.path.getsize(s["file"]) for s in baca_manifest(excel_file)
+                   if os.path.exists(s["file"]))
+    return os.path.getsize(excel_file) if os.path.exists(excel_file) else 0
+
+
+def _bersihkan(excel_file):
+    """Menghapus file hasil benchmark sebelumnya"""
+    from shardedWriter import baca_manifest, manifest_path
+    from sqliteWriter import database_path
+
+    try:
+        for s in baca_manifest(excel_file):
+            if os.path.exists(s["file"]):
+                os.remove(s["file"])
+    except (OSError, ValueError):
+        pass
+    for path in (excel_file, excel_file + ".idx", excel_file + ".journal",
+                 excel_file + ".tmp", manifest_path(excel_file)):
+        if os.path.exists(path):
+            os.remove(path)
+    db_file = database_path(excel_file)
+    for path in (db_file, db_file + "-wal", db_file + "-shm", db_file + ".journal"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def cek_regresi(hasil, baseline, toleransi):
+    """
+    Membandingkan hasil dengan baseline
+
+    Args:
+        hasil (list): Hasil benchmark sekarang
+        baseline (list): Hasil benchmark acuan
+        toleransi (float): Penurunan relatif yang masih diterima (misal 0.2 = 20%)
+
+    Returns:
+        list: Pesan regresi, kosong jika tidak ada
+    """
+    acuan = {(b["rate"], b["storage"], b["isi_awal"]): b for b in baseline}
+    pesan = []
+    for h in hasil:
+        b = acuan.get((h["rate"], h["storage"], h["isi_awal"]))
+        if b is None:
+            continue
+        kunci = f"rate={h['rate']} storage={h['storage']} isi_awal={h['isi_awal']}"
+        if h["frame_hilang"] > b["frame_hilang"]:
+            pesan.append(f"{kunci}: frame hilang {b['frame_hilang']} -> {h['frame_hilang']}")
+        if h["baris_per_detik"] < b["baris_per_detik"] * (1 - toleransi):
+            pesan.append(f"{kunci}: baris/detik {b['baris_per_detik']} -> {h['baris_per_detik']}")
+        if (h["latency_p95_ms"] is not None and b["latency_p95_ms"] is not None
+                and h["latency_p95_ms"] > b["latency_p95_ms"] * (1 + toleransi)):
+            pesan.append(f"{kunci}: latency p95 {b['latency_p95_ms']} -> {h['latency_p95_ms']} ms")
+    return pesan
+
+
+def tampilkan(hasil):
+    """Mencetak tabel hasil benchmark"""
+    kolom = ["rate", "storage", "isi_awal", "frame_dikirim", "frame_hilang", "baris_per_detik",
+             "latency_p50_ms", "latency_p95_ms", "latency_max_ms", "peak_rss_mb", "ukuran_file_kb"]
+    print(" | ".join(kolom))
+    print("-" * 120)
+    for h in hasil:
+        print(" | ".join(str(h[k]) for k in kolom))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark logger dengan replay trace ke port serial virtual")
+    parser.add_argument("--trace", default=TRACE_DEFAULT, help="File trace mentah (default: traces/ovalue_contoh.txt)")
+    parser.add_argument("--rate", type=float, nargs="+", default=[1.0, 10.0, 100.0, 0.0],
+                        help="Frame per detik, 0 = secepat baud rate (default: 1 10 100 0)")
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--storage", nargs="+", default=["excel"], choices=["excel", "stream", "sqlite"])
+    parser.add_argument("--isi-awal", type=int, nargs="+", default=[0],
+                        help="Jumlah baris awal di file untuk mengukur pengaruh ukuran file")
+    parser.add_argument("--ulang", type=int, default=1, help="Putar trace sebanyak N kali per putaran")
+    parser.add_argument("--flush-rows", type=int, default=50)
+    parser.add_argument("--flush-interval", type=float, default=5.0)
+    parser.add_argument("--file", default="bench_pressure_data.xlsx", help="File Excel hasil (ditimpa)")
+    parser.add_argument("--port-pasangan", nargs=2, metavar=("PORT_KIRIM", "PORT_LOGGER"),
+                        help="Pasangan port null-modem virtual (Windows/com0com)")
+    parser.add_argument("--json", help="Simpan hasil ke file JSON")
+    parser.add_argument("--baseline", help="File JSON hasil acuan untuk cek regresi")
+    parser.add_argument("--toleransi", type=float, default=0.2)
+    parser.add_argument("--rekam", metavar="PORT", help="Rekam trace dari mesin asli ke --trace lalu keluar")
+    parser.add_argument("--durasi", type=float, default=60.0, help="Lama perekaman (detik)")
+    args = parser.parse_args(argv)
+
+    if args.rekam:
+        rekam_trace(args.rekam, args.baud, args.trace, args.durasi)
+        return 0
+
+    if args.port_pasangan is None and os.name == "nt":
+        print("pty tidak tersedia di Windows, gunakan --port-pasangan dengan com0com")
+        return 2
+
+    frames = baca_trace(args.trace) * args.ulang
+    hasil = []
+    for storage in args.storage:
+        for isi_awal in args.isi_awal:
+            for rate in args.rate:
+                print(f"▶ storage={storage} isi_awal={isi_awal} rate={rate or 'maks'} ({len(frames)} frame)")
+                hasil.append(jalankan_replay(frames, rate, args.baud, args.file, storage,
+                                             args.flush_rows, args.flush_interval, isi_awal,
+                                             args.port_pasangan))
+    print()
+    tampilkan(hasil)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(hasil, f, indent=1)
+        print(f"\n✓ Hasil disimpan ke {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regresi = cek_regresi(hasil, json.load(f), args.toleransi)
+        if regresi:
+            print("\n✗ Regresi performa:")
+            for pesan in regresi:
+                print(f"  - {pesan}")
+            return 1
+        print("\n✓ Tidak ada regresi dibanding baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
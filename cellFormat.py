@@ -0,0 +1,323 @@
+"""
+Sel bertipe untuk kolom data logger, dan konversi file lama.
+
+'Nilai KN' disimpan sebagai angka dan 'Timestamp' sebagai datetime, bukan
+teks, sehingga kolomnya bisa langsung dijumlah dan dibuat grafik. Kode
+format di file xlsx selalu memakai titik desimal; Excel menampilkannya
+dengan pemisah desimal dan format tanggal locale komputer, jadi di Windows
+berbahasa Indonesia nilainya tetap tampil dengan koma.
+
+File lama yang berisi teks ('12,5', '2026-10-16 08:00:00') diubah dengan
+konversi_file(): dibaca secara streaming (read-only) dan ditulis ulang ke
+workbook write-only, jadi memori tetap kecil berapa pun besarnya file.
+
+Contoh:
+    python cellFormat.py pressure_data*.xlsx
+    python cellFormat.py pressure_data.xlsx --timpa
+"""
+import os
+from datetime import datetime
+
+# Format tampilan sel (titik = pemisah desimal locale di Excel)
+FORMAT_KN = "0.0##"
+FORMAT_WAKTU = "yyyy-mm-dd hh:mm:ss"
+# Format teks timestamp (file lama, database, console)
+FORMAT_TIMESTAMP = '%Y-%m-%d %H:%M:%S'
+
+# Judul kolom yang disimpan sebagai angka atau waktu
+KOLOM_KN = ("Nilai KN", "Puncak KN")
+KOLOM_WAKTU = ("Timestamp", "Mulai", "Selesai", "Waktu Puncak")
+
+# Akhiran nama file hasil konversi jika file asli tidak ditimpa
+AKHIRAN_KONVERSI = "_numerik"
+
+
+def waktu_sekarang():
+    """
+    Waktu sekarang untuk kolom Timestamp (resolusi detik)
+
+    Returns:
+        datetime: Waktu sekarang tanpa mikrodetik
+    """
+    return datetime.now().replace(microsecond=0)
+
+
+def format_kn(nilai):
+    """
+    Nilai kN sebagai teks dengan koma desimal untuk console
+
+    Args:
+        nilai (float): Nilai kN
+
+    Returns:
+        str: Misal '12,5'
+    """
+    return str(nilai).replace('.', ',')
+
+
+def ke_angka(nilai):
+    """
+    Mengubah teks angka (titik atau koma desimal) menjadi float
+
+    Args:
+        nilai: Isi sel
+
+    Returns:
+        float, atau nilai apa adanya jika bukan teks angka
+    """
+    if isinstance(nilai, str):
+        teks = nilai.strip().replace(',', '.')
+        try:
+            return float(teks) if teks else nilai
+        except ValueError:
+            return nilai
+    return nilai
+
+
+def ke_waktu(nilai):
+    """
+    Mengubah teks timestamp 'YYYY-MM-DD HH:MM:SS' menjadi datetime
+
+    Args:
+        nilai: Isi sel
+
+    Returns:
+        datetime, atau nilai apa adanya jika bukan teks timestamp
+    """
+    if isinstance(nilai, str) and len(nilai) >= 10:
+        try:
+            return datetime.fromisoformat(nilai.strip())
+        except ValueError:
+            return nilai
+    return nilai
+
+
+def format_kolom(header):
+    """
+    Kolom bertipe sebuah sheet
+
+    Args:
+        header (list): Judul kolom
+
+    Returns:
+        tuple: Pasangan (index kolom, format sel) untuk kolom kN dan waktu
+    """
+    formats = []
+    for i, judul in enumerate(header):
+        if judul in KOLOM_KN:
+            formats.append((i, FORMAT_KN))
+        elif judul in KOLOM_WAKTU:
+            formats.append((i, FORMAT_WAKTU))
+    return tuple(formats)
+
+
+def baris_bertipe(row, formats):
+    """
+    Mengubah kolom kN dan waktu sebuah baris menjadi float dan datetime
+
+    Nilai yang sudah bertipe dibiarkan; teks yang tidak bisa diubah tetap teks.
+
+    Args:
+        row (list): Nilai-nilai kolom
+        formats (tuple): Hasil format_kolom()
+
+    Returns:
+        list: Baris baru
+    """
+    row = list(row)
+    for i, fmt in formats:
+        if i < len(row):
+            row[i] = ke_angka(row[i]) if fmt == FORMAT_KN else ke_waktu(row[i])
+    return row
+
+
+def baris_excel(row):
+    """
+    Menyiapkan nilai baris untuk sel openpyxl sebelum ws.append()
+
+    Frame serial yang rusak bisa membawa byte kontrol (misal '\\x01') yang
+    ditolak openpyxl dengan IllegalCharacterError; karakter itu dihapus dari
+    teks. Nilai bertipe lain yang tidak bisa disimpan ditolak di sini,
+    sebelum workbook write-only sempat menulis sebagian baris.
+
+    Args:
+        row (list): Nilai-nilai kolom
+
+    Returns:
+        list: Baris baru
+
+    Raises:
+        ValueError: Jika ada nilai yang tidak bisa disimpan ke sel
+    """
+    from openpyxl.cell import Cell
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE, STRING_TYPES, TIME_TYPES
+    from openpyxl.compat.numbers import NUMERIC_TYPES
+
+    hasil = []
+    for v in row:
+        if isinstance(v, str):
+            v = ILLEGAL_CHARACTERS_RE.sub("", v)
+        elif not (v is None or isinstance(v, NUMERIC_TYPES + TIME_TYPES + STRING_TYPES + (Cell,))):
+            raise ValueError(f"nilai {v!r} tidak bisa disimpan ke sel Excel")
+        hasil.append(v)
+    return hasil
+
+
+def atur_format(ws, formats, baris):
+    """
+    Memasang format sel pada satu baris worksheet biasa
+
+    Args:
+        ws (Worksheet): Worksheet openpyxl (bukan write-only)
+        formats (tuple): Hasil format_kolom()
+        baris (int): Nomor baris; dihitung pemanggil, karena ws.max_row
+                     memindai semua sel
+    """
+    for i, fmt in formats:
+        cell = ws.cell(row=baris, column=i + 1)
+        if isinstance(cell.value, (int, float, datetime)):
+            cell.number_format = fmt
+
+
+def sel_write_only(ws, row, formats):
+    """
+    Baris untuk worksheet write-only dengan format pada kolom bertipe
+
+    Args:
+        ws (WriteOnlyWorksheet): Worksheet tujuan
+        row (list): Baris yang sudah melalui baris_bertipe()
+        formats (tuple): Hasil format_kolom()
+
+    Returns:
+        list: Baris berisi WriteOnlyCell untuk kolom bertipe
+    """
+    from openpyxl.cell import WriteOnlyCell
+
+    row = baris_excel(row)
+    for i, fmt in formats:
+        if i < len(row) and isinstance(row[i], (int, float, datetime)):
+            cell = WriteOnlyCell(ws, row[i])
+            cell.number_format = fmt
+            row[i] = cell
+    return row
+
+
+def nama_konversi(excel_file):
+    """
+    Nama file hasil konversi jika file asli tidak ditimpa
+
+    Args:
+        excel_file (str): Nama file Excel asli
+
+    Returns:
+        str: Misal 'pressure_data_numerik.xlsx'
+    """
+    root, ext = os.path.splitext(excel_file)
+    return f"{root}{AKHIRAN_KONVERSI}{ext or '.xlsx'}"
+
+
+def konversi_file(excel_file, tujuan=None):
+    """
+    Menulis ulang file logger dengan kolom kN dan waktu bertipe
+
+    Semua sheet ikut ditulis; baris pertama setiap sheet dianggap header.
+
+    Args:
+        excel_file (str): File Excel sumber
+        tujuan (str): File hasil (default: nama_konversi(excel_file));
+                      boleh sama dengan sumber untuk menimpa
+
+    Returns:
+        dict: {'tujuan', 'baris', 'diubah': jumlah sel teks yang diubah,
+               'gagal': jumlah sel teks di kolom bertipe yang tetap teks}
+    """
+    from openpyxl import Workbook, load_workbook
+
+    from excelWriter import simpan_atomik
+    from resumeIndex import tulis_index
+
+    tujuan = tujuan or nama_konversi(excel_file)
+    hasil = {"tujuan": tujuan, "baris": 0, "diubah": 0, "gagal": 0}
+    last = None
+    rows_utama = 0
+    sheets = {}
+
+    src = load_workbook(excel_file, read_only=True)
+    try:
+        wb = Workbook(write_only=True)
+        for n_sheet, ws_src in enumerate(src.worksheets):
+            ws = wb.create_sheet(ws_src.title)
+            formats = ()
+            akhir = None
+            for n, row in enumerate(ws_src.iter_rows(values_only=True)):
+                if n == 0:
+                    formats = format_kolom(row)
+                    ws.append(list(row))
+                    continue
+                baru = baris_bertipe(row, formats)
+                for i, _ in formats:
+                    if i < len(row) and isinstance(row[i], str):
+                        if isinstance(baru[i], str):
+                            hasil["gagal"] += 1
+                        else:
+                            hasil["diubah"] += 1
+                ws.append(sel_write_only(ws, baru, formats))
+                akhir = baru
+                hasil["baris"] += 1
+                if n_sheet == 0:
+                    rows_utama = n + 1
+                    last = baru
+            if n_sheet > 0:
+                sheets[ws_src.title] = akhir[0] if akhir else 0
+    finally:
+        src.close()
+
+    simpan_atomik(wb, tujuan)
+    try:
+        last_no = last[0] if last else 0
+        last_ts = str(last[1]) if last and len(last) > 1 else None
+        tulis_index(tujuan, rows_utama or 1, last_no, last_ts, sheets)
+    except OSError:
+        pass
+    return hasil
+
+
+def main(argv=None):
+    import argparse
+    import glob
+    import sys
+
+    parser = argparse.ArgumentParser(
+        description="Ubah kolom 'Nilai KN' dan waktu di file logger lama menjadi angka dan datetime")
+    parser.add_argument("file", nargs="+", help="File Excel atau pola, misal 'pressure_data*.xlsx'")
+    parser.add_argument("--timpa", action="store_true", help="Timpa file asli (default: tulis '<nama>_numerik.xlsx')")
+    args = parser.parse_args(argv)
+
+    files = []
+    for pola in args.file:
+        cocok = sorted(glob.glob(pola)) or [pola]
+        files.extend(f for f in cocok if args.timpa or not os.path.splitext(f)[0].endswith(AKHIRAN_KONVERSI))
+    files = list(dict.fromkeys(files))
+
+    status = 0
+    for excel_file in files:
+        if not os.path.exists(excel_file):
+            print(f"Error: '{excel_file}' tidak ditemukan", file=sys.stderr)
+            status = 2
+            continue
+        try:
+            hasil = konversi_file(excel_file, excel_file if args.timpa else None)
+        except Exception as e:
+            print(f"⚠ {excel_file}: {e}", file=sys.stderr)
+            status = 1
+            continue
+        gagal = f", {hasil['gagal']} sel tetap teks" if hasil["gagal"] else ""
+        print(f"✓ {excel_file} -> {hasil['tujuan']}: {hasil['baris']} baris, "
+              f"{hasil['diubah']} sel diubah{gagal}")
+    return status
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main())
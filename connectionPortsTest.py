@@ -1,8 +1,19 @@
 import serial
 import serial.tools.list_ports
-from openpyxl import Workbook, load_workbook
-from datetime import datetime
-import os
+
+from batchInput import baca_csv, baris_writer, parse_baris
+from cellFormat import format_kn, waktu_sekarang
+from deadbandFilter import MAX_GAP, FilterPolicy
+from liveFeed import PORT_FEED, LiveFeed
+from portDiscovery import lupakan_device, temukan_port
+from portLogger import PortLogger, nama_file_port
+from rawCapture import CapturePolicy, capture_path
+from sessionArchive import arsip_path
+from sessionLoop import SessionLoop
+from shardedWriter import manifest_path
+from specimenDetector import SHEET_SPECIMENS, SegmentPolicy
+from sqliteWriter import database_path
+from storageBackend import STORAGE_EXCEL, STORAGE_SQLITE, STORAGE_STREAM, buat_writer
 
 # Konfigurasi default untuk koneksi serial
 BAUD_RATE = 9600
@@ -43,7 +54,8 @@ def koneksi(port, baud=BAUD_RATE, data=DATA):
         str: Status koneksi
     """
     try:
-        ser = serial.Serial(port, baud, data, timeout=None)
+        # Timeout agar port yang tidak merespons tidak membuat program macet
+        ser = serial.Serial(port, baud, data, timeout=1.0, write_timeout=1.0)
         if ser.is_open:
             print(f"Berhasil terhubung ke {port}")
             ser.close()
@@ -55,12 +67,18 @@ def koneksi(port, baud=BAUD_RATE, data=DATA):
         print(f"Error connecting to {port}: {pesanError}")
         return f"Error: {pesanError}"
 
-def input_manual_ke_excel(excel_file="pressure_data_manual.xlsx"):
+def input_manual_ke_excel(excel_file="pressure_data_manual.xlsx", flush_policy=None,
+                          storage=STORAGE_EXCEL, shard_policy=None):
     """
     Menerima input nilai kN secara manual dan menyimpan ke Excel
     
     Args:
         excel_file (str): Nama file Excel untuk menyimpan data
+        flush_policy (FlushPolicy): Kapan buffer disimpan ke file (default: FlushPolicy())
+        storage (str): 'excel' (default), 'stream' untuk workbook write-only
+                       dengan rollover otomatis, atau 'sqlite' untuk database
+                       yang diekspor ke Excel sesuai kebutuhan
+        shard_policy (ShardPolicy): Kebijakan rollover untuk mode 'stream'
     """
     try:
         print(f"\n{'='*60}")
@@ -68,23 +86,29 @@ def input_manual_ke_excel(excel_file="pressure_data_manual.xlsx"):
         print(f"{'='*60}")
         print(f"Data akan disimpan ke: {excel_file}")
         print("Ketik 'selesai' atau tekan Ctrl+C untuk berhenti")
+        print("Ketik 'tempel' untuk menempel banyak nilai sekaligus, atau 'csv <nama file>'")
         print(f"{'='*60}\n")
         
-        # Buat atau load Excel workbook
-        if os.path.exists(excel_file):
-            wb = load_workbook(excel_file)
-            ws = wb.active
-            print(f"File Excel '{excel_file}' ditemukan, melanjutkan data...")
-        else:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Pressure Data Manual" # type: ignore
-            # Header
-            ws.append(["No", "Timestamp", "Nilai KN", "Keterangan"]) # type: ignore
-            wb.save(excel_file)
+        # Buat atau load Excel workbook, disimpan oleh thread penulis
+        writer = buat_writer(
+            excel_file,
+            ["No", "Timestamp", "Nilai KN", "Keterangan"],
+            "Pressure Data Manual",
+            flush_policy,
+            storage,
+            shard_policy,
+        )
+        counter = writer.open()
+        if writer.file_baru:
             print(f"File Excel '{excel_file}' dibuat baru")
-        
-        counter = ws.max_row if ws.max_row > 1 else 1 # type: ignore
+        else:
+            print(f"File Excel '{excel_file}' ditemukan, melanjutkan data...")
+        if writer.rows_replayed:
+            print(f"✓ {writer.rows_replayed} data dari journal dipulihkan ke '{excel_file}'")
+        if storage == STORAGE_STREAM:
+            print(f"Mode streaming: daftar shard di '{manifest_path(excel_file)}'")
+        if storage == STORAGE_SQLITE:
+            _cetak_info_sqlite(excel_file)
         
         while True:
             try:
@@ -96,6 +120,12 @@ def input_manual_ke_excel(excel_file="pressure_data_manual.xlsx"):
                     print("\nProses input manual dihentikan")
                     break
                 
+                # Input batch dari blok tempel atau file CSV
+                if input_nilai.lower() in ['tempel', 'paste', 'b', 'batch'] or input_nilai.lower().startswith('csv '):
+                    counter = input_batch(writer, counter, input_nilai[4:].strip().strip('"')
+                                          if input_nilai.lower().startswith('csv ') else None)
+                    continue
+                
                 # Validasi input adalah angka
                 try:
                     nilaiKN = float(input_nilai)
@@ -109,14 +139,13 @@ def input_manual_ke_excel(excel_file="pressure_data_manual.xlsx"):
                     keterangan = "Input manual"
                 
                 # Timestamp
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                timestamp = waktu_sekarang()
                 
-                # Konversi nilai KN ke format koma
-                nilaiKN_format = str(nilaiKN).replace('.', ',')
+                # Nilai disimpan sebagai angka, koma desimal hanya untuk tampilan
+                nilaiKN_format = format_kn(nilaiKN)
                 
                 # Simpan ke Excel
-                ws.append([counter, timestamp, nilaiKN_format, keterangan]) # type: ignore
-                wb.save(excel_file)
+                writer.append([counter, timestamp, nilaiKN, keterangan])
                 
                 print(f"✓ Data #{counter} tersimpan: {nilaiKN_format} kN")
                 print("-" * 60)
@@ -129,15 +158,71 @@ def input_manual_ke_excel(excel_file="pressure_data_manual.xlsx"):
                 print(f"⚠ Error: {e}")
                 continue
         
-        # Tutup workbook
-        wb.close()
+        # Simpan sisa buffer dan tutup workbook
+        writer.close()
         print(f"\n✓ Total data tersimpan: {counter - 1}")
         print(f"✓ File Excel: {excel_file}")
         
     except Exception as e:
         print(f"Error: {e}")
 
-def baca_dan_simpan_ke_excel(port, baud=BAUD_RATE, data=DATA, excel_file="pressure_data.xlsx"):
+def input_batch(writer, counter, csv_file=None):
+    """
+    Memeriksa banyak nilai sekaligus lalu menyimpan yang valid dalam satu penulisan
+    
+    Args:
+        writer (BufferedExcelWriter): Writer yang sudah dibuka
+        counter (int): Nomor 'No' berikutnya
+        csv_file (str): File CSV/teks; None = tempel blok di console
+    
+    Returns:
+        int: Nomor 'No' berikutnya setelah disimpan
+    """
+    if csv_file:
+        try:
+            valid, salah = baca_csv(csv_file)
+        except OSError as e:
+            print(f"⚠ Gagal membaca '{csv_file}': {e}")
+            return counter
+    else:
+        print("Tempel data, satu nilai per baris: nilai[; keterangan][; timestamp]")
+        print("Akhiri dengan baris kosong")
+        lines = []
+        while True:
+            try:
+                line = input()
+            except EOFError:
+                break
+            if not line.strip():
+                break
+            lines.append(line)
+        valid, salah = parse_baris(lines)
+    
+    # Semua baris diperiksa sebelum ada yang disimpan
+    if salah:
+        print(f"⚠ {len(salah)} baris tidak valid:")
+        for n, teks, alasan in salah[:20]:
+            print(f"   baris {n}: {teks!r} - {alasan}")
+        if len(salah) > 20:
+            print(f"   ... dan {len(salah) - 20} baris lainnya")
+    if not valid:
+        print("Tidak ada data valid untuk disimpan")
+        return counter
+    
+    print(f"{len(valid)} baris valid akan disimpan sebagai No {counter} - {counter + len(valid) - 1}")
+    if input(f"Simpan {len(valid)} baris? (y/n): ").strip().lower() not in ['y', 'ya']:
+        print("Input batch dibatalkan")
+        return counter
+    
+    writer.append_banyak(baris_writer(valid, counter))
+    print(f"✓ Data #{counter} - #{counter + len(valid) - 1} tersimpan ({len(valid)} baris)")
+    print("-" * 60)
+    return counter + len(valid)
+
+def baca_dan_simpan_ke_excel(port, baud=BAUD_RATE, data=DATA, excel_file="pressure_data.xlsx", flush_policy=None,
+                             storage=STORAGE_EXCEL, shard_policy=None, segment_policy=None, simpan_raw=True,
+                             capture_policy=None, stats_file=None, feed_port=None, filter_policy=None,
+                             arsip=False):
     """
     Membaca nilai tekanan dari perangkat serial secara terus-menerus
     dan menyimpan ke Excel per baris tanpa timeout.
@@ -148,196 +233,285 @@ def baca_dan_simpan_ke_excel(port, baud=BAUD_RATE, data=DATA, excel_file="pressu
         baud (int): Baud rate (default: 9600)
         data (int): Data bits (default: 8)
         excel_file (str): Nama file Excel untuk menyimpan data
+        flush_policy (FlushPolicy): Kapan buffer disimpan ke file (default: FlushPolicy())
+        storage (str): 'excel' (default), 'stream' untuk workbook write-only
+                       dengan rollover otomatis, atau 'sqlite' untuk database
+                       yang diekspor ke Excel sesuai kebutuhan
+        shard_policy (ShardPolicy): Kebijakan rollover untuk mode 'stream'
+        segment_policy (SegmentPolicy): Deteksi specimen ke sheet 'Specimens' (default: None = mati)
+        simpan_raw (bool): False = hanya simpan ringkasan specimen, bukan setiap nilai
+        capture_policy (CapturePolicy): Rekam semua nilai ke file biner '.raw' dan
+                                        kirim hanya satu nilai per interval ke Excel
+        stats_file (str): Tulis statistik jalur data berkala ke file JSON lines ini
+        feed_port (int): Buka live feed SSE di http://127.0.0.1:<feed_port>/ (default: None)
+        filter_policy (FilterPolicy): Hanya simpan nilai yang berubah melewati deadband
+                                      (default: None = simpan semua)
+        arsip (bool): Tambahkan sesi ke arsip kolom terkompresi '<nama>.arsip'
+                      saat selesai (default: False)
+    """
+    baca_banyak_port_ke_excel([port], baud, data, [excel_file], flush_policy, storage, shard_policy,
+                              segment_policy, simpan_raw, capture_policy, stats_file, feed_port,
+                              filter_policy, arsip)
+
+def baca_banyak_port_ke_excel(ports, baud=BAUD_RATE, data=DATA, excel_files=None, flush_policy=None,
+                              storage=STORAGE_EXCEL, shard_policy=None, segment_policy=None, simpan_raw=True,
+                              capture_policy=None, stats_file=None, feed_port=None, filter_policy=None,
+                              arsip=False):
+    """
+    Membaca beberapa port serial sekaligus, masing-masing di thread sendiri
+    dengan counter dan file Excel sendiri.
+    Input manual dari keyboard diarahkan ke mesin yang sedang dipilih
+    
+    Args:
+        ports (list): Daftar nama port
+        baud (int): Baud rate (default: 9600)
+        data (int): Data bits (default: 8)
+        excel_files (list): Nama file Excel per port
+                            (default: 'pressure_data_<port>.xlsx')
+        flush_policy (FlushPolicy): Kapan buffer disimpan ke file (default: FlushPolicy())
+        storage (str): 'excel' (default), 'stream' untuk workbook write-only
+                       dengan rollover otomatis, atau 'sqlite' untuk database
+                       yang diekspor ke Excel sesuai kebutuhan
+        shard_policy (ShardPolicy): Kebijakan rollover untuk mode 'stream'
+        segment_policy (SegmentPolicy): Deteksi specimen ke sheet 'Specimens' (default: None = mati)
+        simpan_raw (bool): False = hanya simpan ringkasan specimen, bukan setiap nilai
+        capture_policy (CapturePolicy): Rekam semua nilai ke file biner '.raw' dan
+                                        kirim hanya satu nilai per interval ke Excel
+        stats_file (str): Tulis statistik jalur data berkala ke file JSON lines ini
+        feed_port (int): Buka live feed SSE di http://127.0.0.1:<feed_port>/ (default: None)
+        filter_policy (FilterPolicy): Hanya simpan nilai yang berubah melewati deadband
+                                      (default: None = simpan semua)
+        arsip (bool): Tambahkan sesi ke arsip kolom terkompresi '<nama>.arsip'
+                      saat selesai (default: False)
     """
-    import threading
-    import queue
+    if excel_files is None:
+        excel_files = [nama_file_port(port) for port in ports]
+    
+    banyak = len(ports) > 1
+    loggers = []
+    feed = None
     
     try:
-        # Buka koneksi serial dengan timeout
-        ser = serial.Serial(port, baud, data, timeout=0.5)
+        if feed_port is not None:
+            try:
+                feed = LiveFeed(port=feed_port)
+                feed.mulai()
+                print(f"Live feed: {feed.url} (SSE di {feed.url}events)")
+            except OSError as e:
+                print(f"⚠ Live feed tidak bisa dibuka di port {feed_port}: {e}")
+                feed = None
+        
+        for port, excel_file in zip(ports, excel_files):
+            label = f"[{port}] " if banyak else ""
+            logger = PortLogger(port, baud, data, excel_file, flush_policy, label, storage, shard_policy,
+                                segment_policy, simpan_raw, capture_policy, feed, filter_policy, arsip)
+            try:
+                logger.buka()
+            except Exception as e:
+                print(f"Error: {port}: {e}")
+                if isinstance(e, serial.SerialException):
+                    # Entri deteksi otomatis untuk port ini tidak lagi bisa dipakai
+                    lupakan_device(port)
+                continue
+            
+            loggers.append(logger)
+            print(f"Terhubung ke {port}")
+            print(f"Baud rate: {baud}")
+            print(f"Data akan disimpan ke: {excel_file}")
+            if logger.writer.file_baru:
+                print(f"File Excel '{excel_file}' dibuat baru")
+            else:
+                print(f"File Excel '{excel_file}' ditemukan, melanjutkan data...")
+            if logger.writer.rows_replayed:
+                print(f"✓ {logger.writer.rows_replayed} data dari journal dipulihkan ke '{excel_file}'")
+            if segment_policy is not None:
+                print(f"Deteksi specimen aktif: ringkasan di sheet '{SHEET_SPECIMENS}'"
+                      + ("" if simpan_raw else " (hanya ringkasan)"))
+            if capture_policy is not None:
+                interval = capture_policy.interval_excel
+                print(f"Rekaman mentah: '{capture_path(excel_file)}'"
+                      + (f", Excel 1 nilai per {interval:g} detik" if interval else ""))
+            if filter_policy is not None:
+                print(f"Filter deadband aktif: {_teks_filter(filter_policy)}")
+            if storage == STORAGE_STREAM:
+                print(f"Mode streaming: daftar shard di '{manifest_path(excel_file)}'")
+            if storage == STORAGE_SQLITE:
+                _cetak_info_sqlite(excel_file)
+            print("=" * 60)
         
-        if not ser.is_open:
+        if not loggers:
             print("Gagal membuka port")
             return
         
-        print(f"Terhubung ke {port}")
-        print(f"Baud rate: {baud}")
-        print(f"Data akan disimpan ke: {excel_file}")
-        print("=" * 60)
-        
-        # Buat atau load Excel workbook
-        if os.path.exists(excel_file):
-            wb = load_workbook(excel_file)
-            ws = wb.active
-            print(f"File Excel '{excel_file}' ditemukan, melanjutkan data...")
-        else:
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Pressure Data" # type: ignore
-            # Header
-            ws.append(["No", "Timestamp", "Nilai KN", "Sumber", "Raw Data/Keterangan"]) # type: ignore
-            wb.save(excel_file)
-            print(f"File Excel '{excel_file}' dibuat baru")
-        
         print("\nMulai membaca data...")
         print("Ketik 'm <nilai>' (contoh: m 25.5) atau 'm' saja lalu Enter untuk input manual")
+        print("Ketik 's' untuk melihat statistik pembacaan dan penyimpanan")
+        if len(loggers) > 1:
+            print("Ketik 'p <nomor>' untuk memilih mesin tujuan input manual:")
+            for i, logger in enumerate(loggers, 1):
+                print(f"  {i}. {logger.port}")
         print("Tekan Ctrl+C untuk menghentikan\n")
         
-        counter = ws.max_row if ws.max_row > 1 else 1 # type: ignore
-        
-        # Queue untuk komunikasi antara thread
-        input_queue = queue.Queue()
-        stop_event = threading.Event()
-        
-        def read_input():
-            """Thread untuk membaca input keyboard"""
-            while not stop_event.is_set():
-                try:
-                    user_input = input()
-                    input_queue.put(user_input)
-                except:
-                    break
-        
-        # Start thread untuk input
-        input_thread = threading.Thread(target=read_input, daemon=True)
-        input_thread.start()
+        # Serial dan keyboard ditunggu bersamaan oleh satu event loop
+        SessionLoop(loggers, stats_file=stats_file).jalankan()
         
-        while True:
-            try:
-                # Cek apakah ada input manual dari user
-                try:
-                    user_input = input_queue.get_nowait()
-                    user_input = user_input.strip()
-                    
-                    # Cek jika input dimulai dengan 'm' atau 'manual'
-                    if user_input.lower().startswith('m'):
-                        parts = user_input.split(maxsplit=1)
-                        
-                        # Jika ada nilai langsung setelah 'm' (contoh: m 25.5)
-                        if len(parts) > 1:
-                            try:
-                                nilaiKN = float(parts[1])
-                                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                
-                                # Konversi nilai KN ke format koma
-                                nilaiKN_format = str(nilaiKN).replace('.', ',')
-                                
-                                # Simpan ke Excel
-                                ws.append([counter, timestamp, nilaiKN_format, "MANUAL", "Input cepat"]) # type: ignore
-                                wb.save(excel_file)
-                                
-                                print(f"✓ Data #{counter} tersimpan: {nilaiKN_format} kN (MANUAL)")
-                                print("-" * 40)
-                                counter += 1
-                                
-                            except ValueError:
-                                print(f"⚠ Nilai tidak valid: '{parts[1]}' - gunakan format: m <angka>")
-                        
-                        # Jika hanya 'm' tanpa nilai, masuk mode input detail
-                        else:
-                            print("\n" + "="*60)
-                            print("MODE INPUT MANUAL")
-                            print("="*60)
-                            
-                            # Input nilai kN
-                            while True:
-                                try:
-                                    nilai_input = input(f"[Data #{counter}] Masukkan nilai kN: ").strip()
-                                    
-                                    if nilai_input.lower() in ['batal', 'cancel']:
-                                        print("Input manual dibatalkan\n")
-                                        break
-                                    
-                                    nilaiKN = float(nilai_input)
-                                    
-                                    # Input keterangan
-                                    keterangan = input("   Keterangan (Enter untuk skip): ").strip()
-                                    if not keterangan:
-                                        keterangan = "Input manual"
-                                    
-                                    # Timestamp
-                                    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                    
-                                    # Konversi nilai KN ke format koma
-                                    nilaiKN_format = str(nilaiKN).replace('.', ',')
-                                    
-                                    # Simpan ke Excel
-                                    ws.append([counter, timestamp, nilaiKN_format, "MANUAL", keterangan]) # pyright: ignore[reportOptionalMemberAccess]
-                                    wb.save(excel_file)
-                                    
-                                    print(f"✓ Data #{counter} tersimpan: {nilaiKN_format} kN (MANUAL)")
-                                    print("="*60 + "\n")
-                                    counter += 1
-                                    break
-                                    
-                                except ValueError:
-                                    print("⚠ Input harus berupa angka! (atau ketik 'batal' untuk keluar)")
-                                    continue
-                                except Exception as e:
-                                    print(f"⚠ Error: {e}")
-                                    break
-                            
-                            print("Kembali ke mode otomatis...\n")
-                            print("Ketik 'm <nilai>' atau 'm' lalu Enter untuk input manual lagi")
-                        
-                except queue.Empty:
-                    pass
-                
-                # Baca data dari serial
-                if datanya := ser.readline():
-                    data_str = datanya.decode("utf-8", errors="ignore").strip()
-                    
-                    if data_str:  # Jika ada data
-                        print(f"[{datetime.now().strftime('%H:%M:%S')}] Raw: {data_str}")
-                        
-                        # Cek apakah data mengandung "ovalue"
-                        if "ovalue" in data_str.lower():
-                            try:
-                                # Extract nilai KN
-                                parts = data_str.split()
-                                if len(parts) >= 2:
-                                    nilaiKN_raw = parts[1]
-                                    # Ganti koma dengan titik untuk konversi ke float
-                                    nilaiKN = nilaiKN_raw.replace(',', '.')
-                                    
-                                    # Konversi ke format koma untuk Excel
-                                    nilaiKN_format = nilaiKN.replace('.', ',')
-                                    
-                                    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                    
-                                    # Simpan ke Excel
-                                    ws.append([counter, timestamp, nilaiKN_format, "SERIAL", data_str]) # type: ignore
-                                    wb.save(excel_file)
-                                    
-                                    print(f"✓ Data #{counter} tersimpan: {nilaiKN_format} KN (SERIAL)")
-                                    print("-" * 60)
-                                    counter += 1
-                                else:
-                                    print("⚠ Format data tidak lengkap, menunggu data berikutnya...")
-                                    
-                            except Exception as e:
-                                print(f"⚠ Error parsing data: {e}")
-                                continue
-                        
-            except KeyboardInterrupt:
-                print("\n\nProses dihentikan oleh user")
-                stop_event.set()
-                break
-            except Exception as e:
-                print(f"⚠ Error: {e}")
-                continue
-        
-        # Tutup koneksi
-        ser.close()
-        wb.close()
-        stop_event.set()
-        print(f"\n✓ Koneksi ditutup")
-        print(f"✓ Total data tersimpan: {counter - 1}")
-        print(f"✓ File Excel: {excel_file}")
-        
-    except Exception as e:
-        pesanError = str(e)
-        print(f"Error: {pesanError}")
+    finally:
+        # Tutup koneksi, simpan sisa buffer
+        for logger in loggers:
+            logger.tutup()
+            print(f"\n✓ Koneksi {logger.port} ditutup")
+            print(f"✓ Total data tersimpan: {logger.counter - 1}")
+            if logger.detector is not None:
+                print(f"✓ Total specimen: {logger.specimen_no - 1}")
+            if logger.capture is not None:
+                print(f"✓ Rekaman mentah: {logger.capture.jumlah} nilai di {logger.capture.path}")
+            if logger.filter is not None:
+                print(f"✓ Baris tidak disimpan oleh filter deadband: {logger.filter.dibuang}")
+            if logger.sesi_arsip is not None:
+                print(f"✓ Sesi diarsip: {logger.sesi_arsip['baris']} baris ke '{arsip_path(logger.excel_file)}'")
+            print(f"✓ File Excel: {logger.excel_file}")
+        if feed is not None:
+            feed.tutup()
+
+def _input_mode_simpan():
+    """
+    Menanyakan mode penyimpanan
+    
+    Returns:
+        str: 'excel', 'stream' atau 'sqlite'
+    """
+    mode = input("Mode penyimpanan (Enter untuk Excel biasa, 's' untuk streaming + rollover harian, "
+                 "'d' untuk database SQLite): ").strip().lower()
+    if mode in ['s', 'stream']:
+        return STORAGE_STREAM
+    if mode in ['d', 'db', 'sqlite']:
+        return STORAGE_SQLITE
+    return STORAGE_EXCEL
+
+def _cetak_info_sqlite(excel_file):
+    """
+    Mencetak lokasi database dan cara membuat file Excel dari isinya
+    
+    Args:
+        excel_file (str): Nama file Excel yang dipilih
+    """
+    db_file = database_path(excel_file)
+    print(f"Mode SQLite: data disimpan di '{db_file}'")
+    print(f"  Ekspor ke Excel: python sqliteWriter.py ekspor {db_file} {excel_file} [--sesi N | --mulai ... --sampai ...]")
+
+def _input_mode_specimen():
+    """
+    Menanyakan apakah deteksi specimen diaktifkan
+    
+    Returns:
+        tuple: (SegmentPolicy atau None, simpan_raw)
+    """
+    mode = input("Deteksi specimen (Enter = tidak, 'y' = ya, 'r' = hanya ringkasan specimen): ").strip().lower()
+    if mode not in ['y', 'ya', 'r']:
+        return None, True
+    
+    ambang_input = input("Ambang mulai pembebanan kN (tekan Enter untuk 1.0): ").strip()
+    ambang = float(ambang_input.replace(',', '.')) if ambang_input else 1.0
+    return SegmentPolicy(ambang_mulai=ambang), mode != 'r'
+
+def _input_mode_capture():
+    """
+    Menanyakan apakah rekaman mentah resolusi penuh diaktifkan
+    
+    Returns:
+        CapturePolicy: Pengaturan rekaman, atau None jika tidak aktif
+    """
+    mode = input("Rekaman mentah untuk sampling cepat (Enter = tidak, 'y' = ya): ").strip().lower()
+    if mode not in ['y', 'ya']:
+        return None
+    
+    interval_input = input("Interval baris Excel dalam detik (tekan Enter untuk 1): ").strip()
+    interval = float(interval_input.replace(',', '.')) if interval_input else 1.0
+    return CapturePolicy(interval_excel=interval)
+
+def deteksi_port_otomatis(ports=None):
+    """
+    Mencari port yang mengirim data 'ovalue' beserta baud rate-nya
+    
+    Args:
+        ports (list): Port yang diperiksa (default: semua port terpasang)
+    
+    Returns:
+        tuple: (port, baud), atau (None, None) jika tidak ditemukan
+    """
+    print("\nMendeteksi port dan baud rate...")
+    hasil = temukan_port(ports)
+    
+    for r in hasil:
+        if r["dari_cache"]:
+            keadaan = f"dikenal dari sesi sebelumnya, {r['ovalue']} frame ovalue"
+        elif r["error"]:
+            keadaan = f"error: {r['error']}"
+        else:
+            keadaan = f"{r['ovalue']} frame ovalue, {r['frame']} frame"
+        print(f"  {r['port']:<16} baud {r['baud'] or '-':<7} {keadaan}")
+    
+    for r in hasil:
+        if r["dari_cache"] or r["ovalue"]:
+            print(f"✓ Mesin ditemukan di {r['port']} ({r['baud']} baud)")
+            return r["port"], r["baud"]
+    
+    print("⚠ Tidak ada port yang mengirim data 'ovalue'")
+    return None, None
+
+def _input_mode_filter():
+    """
+    Menanyakan apakah filter deadband diaktifkan
+
+    Returns:
+        FilterPolicy: Pengaturan filter, atau None jika tidak aktif
+    """
+    mode = input("Filter deadband saat beban datar (Enter = tidak, nilai kN misal 0.05, "
+                 "atau persen misal 1%): ").strip().replace(',', '.')
+    if not mode:
+        return None
+    
+    gap_input = input("Simpan minimal satu baris setiap N detik (tekan Enter untuk 60, 0 = tidak): ").strip()
+    max_gap = float(gap_input.replace(',', '.')) if gap_input else MAX_GAP
+    if mode.endswith('%'):
+        return FilterPolicy(deadband_rel=float(mode[:-1]) / 100, max_gap=max_gap or None)
+    return FilterPolicy(deadband=float(mode), max_gap=max_gap or None)
+
+def _teks_filter(policy):
+    """Ringkasan pengaturan filter untuk console"""
+    bagian = []
+    if policy.deadband:
+        bagian.append(f"{policy.deadband:g} kN")
+    if policy.deadband_rel:
+        bagian.append(f"{policy.deadband_rel * 100:g}%")
+    if policy.min_interval:
+        bagian.append(f"jarak min {policy.min_interval:g} detik")
+    bagian.append(f"heartbeat {policy.max_gap:g} detik" if policy.max_gap else "tanpa heartbeat")
+    return ", ".join(bagian)
+
+def _input_mode_arsip():
+    """
+    Menanyakan apakah sesi diarsip ke format kolom terkompresi saat selesai
+    
+    Returns:
+        bool: True jika arsip aktif
+    """
+    mode = input("Arsip terkompresi saat sesi selesai (Enter = tidak, 'y' = ya): ").strip().lower()
+    return mode in ['y', 'ya']
+
+def _input_live_feed():
+    """
+    Menanyakan apakah live feed untuk dashboard dibuka
+    
+    Returns:
+        int: Port HTTP live feed, atau None jika tidak aktif
+    """
+    mode = input(f"Live feed untuk dashboard (Enter = tidak, 'y' = port {PORT_FEED}, atau nomor port): ").strip().lower()
+    if not mode:
+        return None
+    if mode in ['y', 'ya']:
+        return PORT_FEED
+    return int(mode)
 
 def pilih_port_dan_mulai_logging():
     """
@@ -355,7 +529,16 @@ def pilih_port_dan_mulai_logging():
         print(f"{i}. {port}")
     
     try:
-        choice = int(input("\nMasukkan nomor port (atau 0 untuk keluar): "))
+        pilihan = input("\nMasukkan nomor port, 'a' untuk deteksi otomatis (atau 0 untuk keluar): ").strip()
+        
+        baud = None
+        if pilihan.lower() == 'a':
+            selected_port, baud = deteksi_port_otomatis(ports)
+            if selected_port not in ports:
+                return
+            choice = ports.index(selected_port) + 1
+        else:
+            choice = int(pilihan)
         
         if choice == 0:
             print("Keluar...")
@@ -372,9 +555,17 @@ def pilih_port_dan_mulai_logging():
             if not excel_file.endswith('.xlsx'):
                 excel_file += '.xlsx'
             
-            # Input baud rate (opsional)
-            baud_input = input(f"Baud rate (tekan Enter untuk {BAUD_RATE}): ").strip()
-            baud = int(baud_input) if baud_input else BAUD_RATE
+            # Input baud rate (opsional, sudah diketahui jika dideteksi otomatis)
+            if baud is None:
+                baud_input = input(f"Baud rate (tekan Enter untuk {BAUD_RATE}): ").strip()
+                baud = int(baud_input) if baud_input else BAUD_RATE
+            
+            storage = _input_mode_simpan()
+            segment_policy, simpan_raw = _input_mode_specimen()
+            capture_policy = _input_mode_capture()
+            filter_policy = _input_mode_filter()
+            arsip = _input_mode_arsip()
+            feed_port = _input_live_feed()
             
             print(f"\n{'='*60}")
             print(f"Port: {selected_port}")
@@ -383,7 +574,10 @@ def pilih_port_dan_mulai_logging():
             print(f"{'='*60}\n")
             
             # Mulai logging
-            baca_dan_simpan_ke_excel(selected_port, baud, DATA, excel_file)
+            baca_dan_simpan_ke_excel(selected_port, baud, DATA, excel_file, storage=storage,
+                                     segment_policy=segment_policy, simpan_raw=simpan_raw,
+                                     capture_policy=capture_policy, feed_port=feed_port,
+                                     filter_policy=filter_policy, arsip=arsip)
         else:
             print("Pilihan tidak valid!")
             
@@ -392,6 +586,73 @@ def pilih_port_dan_mulai_logging():
     except KeyboardInterrupt:
         print("\nOperasi dibatalkan oleh user.")
 
+def pilih_banyak_port_dan_mulai_logging():
+    """
+    Memungkinkan pengguna memilih beberapa port untuk logging bersamaan,
+    masing-masing ke file Excel sendiri
+    """
+    ports = list_com_ports()
+    
+    if not ports:
+        return
+    
+    print(f"\nDitemukan {len(ports)} COM ports")
+    print("Pilih port untuk logging data:")
+    
+    for i, port in enumerate(ports, 1):
+        print(f"{i}. {port}")
+    
+    try:
+        pilihan = input("\nMasukkan nomor port dipisah koma (contoh: 1,3) atau 0 untuk keluar: ").strip()
+        
+        if pilihan == '0':
+            print("Keluar...")
+            return
+        
+        nomor = [int(p) for p in pilihan.replace(' ', '').split(',') if p]
+        if not nomor or any(not 1 <= n <= len(ports) for n in nomor):
+            print("Pilihan tidak valid!")
+            return
+        selected_ports = list(dict.fromkeys(ports[n - 1] for n in nomor))
+        
+        # Input nama file Excel dasar, satu file per port
+        excel_file = input("\nNama file Excel dasar (tekan Enter untuk 'pressure_data.xlsx'): ").strip()
+        if not excel_file:
+            excel_file = "pressure_data.xlsx"
+        
+        if not excel_file.endswith('.xlsx'):
+            excel_file += '.xlsx'
+        
+        # Input baud rate (opsional)
+        baud_input = input(f"Baud rate (tekan Enter untuk {BAUD_RATE}): ").strip()
+        baud = int(baud_input) if baud_input else BAUD_RATE
+        
+        storage = _input_mode_simpan()
+        segment_policy, simpan_raw = _input_mode_specimen()
+        capture_policy = _input_mode_capture()
+        filter_policy = _input_mode_filter()
+        arsip = _input_mode_arsip()
+        feed_port = _input_live_feed()
+        
+        excel_files = [nama_file_port(port, excel_file) for port in selected_ports]
+        
+        print(f"\n{'='*60}")
+        for port, nama_file in zip(selected_ports, excel_files):
+            print(f"Port: {port} -> {nama_file}")
+        print(f"Baud rate: {baud}")
+        print(f"{'='*60}\n")
+        
+        # Mulai logging
+        baca_banyak_port_ke_excel(selected_ports, baud, DATA, excel_files, storage=storage,
+                                  segment_policy=segment_policy, simpan_raw=simpan_raw,
+                                  capture_policy=capture_policy, feed_port=feed_port,
+                                  filter_policy=filter_policy, arsip=arsip)
+            
+    except ValueError:
+        print("Masukkan nomor yang valid!")
+    except KeyboardInterrupt:
+        print("\nOperasi dibatalkan oleh user.")
+
 def menu_input_data():
     """
     Menu untuk memilih mode input: Serial Port (otomatis + manual) atau Manual saja
@@ -401,10 +662,11 @@ def menu_input_data():
     print("="*60)
     print("1. Dari Serial Port (otomatis + dapat input manual)")
     print("2. Input Manual saja (tanpa serial)")
+    print("3. Dari beberapa Serial Port sekaligus")
     print("0. Kembali ke menu utama")
     
     try:
-        choice = input("\nPilih mode (0-2): ").strip()
+        choice = input("\nPilih mode (0-3): ").strip()
         
         if choice == '1':
             pilih_port_dan_mulai_logging()
@@ -417,7 +679,9 @@ def menu_input_data():
             if not excel_file.endswith('.xlsx'):
                 excel_file += '.xlsx'
             
-            input_manual_ke_excel(excel_file)
+            input_manual_ke_excel(excel_file, storage=_input_mode_simpan())
+        elif choice == '3':
+            pilih_banyak_port_dan_mulai_logging()
         elif choice == '0':
             return
         else:
@@ -0,0 +1,136 @@
+"""
+Filter deadband sebelum penyimpanan untuk mengurangi baris saat beban datar.
+
+Saat mesin menahan beban atau diam, nilai 'ovalue' yang datang hampir
+sama terus. Nilai baru hanya disimpan jika berubah lebih dari deadband
+(absolut dalam kN atau relatif terhadap nilai terakhir yang disimpan) dan
+sudah lewat interval minimum; heartbeat menyimpan satu nilai paling lambat
+setiap max_gap detik walaupun tidak berubah.
+
+Titik balik tidak hilang: nilai tertinggi dan terendah yang ditahan sejak
+penyimpanan terakhir ikut dikeluarkan (sebelum nilai baru) jika berada di
+luar rentang kedua nilai yang disimpan, sehingga puncak pembebanan tetap
+tercatat walaupun naiknya lebih kecil dari deadband. Deteksi specimen,
+rekaman mentah dan live feed tetap menerima setiap nilai.
+"""
+
+# Heartbeat default: minimal satu baris per menit saat beban datar
+MAX_GAP = 60.0
+
+
+class FilterPolicy:
+    """
+    Pengaturan filter deadband
+
+    Args:
+        deadband (float): Perubahan minimum dalam kN agar nilai disimpan
+                          (default: 0.0 = setiap perubahan disimpan)
+        deadband_rel (float): Perubahan minimum relatif terhadap nilai terakhir
+                              yang disimpan, misal 0.01 = 1% (default: 0.0)
+        min_interval (float): Jarak minimum antar baris dalam detik (default: 0.0)
+        max_gap (float): Heartbeat, simpan paling lambat setiap sekian detik
+                         walaupun tidak berubah; None = tanpa heartbeat (default: 60.0)
+    """
+
+    def __init__(self, deadband=0.0, deadband_rel=0.0, min_interval=0.0, max_gap=MAX_GAP):
+        if deadband < 0 or deadband_rel < 0:
+            raise ValueError("deadband tidak boleh negatif")
+        if min_interval < 0:
+            raise ValueError("min_interval tidak boleh negatif")
+        if max_gap is not None and max_gap <= 0:
+            raise ValueError("max_gap harus lebih dari 0")
+        if max_gap is not None and max_gap < min_interval:
+            raise ValueError("max_gap tidak boleh lebih kecil dari min_interval")
+        self.deadband = float(deadband)
+        self.deadband_rel = float(deadband_rel)
+        self.min_interval = float(min_interval)
+        self.max_gap = float(max_gap) if max_gap is not None else None
+
+    def __repr__(self):
+        return (f"FilterPolicy(deadband={self.deadband}, deadband_rel={self.deadband_rel}, "
+                f"min_interval={self.min_interval}, max_gap={self.max_gap})")
+
+
+class DeadbandFilter:
+    """
+    Memilih nilai yang perlu disimpan untuk satu mesin
+
+    Args:
+        policy (FilterPolicy): Pengaturan filter (default: FilterPolicy())
+    """
+
+    def __init__(self, policy=None):
+        self.policy = policy or FilterPolicy()
+        self.masuk = 0
+        self.keluar = 0
+        self._v = None
+        self._t = None
+        # Nilai yang ditahan sejak penyimpanan terakhir: (t, nilai, data)
+        self._maks = None
+        self._min = None
+        self._akhir = None
+
+    @property
+    def dibuang(self):
+        """Jumlah nilai yang tidak disimpan (termasuk yang masih ditahan)"""
+        return self.masuk - self.keluar
+
+    def proses(self, t, nilai, data):
+        """
+        Memasukkan satu nilai
+
+        Args:
+            t (float): Waktu nilai dalam detik (monotonic)
+            nilai (float): Nilai kN
+            data: Data pendamping yang dikeluarkan jika nilai disimpan
+
+        Returns:
+            list: Data yang harus disimpan sekarang, urut waktu (bisa kosong)
+        """
+        self.masuk += 1
+        if self._v is None:
+            return self._lepas(t, nilai, data)
+
+        p = self.policy
+        jarak = t - self._t # type: ignore
+        band = max(p.deadband, p.deadband_rel * abs(self._v))
+        if (abs(nilai - self._v) > band and jarak >= p.min_interval) \
+                or (p.max_gap is not None and jarak >= p.max_gap):
+            return self._lepas(t, nilai, data)
+
+        sampel = (t, nilai, data)
+        if self._maks is None or nilai > self._maks[1]:
+            self._maks = sampel
+        if self._min is None or nilai < self._min[1]:
+            self._min = sampel
+        self._akhir = sampel
+        return []
+
+    def akhiri(self):
+        """
+        Mengeluarkan nilai terakhir yang masih ditahan (misal saat sesi berakhir)
+
+        Returns:
+            list: Data yang harus disimpan, urut waktu (bisa kosong)
+        """
+        if self._akhir is None:
+            return []
+        return self._lepas(*self._akhir)
+
+    def _lepas(self, t, nilai, data):
+        """Menyimpan nilai ini beserta titik balik yang ditahan sebelumnya"""
+        ekstrem = []
+        if self._v is not None:
+            if self._maks is not None and self._maks[1] > max(self._v, nilai):
+                ekstrem.append(self._maks)
+            if self._min is not None and self._min[1] < min(self._v, nilai):
+                ekstrem.append(self._min)
+            ekstrem.sort(key=lambda s: s[0])
+
+        keluar = [s[2] for s in ekstrem if s[2] is not data]
+        keluar.append(data)
+        self.keluar += len(keluar)
+        self._v = nilai
+        self._t = t
+        self._maks = self._min = self._akhir = None
+        return keluar
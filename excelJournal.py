@@ -0,0 +1,173 @@
+"""
+Journal append-only untuk data logger.
+
+Setiap baris ditulis dulu ke file journal (satu baris JSON per data)
+sebelum masuk ke Excel. Jika program berhenti sebelum workbook tersimpan,
+isi journal diputar ulang ke Excel saat sesi berikutnya dimulai.
+
+Baris sheet utama disimpan sebagai list JSON, baris sheet lain (misal
+'Specimens') sebagai {"sheet": ..., "row": [...]}. Nilai datetime dicatat
+sebagai teks 'YYYY-MM-DD HH:MM:SS'; writer mengubahnya lagi menjadi sel
+waktu saat menulis (lihat cellFormat.py).
+"""
+import json
+import os
+import threading
+
+
+def journal_path(excel_file):
+    """
+    Nama file journal untuk sebuah file Excel
+
+    Args:
+        excel_file (str): Nama file Excel
+
+    Returns:
+        str: Nama file journal (misal: 'pressure_data.xlsx.journal')
+    """
+    return excel_file + ".journal"
+
+
+class Journal:
+    """
+    File journal append-only dengan fsync per record
+
+    Args:
+        path (str): Nama file journal
+        fsync (bool): Panggil os.fsync setelah setiap record (default: True)
+    """
+
+    def __init__(self, path, fsync=True):
+        self.path = path
+        self.fsync = fsync
+        self._file = None
+        self._lock = threading.Lock()
+
+    def open(self):
+        """Membuka file journal untuk ditambah"""
+        self._file = open(self.path, "ab")
+
+    def append(self, row, sheet=None):
+        """
+        Menulis satu record ke journal
+
+        Args:
+            row (list): Nilai-nilai kolom, kolom pertama adalah 'No'
+            sheet (str): Nama sheet tujuan, None = sheet utama
+        """
+        line = _encode(sheet, row)
+        with self._lock:
+            self._file.write(line) # type: ignore
+            self._file.flush() # type: ignore
+            if self.fsync:
+                os.fsync(self._file.fileno()) # type: ignore
+
+    def append_banyak(self, rows, sheet=None):
+        """
+        Menulis banyak record sekaligus dengan satu fsync
+
+        Args:
+            rows (list): Daftar baris, kolom pertama adalah 'No'
+            sheet (str): Nama sheet tujuan, None = sheet utama
+        """
+        data = b"".join(_encode(sheet, row) for row in rows)
+        with self._lock:
+            self._file.write(data) # type: ignore
+            self._file.flush() # type: ignore
+            if self.fsync:
+                os.fsync(self._file.fileno()) # type: ignore
+
+    def baca(self):
+        """
+        Membaca semua record yang utuh dari journal
+
+        Baris terakhir yang terpotong (misal karena crash saat menulis)
+        dilewati.
+
+        Returns:
+            list: Daftar (sheet, row); sheet None untuk sheet utama
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        records = []
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, list) and record:
+                    records.append((None, record))
+                elif isinstance(record, dict) and record.get("row"):
+                    records.append((record.get("sheet"), record["row"]))
+        return records
+
+    def buang_sampai(self, last_no, sheets=None):
+        """
+        Membuang record yang sudah tersimpan di Excel (No <= last_no)
+
+        Record yang masuk selama penyimpanan workbook tetap dipertahankan.
+
+        Args:
+            last_no (int): Nomor 'No' terakhir yang sudah tersimpan di sheet utama
+            sheets (dict): Nomor terakhir yang tersimpan per sheet lain;
+                           record sheet yang tidak disebut dipertahankan
+        """
+        batas = dict(sheets or {})
+        batas[None] = last_no
+        with self._lock:
+            sisa = [(sheet, row) for sheet, row in self.baca()
+                    if sheet not in batas or _nomor(row) > batas[sheet]]
+
+            if not sisa:
+                if self._file is not None:
+                    self._file.truncate(0)
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+                elif os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+
+            tmp = self.path + ".tmp"
+            with open(tmp, "wb") as f:
+                for sheet, row in sisa:
+                    f.write(_encode(sheet, row))
+                f.flush()
+                os.fsync(f.fileno())
+
+            if self._file is not None:
+                self._file.close()
+            os.replace(tmp, self.path)
+            if self._file is not None:
+                self._file = open(self.path, "ab")
+
+    def close(self, hapus_jika_kosong=True):
+        """
+        Menutup journal
+
+        Args:
+            hapus_jika_kosong (bool): Hapus file journal jika sudah kosong
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if hapus_jika_kosong and os.path.exists(self.path) and os.path.getsize(self.path) == 0:
+                os.remove(self.path)
+
+
+def _encode(sheet, row):
+    """Satu record journal sebagai baris JSON"""
+    record = row if sheet is None else {"sheet": sheet, "row": row}
+    return json.dumps(record, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+
+def _nomor(row):
+    """Nomor 'No' dari sebuah record, -1 jika tidak valid"""
+    try:
+        return int(row[0])
+    except (TypeError, ValueError, IndexError):
+        return -1
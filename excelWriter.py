@@ -0,0 +1,375 @@
+"""
+Penulis Excel write-behind untuk logger tekanan.
+
+Baris yang masuk ditampung di memori lalu ditulis ke file oleh thread
+latar belakang, sehingga loop serial tidak pernah menunggu disk.
+Setiap baris juga dicatat ke journal (lihat excelJournal.py) agar tidak
+hilang jika program berhenti sebelum workbook tersimpan. File yang sudah
+ada dilanjutkan lewat index sidecar (lihat resumeIndex.py); workbook baru
+dimuat oleh thread penulis saat flush pertama, dan openpyxl baru diimpor
+saat benar-benar diperlukan agar start sesi tetap cepat.
+"""
+import os
+import threading
+import time
+
+from cellFormat import atur_format, baris_bertipe, format_kolom, baris_excel
+from excelJournal import Journal, journal_path
+from resumeIndex import info_resume, tulis_index
+from sessionStats import TAHAP_APPEND, TAHAP_JOURNAL, TAHAP_SAVE
+
+# Kebijakan flush default
+FLUSH_ROWS = 50
+FLUSH_INTERVAL = 5.0
+
+
+class FlushPolicy:
+    """
+    Kapan buffer baris harus disimpan ke file
+
+    Args:
+        max_rows (int): Simpan setelah sejumlah baris terkumpul (default: 50)
+        max_interval (float): Simpan paling lambat setelah sekian detik (default: 5.0)
+    """
+
+    def __init__(self, max_rows=FLUSH_ROWS, max_interval=FLUSH_INTERVAL):
+        if max_rows < 1:
+            raise ValueError("max_rows minimal 1")
+        if max_interval <= 0:
+            raise ValueError("max_interval harus lebih dari 0")
+        self.max_rows = int(max_rows)
+        self.max_interval = float(max_interval)
+
+    def __repr__(self):
+        return f"FlushPolicy(max_rows={self.max_rows}, max_interval={self.max_interval})"
+
+
+class BufferedExcelWriter:
+    """
+    Menampung baris dan menyimpannya ke Excel dari thread terpisah
+
+    Workbook hanya disentuh oleh thread penulis; thread pemanggil cukup
+    memanggil append() yang hanya memasukkan baris ke buffer.
+
+    Args:
+        excel_file (str): Nama file Excel
+        header (list): Baris header untuk file baru
+        title (str): Judul sheet untuk file baru
+        policy (FlushPolicy): Kebijakan flush (default: FlushPolicy())
+        journal (bool): Catat setiap baris ke journal sebelum di-buffer (default: True)
+        extra_sheets (dict): Sheet tambahan {judul: header}, misal ringkasan 'Specimens'
+        stats (SessionStats): Tempat mencatat waktu journal/append/save (default: None)
+    """
+
+    def __init__(self, excel_file, header, title, policy=None, journal=True, extra_sheets=None,
+                 stats=None):
+        self.excel_file = excel_file
+        self.header = list(header)
+        self.title = title
+        self.policy = policy or FlushPolicy()
+        self.journal = Journal(journal_path(excel_file)) if journal else None
+        self.extra_sheets = dict(extra_sheets or {})
+        self.stats = stats
+        # Kolom kN dan waktu per sheet, ditulis sebagai angka/datetime
+        self._formats = {None: format_kolom(self.header)}
+        self._formats.update((nama, format_kolom(h)) for nama, h in self.extra_sheets.items())
+
+        self.wb = None
+        self.ws = None
+        # Nomor baris terakhir per sheet (None = sheet utama) di workbook yang dimuat
+        self._baris = {}
+        self.next_no = 1
+        self.file_baru = False
+        self.rows_saved = 0
+        self.rows_replayed = 0
+        self._belum_tersimpan = 0
+        self._last_no = 0
+        # Nomor 'No' terakhir yang sudah masuk sheet tambahan
+        self._last_no_sheet = {nama: 0 for nama in self.extra_sheets}
+
+        self._pending = []
+        self._cond = threading.Condition()
+        self._closing = False
+        self._flush_requested = False
+        self._thread = None
+
+    def open(self):
+        """
+        Membuka atau membuat workbook lalu menjalankan thread penulis
+
+        File yang sudah ada tidak dimuat di sini; nomor berikutnya diambil
+        dari index sidecar. Record journal yang tertinggal dari sesi
+        sebelumnya dimasukkan ke buffer sebelum data baru diterima.
+
+        Returns:
+            int: Nomor 'No' berikutnya untuk baris baru
+        """
+        if os.path.exists(self.excel_file):
+            info = info_resume(self.excel_file, tuple(self.extra_sheets))
+            rows = info["rows"]
+            for nama in self.extra_sheets:
+                self._last_no_sheet[nama] = info["sheets"].get(nama) or 0
+            self.file_baru = False
+        else:
+            from openpyxl import Workbook
+            self.wb = Workbook()
+            self.ws = self.wb.active
+            self.ws.title = self.title # type: ignore
+            self.ws.append(self.header) # type: ignore
+            for nama, header in self.extra_sheets.items():
+                self.wb.create_sheet(nama).append(header)
+            simpan_atomik(self.wb, self.excel_file)
+            rows = self.ws.max_row # type: ignore
+            self._baris = {None: rows}
+            tulis_index(self.excel_file, rows, 0, None, self._last_no_sheet)
+            self.file_baru = True
+
+        self.next_no = rows if rows > 1 else 1
+        self._last_no = self.next_no - 1
+        self._mulai()
+        return self.next_no
+
+    def _mulai(self):
+        """Memutar ulang journal lalu menjalankan thread penulis"""
+        self._next_sheet = {nama: no + 1 for nama, no in self._last_no_sheet.items()}
+        if self.journal is not None:
+            self._replay_journal()
+            self.journal.open()
+
+        self._thread = threading.Thread(target=self._run, name="excel-writer", daemon=True)
+        self._thread.start()
+
+    def next_no_sheet(self, sheet):
+        """
+        Nomor 'No' berikutnya untuk sheet tambahan, setelah open()
+
+        Args:
+            sheet (str): Judul sheet tambahan
+
+        Returns:
+            int: Nomor berikutnya
+        """
+        return self._next_sheet[sheet]
+
+    def append(self, row, sheet=None):
+        """
+        Menambahkan satu baris ke buffer (tidak menunggu disk)
+
+        Args:
+            row (list): Nilai-nilai kolom
+            sheet (str): Judul sheet tambahan, None = sheet utama
+        """
+        if sheet is not None and sheet not in self.extra_sheets:
+            raise ValueError(f"Sheet tidak dikenal: '{sheet}'")
+        if self.journal is not None:
+            t0 = time.perf_counter_ns()
+            self.journal.append(row, sheet)
+            if self.stats is not None:
+                self.stats.catat(TAHAP_JOURNAL, time.perf_counter_ns() - t0)
+
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("Writer sudah ditutup")
+            self._pending.append((sheet, row))
+            if len(self._pending) >= self.policy.max_rows:
+                self._cond.notify()
+
+    def append_banyak(self, rows, sheet=None):
+        """
+        Menambahkan banyak baris sekaligus, disimpan bersama dalam satu flush
+
+        Args:
+            rows (list): Daftar baris
+            sheet (str): Judul sheet tambahan, None = sheet utama
+        """
+        if sheet is not None and sheet not in self.extra_sheets:
+            raise ValueError(f"Sheet tidak dikenal: '{sheet}'")
+        rows = [list(row) for row in rows]
+        if not rows:
+            return
+        if self.journal is not None:
+            t0 = time.perf_counter_ns()
+            self.journal.append_banyak(rows, sheet)
+            if self.stats is not None:
+                self.stats.catat(TAHAP_JOURNAL, time.perf_counter_ns() - t0)
+
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("Writer sudah ditutup")
+            self._pending.extend((sheet, row) for row in rows)
+            self._flush_requested = True
+            self._cond.notify()
+
+    def flush(self):
+        """
+        Meminta thread penulis segera menyimpan buffer (tidak menunggu selesai)
+        """
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify()
+
+    @property
+    def pending(self):
+        """Jumlah baris yang belum tersimpan ke file"""
+        with self._cond:
+            return len(self._pending)
+
+    def close(self):
+        """
+        Menyimpan sisa buffer, menghentikan thread penulis dan menutup workbook
+        """
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+        if self.wb is not None:
+            self.wb.close()
+        if self.journal is not None:
+            self.journal.close()
+
+    def _replay_journal(self):
+        """Memasukkan record journal yang belum ada di workbook ke buffer"""
+        records = []
+        for sheet, row in self.journal.baca(): # type: ignore
+            if not isinstance(row[0], int):
+                continue
+            if sheet is None and row[0] > self._last_no:
+                self.next_no = row[0] + 1
+                self.rows_replayed += 1
+            elif sheet in self._last_no_sheet and row[0] > self._last_no_sheet[sheet]:
+                self._next_sheet[sheet] = row[0] + 1
+            else:
+                continue
+            records.append((sheet, row))
+        if not records:
+            return
+
+        # Sudah ada di journal, cukup masuk buffer dan segera di-flush
+        self._pending.extend(records)
+        self._flush_requested = True
+
+    def _run(self):
+        """Loop thread penulis"""
+        batas_waktu = time.monotonic() + self.policy.max_interval
+
+        while True:
+            with self._cond:
+                while not (self._closing or self._flush_requested
+                           or len(self._pending) >= self.policy.max_rows):
+                    sisa = batas_waktu - time.monotonic()
+                    if sisa <= 0:
+                        break
+                    self._cond.wait(sisa)
+
+                rows = self._pending
+                self._pending = []
+                self._flush_requested = False
+                selesai = self._closing
+
+            # Thread penulis tidak boleh mati: baris yang gagal tetap ada di journal
+            if rows or (selesai and self._belum_tersimpan):
+                try:
+                    self._tulis(rows)
+                except Exception as e:
+                    print(f"⚠ Gagal menulis ke '{self.excel_file}': {e}")
+            batas_waktu = time.monotonic() + self.policy.max_interval
+
+            if selesai:
+                try:
+                    self._akhiri()
+                except Exception as e:
+                    print(f"⚠ Gagal menutup '{self.excel_file}': {e}")
+                break
+
+    def _akhiri(self):
+        """Dipanggil sekali oleh thread penulis setelah flush terakhir"""
+        pass
+
+    def _tulis(self, rows):
+        """Menulis baris ke sheet lalu menyimpan file"""
+        if self.wb is None:
+            # Dimuat di thread ini agar awal sesi tidak menunggu workbook besar
+            try:
+                from openpyxl import load_workbook
+                self.wb = load_workbook(self.excel_file)
+                self.ws = self.wb.worksheets[0]
+                self._baris = {None: self.ws.max_row}
+            except Exception as e:
+                print(f"⚠ Gagal memuat '{self.excel_file}': {e}")
+                # Kembalikan ke buffer, dicoba lagi pada flush berikutnya
+                with self._cond:
+                    self._pending[:0] = rows
+                return
+
+        t0 = time.perf_counter_ns()
+        for sheet, row in rows:
+            formats = self._formats[sheet]
+            ws = self.ws if sheet is None else self._sheet(sheet)
+            try:
+                ws.append(baris_excel(baris_bertipe(row, formats))) # type: ignore
+            except Exception as e:
+                print(f"⚠ Baris No {row[0]} dilewati, tidak bisa ditulis ke '{self.excel_file}': {e}")
+                continue
+            self._baris[sheet] += 1
+            atur_format(ws, formats, self._baris[sheet])
+            if sheet is None:
+                self._last_no = row[0]
+            else:
+                self._last_no_sheet[sheet] = row[0]
+            self._belum_tersimpan += 1
+
+        try:
+            t1 = time.perf_counter_ns()
+            simpan_atomik(self.wb, self.excel_file)
+            if self.stats is not None:
+                self.stats.catat(TAHAP_APPEND, t1 - t0)
+                self.stats.catat(TAHAP_SAVE, time.perf_counter_ns() - t1)
+            self.rows_saved += self._belum_tersimpan
+            self._belum_tersimpan = 0
+            last = self.ws[self._baris[None]] # type: ignore
+            tulis_index(self.excel_file, self._baris[None], self._last_no,
+                        str(last[1].value) if len(last) > 1 else None, self._last_no_sheet)
+        except Exception as e:
+            # Baris sudah ada di sheet, akan ikut tersimpan pada flush berikutnya
+            print(f"⚠ Gagal menyimpan '{self.excel_file}': {e}")
+            return
+
+        # Compaction: record yang sudah ada di Excel dibuang dari journal
+        if self.journal is not None:
+            try:
+                self.journal.buang_sampai(self._last_no, self._last_no_sheet)
+            except OSError as e:
+                print(f"⚠ Gagal memadatkan journal: {e}")
+
+    def _sheet(self, nama):
+        """Sheet tambahan di workbook, dibuat dengan header jika belum ada"""
+        if nama in self.wb.sheetnames: # type: ignore
+            ws = self.wb[nama] # type: ignore
+        else:
+            ws = self.wb.create_sheet(nama) # type: ignore
+            ws.append(self.extra_sheets[nama])
+        if nama not in self._baris:
+            # Sekali per workbook; selanjutnya dihitung sendiri
+            self._baris[nama] = ws.max_row
+        return ws
+
+
+def simpan_atomik(wb, excel_file):
+    """
+    Menyimpan workbook ke file sementara lalu menggantikan file asli
+
+    File lama tetap utuh jika proses berhenti di tengah penyimpanan.
+
+    Args:
+        wb (Workbook): Workbook yang disimpan
+        excel_file (str): Nama file Excel tujuan
+    """
+    tmp = excel_file + ".tmp"
+    wb.save(tmp)
+    with open(tmp, "rb+") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, excel_file)
@@ -0,0 +1,107 @@
+"""
+Framing dan parsing data serial mesin tekan langsung dari bytes.
+
+Semua byte yang tersedia dibaca sekaligus ke bytearray yang dipakai ulang,
+lalu setiap frame (diakhiri '\\n') diambil sebagai memoryview tanpa disalin.
+Nilai 'ovalue <kN>' dicocokkan dengan regex yang sudah dikompilasi, jadi
+tidak ada decode/lower/split per baris. Frame yang terpotong di antara dua
+pembacaan disimpan sampai sisanya datang.
+"""
+import re
+
+# 'ovalue' diikuti angka (koma atau titik desimal); grup kosong = format tidak lengkap
+OVALUE_RE = re.compile(rb"(?i)ovalue(?:[ \t]+([-+]?\d+(?:[.,]\d+)?))?")
+
+# Kapasitas awal buffer dan panjang maksimum satu frame
+KAPASITAS_BUFFER = 4096
+MAX_FRAME = 1024
+
+
+def parse_ovalue(frame):
+    """
+    Mengambil nilai kN dari satu frame
+
+    Args:
+        frame (bytes | memoryview): Isi frame tanpa '\\n'
+
+    Returns:
+        bytes: Teks angka (misal b'12,5'), b'' jika frame 'ovalue' tanpa
+               nilai yang valid, atau None jika bukan frame 'ovalue'
+    """
+    m = OVALUE_RE.search(frame)
+    if m is None:
+        return None
+    return m.group(1) or b""
+
+
+class FrameBuffer:
+    """
+    Buffer byte serial yang memecah aliran menjadi frame per baris
+
+    Args:
+        kapasitas (int): Ukuran awal buffer (default: 4096)
+        max_frame (int): Frame tanpa '\\n' yang lebih panjang dari ini dibuang (default: 1024)
+    """
+
+    def __init__(self, kapasitas=KAPASITAS_BUFFER, max_frame=MAX_FRAME):
+        self._buf = bytearray(kapasitas)
+        self._len = 0
+        self.max_frame = max_frame
+        self.frame_dibuang = 0
+
+    def isi(self, data):
+        """
+        Menambahkan byte hasil pembacaan serial ke buffer
+
+        Args:
+            data (bytes): Byte yang baru dibaca
+        """
+        n = len(data)
+        if not n:
+            return
+
+        akhir = self._len + n
+        if akhir > len(self._buf):
+            if self._len > self.max_frame:
+                # Sisa tanpa '\n' terlalu panjang: bukan frame yang valid
+                self._len = 0
+                self.frame_dibuang += 1
+                akhir = n
+            if akhir > len(self._buf):
+                self._buf.extend(bytes(akhir - len(self._buf)))
+
+        self._buf[self._len:akhir] = data
+        self._len = akhir
+
+    def frames(self):
+        """
+        Menghasilkan setiap frame lengkap di buffer sebagai memoryview
+
+        Memoryview hanya berlaku selama iterasi; sisa frame yang belum
+        lengkap dipindah ke awal buffer setelah iterasi selesai.
+
+        Yields:
+            memoryview: Isi frame tanpa '\\r\\n'
+        """
+        buf = self._buf
+        mv = memoryview(buf)
+        mulai = 0
+        try:
+            while True:
+                akhir = buf.find(b"\n", mulai, self._len)
+                if akhir < 0:
+                    break
+                ujung = akhir
+                if ujung > mulai and buf[ujung - 1] == 0x0D:
+                    ujung -= 1
+                if ujung > mulai:
+                    frame = mv[mulai:ujung]
+                    yield frame
+                    frame.release()
+                mulai = akhir + 1
+        finally:
+            mv.release()
+            if mulai:
+                sisa = self._len - mulai
+                buf[:sisa] = buf[mulai:self._len]
+                self._len = sisa
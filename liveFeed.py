@@ -0,0 +1,227 @@
+"""
+Feed data langsung di localhost lewat Server-Sent Events (SSE).
+
+Setiap nilai yang diparse dan setiap specimen dikirim ke semua
+pelanggan yang tersambung ke http://127.0.0.1:<port>/events, sehingga
+dashboard tidak perlu membaca output console. Halaman '/' berisi grafik
+sederhana, '/status' berisi jumlah pelanggan dan event yang dibuang.
+
+Setiap pelanggan punya antrean terbatas sendiri. Jika pelanggan lambat,
+event terlama di antreannya dibuang (drop-oldest); kirim() tidak pernah
+menunggu jaringan, jadi dashboard tidak bisa menambah latency ke
+pembacaan serial maupun penyimpanan.
+"""
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HOST = "127.0.0.1"
+PORT_FEED = 8765
+
+# Jumlah event maksimum yang menunggu per pelanggan
+KAPASITAS_KLIEN = 256
+# Komentar SSE dikirim saat sepi agar koneksi tidak dianggap mati
+KEEPALIVE = 15.0
+
+
+class _Klien:
+    """Antrean event satu pelanggan"""
+
+    def __init__(self, kapasitas, alamat):
+        self.antrean = deque(maxlen=kapasitas)
+        self.ada_data = threading.Event()
+        self.alamat = alamat
+        self.dibuang = 0
+        self.terkirim = 0
+
+
+class LiveFeed:
+    """
+    Server SSE dengan fan-out non-blocking ke banyak pelanggan
+
+    Args:
+        host (str): Alamat bind (default: '127.0.0.1', hanya lokal)
+        port (int): Port HTTP (default: 8765)
+        kapasitas_klien (int): Panjang antrean per pelanggan (default: 256)
+    """
+
+    def __init__(self, host=HOST, port=PORT_FEED, kapasitas_klien=KAPASITAS_KLIEN):
+        self.host = host
+        self.port = port
+        self.kapasitas_klien = kapasitas_klien
+        self.klien = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self._berhenti = threading.Event()
+
+    @property
+    def url(self):
+        """Alamat halaman feed"""
+        return f"http://{self.host}:{self._server.server_port if self._server else self.port}/"
+
+    def mulai(self):
+        """Membuka server HTTP di thread latar belakang"""
+        feed = self
+
+        class Handler(_FeedHandler):
+            pass
+        Handler.feed = feed
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="live-feed", daemon=True)
+        self._thread.start()
+
+    def kirim(self, event, data):
+        """
+        Mengirim satu event ke semua pelanggan tanpa menunggu
+
+        Args:
+            event (str): Nama event SSE ('reading', 'specimen', ...)
+            data (dict): Isi event, di-JSON-kan sekali untuk semua pelanggan
+        """
+        klien = self.klien
+        if not klien:
+            return
+        pesan = f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n".encode("utf-8")
+        for k in klien:
+            if len(k.antrean) == k.antrean.maxlen:
+                # deque(maxlen) membuang yang terlama secara otomatis
+                k.dibuang += 1
+            k.antrean.append(pesan)
+            k.ada_data.set()
+
+    def status(self):
+        """
+        Returns:
+            dict: Jumlah pelanggan dan event terkirim/dibuang per pelanggan
+        """
+        return {
+            "klien": [{"alamat": k.alamat, "terkirim": k.terkirim, "dibuang": k.dibuang,
+                       "menunggu": len(k.antrean)} for k in list(self.klien)],
+        }
+
+    def tutup(self):
+        """Menghentikan server dan memutus semua pelanggan"""
+        self._berhenti.set()
+        for k in list(self.klien):
+            k.ada_data.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _tambah_klien(self, alamat):
+        k = _Klien(self.kapasitas_klien, alamat)
+        with self._lock:
+            # Daftar baru (bukan diubah di tempat) agar kirim() bisa iterasi tanpa lock
+            self.klien = self.klien + [k]
+        return k
+
+    def _hapus_klien(self, k):
+        with self._lock:
+            self.klien = [x for x in self.klien if x is not k]
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    """Handler HTTP untuk /events, /status dan halaman grafik"""
+
+    feed = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Jangan campur log HTTP dengan output logger di console
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/events":
+            self._events()
+        elif path == "/status":
+            self._kirim_body(200, "application/json", json.dumps(self.feed.status()).encode("utf-8")) # type: ignore
+        elif path == "/":
+            self._kirim_body(200, "text/html; charset=utf-8", HALAMAN.encode("utf-8"))
+        else:
+            self._kirim_body(404, "text/plain", b"not found")
+
+    def _kirim_body(self, kode, jenis, body):
+        self.send_response(kode)
+        self.send_header("Content-Type", jenis)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _events(self):
+        feed = self.feed
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "keep-alive")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.close_connection = True
+
+        k = feed._tambah_klien(f"{self.client_address[0]}:{self.client_address[1]}") # type: ignore
+        try:
+            self.wfile.write(b"retry: 2000\n\n")
+            self.wfile.flush()
+            while not feed._berhenti.is_set(): # type: ignore
+                if not k.ada_data.wait(KEEPALIVE):
+                    self.wfile.write(b": ping\n\n")
+                    self.wfile.flush()
+                    continue
+                k.ada_data.clear()
+                while k.antrean:
+                    pesan = k.antrean.popleft()
+                    self.wfile.write(pesan)
+                    k.terkirim += 1
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+        finally:
+            feed._hapus_klien(k) # type: ignore
+
+
+HALAMAN = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Pressure Live</title>
+<style>
+body{font-family:sans-serif;margin:1em}#nilai{font-size:3em}canvas{border:1px solid #ccc;width:100%;height:300px}
+#specimen{margin-top:1em}
+</style></head>
+<body>
+<div id="nilai">- kN</div><div id="info"></div>
+<canvas id="grafik" width="1000" height="300"></canvas>
+<div id="specimen"></div>
+<script>
+const data = [], MAKS = 600;
+const c = document.getElementById("grafik"), g = c.getContext("2d");
+function gambar() {
+  g.clearRect(0, 0, c.width, c.height);
+  if (!data.length) return;
+  const atas = Math.max(1, ...data) * 1.1;
+  g.beginPath();
+  data.forEach((v, i) => {
+    const x = i * c.width / MAKS, y = c.height - v / atas * c.height;
+    i ? g.lineTo(x, y) : g.moveTo(x, y);
+  });
+  g.stroke();
+}
+const es = new EventSource("/events");
+es.addEventListener("reading", e => {
+  const r = JSON.parse(e.data);
+  document.getElementById("nilai").textContent = r.kn + " kN";
+  document.getElementById("info").textContent = r.port + " " + r.sumber + (r.no ? " #" + r.no : "");
+  data.push(r.kn); if (data.length > MAKS) data.shift();
+  requestAnimationFrame(gambar);
+});
+es.addEventListener("specimen", e => {
+  const s = JSON.parse(e.data);
+  const d = document.createElement("div");
+  d.textContent = "Specimen #" + s.no + ": puncak " + s.puncak + " kN (" + s.akhir + ")";
+  document.getElementById("specimen").prepend(d);
+});
+</script>
+</body></html>
+"""
@@ -0,0 +1,365 @@
+"""
+Menggabungkan banyak file logger menjadi satu file urut tanpa duplikat.
+
+Satu hari pengujian sering tersebar di beberapa file: sesi yang tersambung
+ulang, file SERIAL ('pressure_data.xlsx') dan file manual
+('pressure_data_manual.xlsx'), dengan baris yang tumpang tindih dan nomor
+'No' yang mulai lagi dari 1. Semua file dibaca secara streaming (read-only),
+setiap baris dikenali dari hash (Timestamp, Nilai KN, Sumber, Raw Data/
+Keterangan) dan baris yang sudah pernah dilihat dibuang. Hasilnya satu
+sheet urut waktu dengan 'No' baru 1..n.
+
+Timestamp hanya sampai detik, jadi saat beban datar beberapa baris sah
+bisa identik. Baris seperti itu dibedakan dengan urutan kemunculannya
+dalam detik yang sama di file masing-masing: tiga baris identik di satu
+file dan dua di file lain menghasilkan tiga baris, bukan satu.
+
+Penggabungan bersifat inkremental. State di '<output>.merge' mencatat
+ukuran, mtime dan jumlah baris yang sudah dibaca dari setiap file sumber;
+hash semua baris output disimpan append-only di '<output>.merge.hash'.
+Saat dijalankan ulang, file yang tidak berubah dilewati dan file yang
+bertambah hanya dibaca mulai baris baru. Baris baru lalu digabung
+(merge) dengan output lama yang sudah urut, tanpa membaca ulang sumbernya.
+Jika output diubah di luar program ini, state tidak lagi cocok dan
+penggabungan diulang penuh.
+
+Contoh:
+    python mergeLogs.py pressure_data*.xlsx --output hari_ini.xlsx
+    python mergeLogs.py data/ --output gabungan.xlsx --ulang
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import os
+import sys
+from array import array
+from datetime import datetime
+
+from batchAnalysis import kumpulkan_file
+from cellFormat import FORMAT_TIMESTAMP, format_kolom, ke_angka, ke_waktu, sel_write_only
+
+HEADER_GABUNGAN = ["No", "Timestamp", "Nilai KN", "Sumber", "Raw Data/Keterangan"]
+OUTPUT_GABUNGAN = "pressure_data_gabungan.xlsx"
+
+# Kolom keterangan di format SERIAL dan format manual
+KOLOM_RAW = ("Raw Data/Keterangan", "Keterangan")
+
+VERSI_STATE = 1
+
+
+def state_path(output):
+    """
+    Nama file state penggabungan
+
+    Args:
+        output (str): File Excel hasil gabungan
+
+    Returns:
+        str: Misal 'gabungan.xlsx.merge'
+    """
+    return output + ".merge"
+
+
+def hash_path(output):
+    """Nama file index hash baris output"""
+    return output + ".merge.hash"
+
+
+def hash_baris(waktu, nilai, sumber, raw, ke=0):
+    """
+    Hash 64-bit satu baris untuk deteksi duplikat
+
+    Nilai teks lama ('12,5') dan sel angka (12.5) menghasilkan hash yang
+    sama, begitu juga timestamp teks dan datetime.
+
+    Args:
+        ke (int): Urutan kemunculan baris identik dalam file (0 = pertama)
+
+    Returns:
+        int: Hash blake2b 8 byte
+    """
+    if isinstance(waktu, datetime):
+        waktu = waktu.strftime(FORMAT_TIMESTAMP)
+    if isinstance(nilai, float):
+        nilai = repr(nilai)
+    kunci = "\x1f".join("" if v is None else str(v) for v in (waktu, nilai, sumber, raw))
+    if ke:
+        kunci += f"\x1f#{ke}"
+    return int.from_bytes(hashlib.blake2b(kunci.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _urutan(row):
+    """Kunci urut baris: timestamp; baris tanpa timestamp valid di akhir"""
+    waktu = row[1]
+    return (0, waktu) if isinstance(waktu, datetime) else (1, datetime.min)
+
+
+def _stempel(path):
+    """{'mtime_ns', 'size'} file, None jika tidak ada"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+def baca_state(output):
+    """
+    Membaca state dan index hash jika masih cocok dengan file output
+
+    Args:
+        output (str): File Excel hasil gabungan
+
+    Returns:
+        tuple: (state dict, set hash); state kosong jika belum ada, rusak
+               atau output sudah berubah sejak penggabungan terakhir
+    """
+    kosong = {"versi": VERSI_STATE, "output": None, "baris": 0, "hash": 0, "files": {}}
+    try:
+        with open(state_path(output), "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return kosong, set()
+    if not isinstance(state, dict) or state.get("versi") != VERSI_STATE:
+        return kosong, set()
+    if state.get("output") is None or state.get("output") != _stempel(output):
+        return kosong, set()
+
+    hashes = array("Q")
+    try:
+        with open(hash_path(output), "rb") as f:
+            hashes.fromfile(f, state["hash"])
+    except (OSError, EOFError, KeyError, TypeError):
+        return kosong, set()
+    return state, set(hashes)
+
+
+def tulis_state(output, state, hash_baru):
+    """
+    Menambahkan hash baru ke index lalu mencatat state
+
+    Hash ditulis lebih dulu; hash sisa penggabungan yang terputus
+    (melewati jumlah di state) diabaikan dan ditimpa pada run berikutnya.
+
+    Args:
+        output (str): File Excel hasil gabungan (sudah disimpan)
+        state (dict): State yang dicatat ('hash' = jumlah hash sebelum hash_baru)
+        hash_baru (list): Hash baris yang baru masuk ke output
+    """
+    path = hash_path(output)
+    mode = "r+b" if state["hash"] and os.path.exists(path) else "wb"
+    with open(path, mode) as f:
+        f.seek(state["hash"] * 8)
+        array("Q", hash_baru).tofile(f)
+        f.truncate()
+        f.flush()
+        os.fsync(f.fileno())
+
+    state = dict(state, hash=state["hash"] + len(hash_baru), output=_stempel(output))
+    tmp = state_path(output) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp, state_path(output))
+
+
+def _kolom(header, nama):
+    """Index kolom pertama yang namanya ada di 'nama', None jika tidak ada"""
+    for n in nama:
+        if n in header:
+            return header.index(n)
+    return None
+
+
+def baca_baris_baru(excel_file, mulai=0):
+    """
+    Membaca baris data sheet pertama mulai dari baris ke-'mulai'
+
+    Args:
+        excel_file (str): File logger (format SERIAL atau manual)
+        mulai (int): Jumlah baris data yang sudah dibaca sebelumnya
+
+    Returns:
+        tuple: (list [Timestamp, Nilai KN, Sumber, Raw] bertipe, jumlah baris data di file)
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(excel_file, read_only=True)
+    try:
+        ws = wb.worksheets[0]
+        header = list(next(ws.iter_rows(max_row=1, values_only=True), None) or [])
+        i_kn = _kolom(header, ("Nilai KN",))
+        if i_kn is None:
+            raise ValueError("kolom 'Nilai KN' tidak ditemukan di sheet pertama")
+        i_ts = _kolom(header, ("Timestamp",))
+        i_sumber = _kolom(header, ("Sumber",))
+        i_raw = _kolom(header, KOLOM_RAW)
+
+        def isi(row, i):
+            return row[i] if i is not None and i < len(row) else None
+
+        rows = []
+        n = mulai
+        for row in ws.iter_rows(min_row=mulai + 2, values_only=True):
+            n += 1
+            if all(v is None for v in row):
+                continue
+            waktu = ke_waktu(isi(row, i_ts))
+            if isinstance(waktu, datetime):
+                waktu = waktu.replace(microsecond=0)
+            sumber = isi(row, i_sumber) if i_sumber is not None else "MANUAL"
+            nilai = ke_angka(isi(row, i_kn))
+            if isinstance(nilai, int) and not isinstance(nilai, bool):
+                # openpyxl membaca 12.0 sebagai 12
+                nilai = float(nilai)
+            rows.append([waktu, nilai, sumber, isi(row, i_raw)])
+    finally:
+        wb.close()
+    return rows, n
+
+
+def _baris_output(output):
+    """Baris output lama secara streaming (sudah urut), kolom 'No' diisi ulang saat ditulis"""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(output, read_only=True)
+    try:
+        for row in wb.worksheets[0].iter_rows(min_row=2, values_only=True):
+            if any(v is not None for v in row):
+                yield list(row[:5]) + [None] * (5 - len(row))
+    finally:
+        wb.close()
+
+
+def gabung(files, output=OUTPUT_GABUNGAN, ulang=False):
+    """
+    Menggabungkan file logger ke output secara inkremental
+
+    Args:
+        files (list): File Excel logger
+        output (str): File Excel hasil gabungan
+        ulang (bool): Abaikan state dan gabungkan ulang semua file
+
+    Returns:
+        dict: {'output', 'file_dibaca', 'file_dilewati', 'baris_dibaca',
+               'baris_baru', 'duplikat', 'total', 'gagal': {file: error}}
+    """
+    from openpyxl import Workbook
+
+    from excelWriter import simpan_atomik
+    from resumeIndex import tulis_index
+
+    state, dilihat = ({"versi": VERSI_STATE, "output": None, "baris": 0, "hash": 0, "files": {}}, set()) \
+        if ulang else baca_state(output)
+    hasil = {"output": output, "file_dibaca": 0, "file_dilewati": 0, "baris_dibaca": 0,
+             "baris_baru": 0, "duplikat": 0, "total": state["baris"], "gagal": {}}
+
+    baru = []
+    hash_baru = []
+    files_state = dict(state["files"])
+    for excel_file in files:
+        kunci = os.path.abspath(excel_file)
+        stempel = _stempel(excel_file)
+        lama = files_state.get(kunci)
+        if lama is not None and stempel is not None \
+                and lama["mtime_ns"] == stempel["mtime_ns"] and lama["size"] == stempel["size"]:
+            hasil["file_dilewati"] += 1
+            continue
+
+        mulai = lama["baris"] if lama is not None else 0
+        try:
+            rows, jumlah = baca_baris_baru(excel_file, mulai)
+            if jumlah < mulai:
+                # File ditulis ulang lebih pendek: baca dari awal, duplikat tetap dibuang
+                mulai = 0
+                rows, jumlah = baca_baris_baru(excel_file, 0)
+        except Exception as e:
+            hasil["gagal"][excel_file] = str(e)
+            continue
+        hasil["file_dibaca"] += 1
+        hasil["baris_dibaca"] += len(rows)
+
+        # Hitungan baris identik; dari pembacaan sebelumnya hanya detik terakhir
+        # yang perlu dilanjutkan karena file logger ditulis urut waktu
+        ekor = lama.get("ekor", {}) if lama is not None and mulai else {}
+        waktu_ekor = lama.get("waktu_ekor") if lama is not None and mulai else None
+        hitung = {int(k): n for k, n in ekor.items()}
+        waktu_hash = dict.fromkeys(hitung, waktu_ekor)
+        file_baru = []
+        for row in rows:
+            dasar = hash_baris(*row)
+            ke = hitung.get(dasar, 0)
+            hitung[dasar] = ke + 1
+            waktu_ekor = waktu_hash[dasar] = str(row[0])
+            h = hash_baris(*row, ke=ke) if ke else dasar
+            if h in dilihat:
+                hasil["duplikat"] += 1
+                continue
+            dilihat.add(h)
+            hash_baru.append(h)
+            file_baru.append([None] + row)
+        # File logger biasanya sudah urut, jadi sort ini hampir gratis
+        file_baru.sort(key=_urutan)
+        baru.append(file_baru)
+        files_state[kunci] = dict(stempel or {}, baris=jumlah, waktu_ekor=waktu_ekor,
+                                  ekor={str(k): n for k, n in hitung.items() if waktu_hash[k] == waktu_ekor})
+
+    if not hash_baru and state["output"] is not None:
+        if files_state != state["files"]:
+            tulis_state(output, dict(state, files=files_state), [])
+        return hasil
+
+    sumber = baru
+    if state["output"] is not None:
+        sumber = [_baris_output(output)] + baru
+    formats = format_kolom(HEADER_GABUNGAN)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Pressure Data")
+    ws.append(HEADER_GABUNGAN)
+    no = 0
+    last = None
+    for row in heapq.merge(*sumber, key=_urutan):
+        no += 1
+        row[0] = no
+        ws.append(sel_write_only(ws, list(row), formats))
+        last = row
+    simpan_atomik(wb, output)
+    try:
+        tulis_index(output, no + 1, no, str(last[1]) if last else None)
+    except OSError:
+        pass
+
+    tulis_state(output, dict(state, baris=no, files=files_state), hash_baru)
+    hasil["baris_baru"] = len(hash_baru)
+    hasil["total"] = no
+    return hasil
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Gabungkan file logger tekanan menjadi satu file urut tanpa baris duplikat")
+    parser.add_argument("file", nargs="+", help="File Excel, pola (misal 'pressure_data*.xlsx') atau folder")
+    parser.add_argument("--output", default=OUTPUT_GABUNGAN, help=f"File hasil (default: {OUTPUT_GABUNGAN})")
+    parser.add_argument("--ulang", action="store_true", help="Abaikan state, gabungkan ulang semua file")
+    args = parser.parse_args(argv)
+
+    files = kumpulkan_file(args.file, kecuali=(args.output,))
+    hilang = [f for f in files if not os.path.exists(f)]
+    for f in hilang:
+        print(f"Error: '{f}' tidak ditemukan", file=sys.stderr)
+    files = [f for f in files if f not in hilang]
+    if not files:
+        print("Error: tidak ada file yang cocok", file=sys.stderr)
+        return 2
+
+    hasil = gabung(files, args.output, args.ulang)
+    for f, e in hasil["gagal"].items():
+        print(f"⚠ {f}: {e}", file=sys.stderr)
+    print(f"✓ {hasil['file_dibaca']} file dibaca, {hasil['file_dilewati']} tidak berubah | "
+          f"{hasil['baris_dibaca']} baris baru dibaca, {hasil['duplikat']} duplikat, "
+          f"{hasil['baris_baru']} masuk -> {args.output} ({hasil['total']} baris)")
+    return 1 if hasil["gagal"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""
+Deteksi otomatis port dan baud rate mesin tekan.
+
+Semua port kandidat diperiksa bersamaan, masing-masing di thread sendiri
+dengan batas waktu ketat. Untuk setiap baud rate kandidat, port didengarkan
+sebentar lalu frame 'ovalue' yang valid dihitung; port yang benar-benar
+mengirim data mesin diurutkan paling atas.
+
+Hasil deteksi disimpan per hardware ID (VID:PID/serial adapter USB), jadi
+mesin yang sudah dikenal cukup dicek sekali pada baud rate tersimpan saat
+start berikutnya, walaupun nama port-nya berubah. Jika pengecekan gagal
+(adapter ditukar atau baud rate mesin diganti) entri cache dihapus dan
+port dideteksi ulang.
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import serial
+import serial.tools.list_ports
+
+from frameParser import FrameBuffer, parse_ovalue
+
+# Baud rate yang dicoba, urut dari yang paling umum di mesin tekan
+KANDIDAT_BAUD = (9600, 19200, 38400, 57600, 115200, 4800, 2400)
+
+# Lama mendengarkan satu baud rate dan batas waktu seluruh deteksi (detik)
+DURASI_SNIFF = 0.6
+BATAS_WAKTU = 10.0
+
+CACHE_FILE = os.path.join(os.path.expanduser("~"), ".pressure_ports.json")
+
+
+def kunci_port(info):
+    """
+    Kunci cache untuk sebuah port
+
+    Args:
+        info (ListPortInfo): Hasil serial.tools.list_ports.comports()
+
+    Returns:
+        str: Hardware ID, atau nama device jika hardware ID tidak tersedia
+    """
+    hwid = getattr(info, "hwid", None)
+    if hwid and hwid != "n/a":
+        return hwid
+    return info.device
+
+
+def baca_cache(path=CACHE_FILE):
+    """
+    Membaca cache deteksi
+
+    Args:
+        path (str): Nama file cache
+
+    Returns:
+        dict: {kunci_port: {'baud', 'port', 'terakhir'}}, kosong jika tidak ada
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def tulis_cache(cache, path=CACHE_FILE):
+    """
+    Menyimpan cache deteksi secara atomik
+
+    Args:
+        cache (dict): Isi cache
+        path (str): Nama file cache
+    """
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"⚠ Gagal menyimpan cache port: {e}")
+
+
+def sniff(port, baud, durasi=DURASI_SNIFF, batas=None):
+    """
+    Mendengarkan satu port pada satu baud rate
+
+    Args:
+        port (str): Nama port
+        baud (int): Baud rate
+        durasi (float): Lama mendengarkan (detik)
+        batas (float): Batas akhir time.monotonic(), tidak melewati ini
+
+    Returns:
+        dict: {'baud', 'ovalue', 'frame', 'bytes', 'cetak'} dengan 'cetak' =
+              rasio byte yang bisa dicetak (tinggi = baud rate cocok)
+    """
+    hasil = {"baud": baud, "ovalue": 0, "frame": 0, "bytes": 0, "cetak": 0.0}
+    akhir = time.monotonic() + durasi
+    if batas is not None:
+        akhir = min(akhir, batas)
+
+    buffer = FrameBuffer()
+    tercetak = 0
+    with serial.Serial(port, baud, timeout=0.05, write_timeout=0.5) as ser:
+        ser.reset_input_buffer()
+        while time.monotonic() < akhir:
+            data = ser.read(ser.in_waiting or 1)
+            if not data:
+                continue
+            hasil["bytes"] += len(data)
+            tercetak += sum(1 for b in data if 32 <= b < 127 or b in (9, 10, 13))
+            buffer.isi(data)
+            for frame in buffer.frames():
+                hasil["frame"] += 1
+                if parse_ovalue(frame):
+                    hasil["ovalue"] += 1
+
+    if hasil["bytes"]:
+        hasil["cetak"] = round(tercetak / hasil["bytes"], 3)
+    return hasil
+
+
+def periksa_port(port, bauds=KANDIDAT_BAUD, durasi=DURASI_SNIFF, batas=None):
+    """
+    Mencoba baud rate satu per satu sampai frame 'ovalue' ditemukan
+
+    Args:
+        port (str): Nama port
+        bauds (tuple): Baud rate kandidat, urut prioritas
+        durasi (float): Lama mendengarkan per baud rate
+        batas (float): Batas akhir time.monotonic()
+
+    Returns:
+        dict: Hasil sniff terbaik ditambah 'port' dan 'error'
+    """
+    terbaik = None
+    for baud in bauds:
+        if batas is not None and time.monotonic() >= batas:
+            break
+        try:
+            hasil = sniff(port, baud, durasi, batas)
+        except (serial.SerialException, OSError, ValueError) as e:
+            return {"port": port, "baud": None, "ovalue": 0, "frame": 0, "bytes": 0, "cetak": 0.0,
+                    "error": str(e)}
+        if terbaik is None or _skor(hasil) > _skor(terbaik):
+            terbaik = hasil
+        if hasil["ovalue"]:
+            break
+
+    terbaik = terbaik or {"baud": None, "ovalue": 0, "frame": 0, "bytes": 0, "cetak": 0.0}
+    return {"port": port, **terbaik, "error": None}
+
+
+def _skor(hasil):
+    """Urutan peringkat: frame ovalue, lalu frame teks, lalu byte yang bisa dicetak"""
+    return (hasil["ovalue"], hasil["frame"], hasil["cetak"])
+
+
+def _periksa_bersamaan(ports, urutan, durasi, batas):
+    """
+    Menjalankan periksa_port() untuk semua port bersamaan
+
+    Args:
+        ports (list): Nama port
+        urutan (dict): Baud rate kandidat per port, urut prioritas
+        durasi (float): Lama mendengarkan per baud rate
+        batas (float): Batas akhir time.monotonic()
+
+    Returns:
+        dict: {port: hasil periksa_port()}, 'error' = 'timeout' untuk port
+              yang belum selesai saat batas waktu habis
+    """
+    hasil = {}
+    selesai = threading.Condition()
+
+    def _periksa(port):
+        r = periksa_port(port, urutan[port], durasi, batas)
+        with selesai:
+            hasil[port] = r
+            selesai.notify()
+
+    for port in ports:
+        # Daemon: port yang macet saat dibuka tidak menahan program keluar
+        threading.Thread(target=_periksa, args=(port,), name=f"sniff-{port}", daemon=True).start()
+
+    with selesai:
+        while len(hasil) < len(ports):
+            sisa = batas + 1.0 - time.monotonic()
+            if sisa <= 0:
+                break
+            selesai.wait(sisa)
+        return {port: hasil.get(port) or {"port": port, "baud": None, "ovalue": 0, "frame": 0, "bytes": 0,
+                                          "cetak": 0.0, "error": "timeout"}
+                for port in ports}
+
+
+def temukan_port(ports=None, bauds=KANDIDAT_BAUD, durasi=DURASI_SNIFF, batas_waktu=BATAS_WAKTU,
+                 pakai_cache=True, cache_file=CACHE_FILE):
+    """
+    Mencari port mesin tekan dan baud rate-nya
+
+    Jika pakai_cache dan ada port terpasang yang hardware ID-nya sudah
+    dikenal, port tersebut cukup didengarkan sekali pada baud rate
+    tersimpan. Port yang lolos langsung dikembalikan; yang gagal dihapus
+    dari cache lalu ikut dideteksi ulang. Deteksi memeriksa semua port
+    bersamaan; port yang macet tidak menahan hasil port lain lebih lama
+    dari batas_waktu.
+
+    Args:
+        ports (list): Nama port yang diperiksa (default: semua port terpasang)
+        bauds (tuple): Baud rate kandidat
+        durasi (float): Lama mendengarkan per baud rate (detik)
+        batas_waktu (float): Batas waktu seluruh deteksi (detik)
+        pakai_cache (bool): Pakai hasil deteksi sebelumnya (default: True)
+        cache_file (str): File cache hardware ID
+
+    Returns:
+        list: Hasil per port urut peringkat, masing-masing dict dengan
+              'port', 'baud', 'ovalue', 'frame', 'bytes', 'cetak', 'error',
+              'hwid', 'deskripsi' dan 'dari_cache'
+    """
+    info_port = {p.device: p for p in serial.tools.list_ports.comports()}
+    if ports is None:
+        ports = list(info_port)
+    cache = baca_cache(cache_file)
+    batas = time.monotonic() + batas_waktu
+
+    def lengkapi(r, dari_cache):
+        info = info_port.get(r["port"])
+        r["hwid"] = kunci_port(info) if info is not None else r["port"]
+        r["deskripsi"] = info.description if info is not None else ""
+        r["dari_cache"] = dari_cache
+        return r
+
+    tersimpan = {}
+    for port in ports:
+        info = info_port.get(port)
+        entry = cache.get(kunci_port(info)) if info is not None else None
+        if entry and entry.get("baud"):
+            tersimpan[port] = entry["baud"]
+
+    if pakai_cache and tersimpan:
+        cek = _periksa_bersamaan(list(tersimpan), {p: (b,) for p, b in tersimpan.items()}, durasi, batas)
+        dikenal = []
+        for port, r in cek.items():
+            lengkapi(r, True)
+            if r["ovalue"]:
+                dikenal.append(r)
+            else:
+                # Mesin di port ini tidak lagi mengirim pada baud rate tersimpan
+                cache.pop(r["hwid"], None)
+                lupakan_port(r["hwid"], cache_file)
+                del tersimpan[port]
+        if dikenal:
+            dikenal.sort(key=_skor, reverse=True)
+            return dikenal
+
+    # Baud rate yang pernah berhasil dicoba lebih dulu
+    urutan = {}
+    for port in ports:
+        urutan[port] = list(bauds)
+        if tersimpan.get(port) in urutan[port]:
+            urutan[port].remove(tersimpan[port])
+            urutan[port].insert(0, tersimpan[port])
+
+    hasil = _periksa_bersamaan(ports, urutan, durasi, batas)
+    daftar = [lengkapi(hasil[port], False) for port in ports]
+    daftar.sort(key=_skor, reverse=True)
+
+    diperbarui = False
+    for r in daftar:
+        if r["ovalue"] and r["port"] in info_port:
+            cache[r["hwid"]] = {"baud": r["baud"], "port": r["port"],
+                                "terakhir": datetime.now().isoformat(timespec="seconds")}
+            diperbarui = True
+    if diperbarui:
+        tulis_cache(cache, cache_file)
+    return daftar
+
+
+def lupakan_port(hwid, cache_file=CACHE_FILE):
+    """
+    Menghapus satu port dari cache (misal karena baud rate mesin diganti)
+
+    Args:
+        hwid (str): Kunci port di cache
+        cache_file (str): File cache
+    """
+    cache = baca_cache(cache_file)
+    if cache.pop(hwid, None) is not None:
+        tulis_cache(cache, cache_file)
+
+
+def lupakan_device(port, cache_file=CACHE_FILE):
+    """
+    Menghapus port dari cache berdasarkan nama device-nya
+
+    Dipanggil jika logger gagal membuka port, supaya deteksi berikutnya
+    tidak lagi memakai entri cache port itu.
+
+    Args:
+        port (str): Nama port (misal: 'COM3' atau '/dev/ttyUSB0')
+        cache_file (str): File cache
+    """
+    for info in serial.tools.list_ports.comports():
+        if info.device == port:
+            lupakan_port(kunci_port(info), cache_file)
+            return
@@ -0,0 +1,425 @@
+"""
+Logger untuk satu port serial.
+
+Setiap PortLogger punya koneksi serial, parser, counter 'No' dan file
+Excel sendiri, sehingga beberapa mesin tekan bisa dicatat dari satu
+proses. Port dibaca oleh thread SerialReader (lihat serialReader.py);
+frame yang mengantre diproses oleh SessionLoop (lihat sessionLoop.py).
+"""
+import os
+import threading
+import time
+from datetime import datetime
+
+import serial
+
+from cellFormat import format_kn, waktu_sekarang
+from deadbandFilter import DeadbandFilter
+from frameParser import parse_ovalue
+from rawCapture import SUMBER_MANUAL, Decimator, RawCapture, capture_path
+from serialReader import SerialReader
+from sessionArchive import arsipkan
+from sessionStats import TAHAP_ANTRE, TAHAP_PARSE, SessionStats
+from specimenDetector import HEADER_SPECIMENS, SHEET_SPECIMENS, SpecimenDetector
+from storageBackend import STORAGE_EXCEL, buat_writer
+
+HEADER_SERIAL = ["No", "Timestamp", "Nilai KN", "Sumber", "Raw Data/Keterangan"]
+
+
+def nama_file_port(port, excel_file="pressure_data.xlsx"):
+    """
+    Nama file Excel per port, misal 'pressure_data_COM3.xlsx'
+
+    Args:
+        port (str): Nama port (misal: 'COM3' atau '/dev/ttyUSB0')
+        excel_file (str): Nama file dasar
+
+    Returns:
+        str: Nama file Excel untuk port tersebut
+    """
+    nama = os.path.basename(port.rstrip("/\\")) or port
+    nama = "".join(c if c.isalnum() or c in "-_" else "_" for c in nama)
+    root, ext = os.path.splitext(excel_file)
+    return f"{root}_{nama}{ext or '.xlsx'}"
+
+
+class PortLogger:
+    """
+    Membaca satu port serial dan menyimpan nilai 'ovalue' ke Excel
+
+    Args:
+        port (str): Nama port (misal: 'COM3' atau '/dev/ttyUSB0')
+        baud (int): Baud rate
+        data (int): Data bits
+        excel_file (str): Nama file Excel untuk port ini
+        flush_policy (FlushPolicy): Kapan buffer disimpan ke file
+        label (str): Awalan untuk pesan di console (misal: '[COM3] ')
+        storage (str): Mode penyimpanan, lihat storageBackend.buat_writer
+        shard_policy (ShardPolicy): Kebijakan rollover untuk mode 'stream'
+        segment_policy (SegmentPolicy): Aktifkan deteksi specimen dengan ambang ini
+                                        (default: None = tidak aktif)
+        simpan_raw (bool): Simpan setiap nilai serial; False = hanya ringkasan
+                           specimen (default: True)
+        capture_policy (CapturePolicy): Rekam semua nilai ke file biner '<nama>.raw'
+                                        dan hanya kirim nilai terpilih ke Excel
+                                        (default: None = tidak aktif)
+        feed (LiveFeed): Kirim setiap nilai dan specimen ke feed langsung
+                         (default: None)
+        filter_policy (FilterPolicy): Hanya simpan nilai serial yang berubah melewati
+                                      deadband (default: None = simpan semua)
+        arsip (bool): Tambahkan baris sesi ini ke arsip kolom terkompresi
+                      '<nama>.arsip' saat ditutup (default: False)
+    """
+
+    def __init__(self, port, baud, data, excel_file, flush_policy=None, label="",
+                 storage=STORAGE_EXCEL, shard_policy=None, segment_policy=None, simpan_raw=True,
+                 capture_policy=None, feed=None, filter_policy=None, arsip=False):
+        self.port = port
+        self.baud = baud
+        self.data = data
+        self.excel_file = excel_file
+        self.label = label
+        self.feed = feed
+        self.simpan_raw = simpan_raw or segment_policy is None
+
+        self.detector = SpecimenDetector(segment_policy) if segment_policy is not None else None
+        extra = {SHEET_SPECIMENS: HEADER_SPECIMENS} if self.detector else None
+        self.stats = SessionStats()
+        self.writer = buat_writer(excel_file, HEADER_SERIAL, "Pressure Data",
+                                  flush_policy, storage, shard_policy, extra, self.stats)
+        self.specimen_no = 1
+        self.capture = None
+        self.decimator = None
+        if capture_policy is not None:
+            self.capture = RawCapture(capture_path(excel_file), capture_policy.kapasitas)
+            self.decimator = Decimator(capture_policy.interval_excel)
+        self.filter = DeadbandFilter(filter_policy) if filter_policy is not None else None
+        self.storage = storage
+        self.arsip = arsip
+        self.sesi_arsip = None
+        # 'No' pertama sesi ini per sheet, diisi saat file dibuka
+        self._no_awal = None
+        self._no_awal_sheet = {}
+        self.ser = None
+        self.reader = None
+        self.counter = 1
+        self.error = None
+        self.aktif = False
+
+        self._lock = threading.Lock()
+        # Selisih time.time() - time.monotonic() untuk waktu kedatangan frame
+        self._offset_wall = time.time() - time.monotonic()
+        self._overflow = 0
+
+    def buka(self):
+        """
+        Membuka port serial dan file Excel
+
+        Returns:
+            int: Nomor 'No' berikutnya
+        """
+        # Timeout agar thread pembaca bisa dihentikan
+        self.ser = serial.Serial(self.port, self.baud, self.data, timeout=0.5)
+        if not self.ser.is_open:
+            raise serial.SerialException(f"Gagal membuka port {self.port}")
+
+        try:
+            self.counter = self.writer.open()
+            if self.detector is not None:
+                self.specimen_no = self.writer.next_no_sheet(SHEET_SPECIMENS)
+                self._no_awal_sheet = {SHEET_SPECIMENS: self.specimen_no}
+            self._no_awal = self.counter
+            if self.capture is not None:
+                try:
+                    self.capture.open()
+                except Exception:
+                    self.writer.close()
+                    raise
+        except Exception:
+            self.ser.close()
+            raise
+        self.aktif = True
+        return self.counter
+
+    def mulai_baca(self, bangunkan):
+        """
+        Menjalankan thread pembaca port
+
+        Args:
+            bangunkan (callable): Dipanggil dari thread pembaca saat ada frame
+                                  baru di antrean atau port terputus
+        """
+        self.reader = SerialReader(self.ser, self.stats, bangunkan, nama=f"serial-{self.port}")
+        self.reader.mulai()
+
+    def proses_antrean(self):
+        """
+        Memproses semua frame yang sudah dibaca thread pembaca
+
+        Dipanggil oleh loop sesi setelah dibangunkan, jadi tidak pernah menunggu.
+        """
+        frames = self.reader.ambil() # type: ignore
+        for waktu, frame in frames:
+            try:
+                self.proses_frame(frame, waktu)
+            except Exception as e:
+                print(f"{self.label}⚠ Error parsing data: {e}")
+        if frames:
+            self.stats.catat(TAHAP_ANTRE, int((time.monotonic() - frames[0][0]) * 1e9))
+
+        overflow = self.stats.counter["frame_overflow"]
+        if overflow != self._overflow:
+            print(f"{self.label}⚠ Antrean serial penuh: {overflow - self._overflow} frame hilang")
+            self._overflow = overflow
+
+        if self.reader.error is not None and self.aktif: # type: ignore
+            self.putus(self.reader.error) # type: ignore
+
+    def putus(self, error):
+        """
+        Menandai koneksi port terputus
+
+        Args:
+            error (Exception): Penyebab
+        """
+        self.error = error
+        self.aktif = False
+        print(f"{self.label}⚠ Koneksi serial terputus: {error}")
+
+    def proses_frame(self, frame, waktu=None):
+        """
+        Memproses satu frame dari serial
+
+        Args:
+            frame (bytes | memoryview): Isi frame tanpa '\r\n'
+            waktu (float): Waktu kedatangan dari time.monotonic() (default: sekarang)
+        """
+        t0 = time.perf_counter_ns()
+        if waktu is None:
+            waktu = time.monotonic()
+        nilai = parse_ovalue(frame)
+        if nilai and self.capture is not None:
+            # Mode rekaman mentah: tanpa print per nilai (feed dikirim dari rekam())
+            self.stats.tambah("frame_ovalue")
+            raw = bytes(frame)
+            self.stats.catat(TAHAP_PARSE, time.perf_counter_ns() - t0)
+            self.rekam(nilai, raw, waktu)
+            return
+
+        data_str = bytes(frame).decode("utf-8", errors="ignore").strip()
+        self.stats.catat(TAHAP_PARSE, time.perf_counter_ns() - t0)
+        self.stats.tambah("frame_ovalue" if nilai else "frame_ditolak" if nilai is not None else "frame_lain")
+        if not data_str:
+            return
+
+        tiba = datetime.fromtimestamp(waktu + self._offset_wall)
+        print(f"{self.label}[{tiba.strftime('%H:%M:%S')}] Raw: {data_str}")
+
+        if nilai is None:
+            return
+
+        if not nilai:
+            print(f"{self.label}⚠ Format data tidak lengkap, menunggu data berikutnya...")
+            return
+
+        # Nilai disimpan sebagai angka, koma desimal hanya untuk tampilan
+        kn = float(nilai.replace(b',', b'.'))
+        nilaiKN_format = nilai.replace(b'.', b',').decode("ascii")
+        # Waktu kedatangan, bukan waktu diproses
+        timestamp = tiba.replace(microsecond=0)
+
+        no = None
+        if self.simpan_raw:
+            data = (kn, nilaiKN_format, data_str, timestamp)
+            for baris in self._saring(waktu, kn, data):
+                no_baris = self._simpan_serial(*baris)
+                if baris is data:
+                    no = no_baris
+
+        if self.feed is not None:
+            self.feed.kirim("reading", {"port": self.port, "kn": kn, "waktu": waktu + self._offset_wall,
+                                        "sumber": "SERIAL", "no": no})
+
+        if self.detector is not None:
+            specimen = self.detector.proses(kn, timestamp)
+            if specimen is not None:
+                self.simpan_specimen(specimen)
+
+    def rekam(self, nilai, raw, waktu):
+        """
+        Merekam satu nilai ke file mentah dan meneruskan nilai terpilih ke Excel
+
+        Args:
+            nilai (bytes): Teks angka dari parse_ovalue
+            raw (bytes): Isi frame
+            waktu (float): Waktu kedatangan dari time.monotonic()
+        """
+        kn = float(nilai.replace(b',', b'.'))
+        t = self.capture.tambah(kn, t=self.capture.waktu_dari(waktu)) # type: ignore
+        if self.feed is not None:
+            self.feed.kirim("reading", {"port": self.port, "kn": kn, "waktu": waktu + self._offset_wall,
+                                        "sumber": "SERIAL", "no": None})
+
+        if self.detector is not None:
+            specimen = self.detector.proses(kn, t)
+            if specimen is not None:
+                self.simpan_specimen(specimen)
+
+        if self.simpan_raw:
+            keluar = self.decimator.proses(t, kn, (t, nilai, raw)) # type: ignore
+            if keluar is not None:
+                self._teruskan(keluar)
+
+    def _saring(self, t, kn, data):
+        """Data yang perlu disimpan menurut filter deadband (semua jika tidak aktif)"""
+        if self.filter is None:
+            return [data]
+        return self.filter.proses(t, kn, data)
+
+    def _simpan_serial(self, kn, nilaiKN_format, data_str, timestamp):
+        """Menyimpan satu nilai serial ke Excel"""
+        no = self.simpan(kn, "SERIAL", data_str, timestamp)
+        # Satu print agar tidak terselip output thread port lain
+        print(f"{self.label}✓ Data #{no} tersimpan: {nilaiKN_format} KN (SERIAL)\n" + "-" * 60)
+        return no
+
+    def _teruskan(self, keluar):
+        """Meneruskan keluaran Decimator lewat filter deadband ke Excel"""
+        (t, nilai, _), _ = keluar
+        for k in self._saring(t, float(nilai.replace(b',', b'.')), keluar):
+            self._simpan_terpilih(k)
+
+    def _simpan_terpilih(self, keluar):
+        """Menyimpan nilai terpilih dari Decimator ke Excel"""
+        (t, nilai, raw), sampel = keluar
+        nilaiKN_format = nilai.replace(b'.', b',').decode("ascii")
+        data_str = raw.decode("utf-8", errors="ignore").strip()
+        if sampel > 1:
+            data_str += f" (maks dari {sampel} sampel)"
+        no = self.simpan(float(nilai.replace(b',', b'.')), "SERIAL", data_str, self._format_waktu(t))
+        print(f"{self.label}✓ Data #{no} tersimpan: {nilaiKN_format} KN (SERIAL, {sampel} sampel)")
+
+    def _format_waktu(self, waktu):
+        """Timestamp Excel dari waktu rekaman mentah (detik sejak epoch file)"""
+        if isinstance(waktu, float):
+            waktu = datetime.fromtimestamp(self.capture.epoch + waktu).replace(microsecond=0) # type: ignore
+        return waktu
+
+    def tambah_manual(self, nilaiKN, keterangan="Input cepat"):
+        """
+        Menyimpan nilai kN yang dimasukkan manual untuk mesin ini
+
+        Args:
+            nilaiKN (float): Nilai kN
+            keterangan (str): Keterangan baris
+
+        Returns:
+            int: Nomor 'No' baris yang disimpan
+        """
+        nilaiKN = float(nilaiKN)
+        nilaiKN_format = format_kn(nilaiKN)
+        if self.capture is not None:
+            self.capture.tambah(nilaiKN, SUMBER_MANUAL)
+        no = self.simpan(nilaiKN, "MANUAL", keterangan)
+        print(f"{self.label}✓ Data #{no} tersimpan: {nilaiKN_format} kN (MANUAL)")
+        if self.feed is not None:
+            self.feed.kirim("reading", {"port": self.port, "kn": nilaiKN, "waktu": time.time(),
+                                        "sumber": "MANUAL", "no": no})
+        return no
+
+    def simpan(self, nilaiKN, sumber, keterangan, timestamp=None):
+        """
+        Memberi nomor lalu memasukkan baris ke buffer writer
+
+        Args:
+            nilaiKN (float): Nilai kN
+            sumber (str): 'SERIAL' atau 'MANUAL'
+            keterangan (str): Raw data atau keterangan
+            timestamp (datetime): Waktu baris (default: sekarang)
+
+        Returns:
+            int: Nomor 'No' baris
+        """
+        if timestamp is None:
+            timestamp = waktu_sekarang()
+        with self._lock:
+            no = self.counter
+            self.writer.append([no, timestamp, nilaiKN, sumber, keterangan])
+            self.counter += 1
+        return no
+
+    def simpan_specimen(self, specimen):
+        """
+        Menulis ringkasan satu specimen ke sheet 'Specimens'
+
+        Args:
+            specimen (dict): Hasil SpecimenDetector
+        """
+        puncak = round(specimen["puncak"], 3)
+        puncak_format = format_kn(puncak)
+        with self._lock:
+            no = self.specimen_no
+            self.writer.append([no, self._format_waktu(specimen["mulai"]),
+                                self._format_waktu(specimen["selesai"]), puncak,
+                                self._format_waktu(specimen["waktu_puncak"]), specimen["sampel"],
+                                specimen["akhir"]],
+                               SHEET_SPECIMENS)
+            self.specimen_no += 1
+        print(f"{self.label}★ Specimen #{no}: puncak {puncak_format} kN "
+              f"({specimen['sampel']} sampel, {specimen['akhir']})\n" + "-" * 60)
+        if self.feed is not None:
+            self.feed.kirim("specimen", {"port": self.port, "no": no, "puncak": specimen["puncak"],
+                                         "mulai": self._format_waktu(specimen["mulai"]),
+                                         "selesai": self._format_waktu(specimen["selesai"]),
+                                         "sampel": specimen["sampel"], "akhir": specimen["akhir"]})
+
+    def ringkasan_stats(self):
+        """
+        Statistik port ini dengan penghitung writer dan buffer terbaru
+
+        Returns:
+            SessionStats: Statistik port
+        """
+        counter = self.stats.counter
+        counter["baris_disimpan"] = self.writer.rows_saved
+        counter["baris_pending"] = self.writer.pending
+        if self.filter is not None:
+            counter["baris_difilter"] = self.filter.dibuang
+        return self.stats
+
+    def tutup(self):
+        """Menutup port dan menyimpan sisa buffer"""
+        self.aktif = False
+        if self.reader is not None:
+            self.reader.hentikan()
+            # Frame yang sudah dibaca tetap disimpan
+            self.proses_antrean()
+        if self.ser is not None:
+            self.ser.close()
+        if self.detector is not None:
+            specimen = self.detector.akhiri()
+            if specimen is not None:
+                self.simpan_specimen(specimen)
+        if self.decimator is not None and self.simpan_raw:
+            keluar = self.decimator.akhiri()
+            if keluar is not None:
+                self._teruskan(keluar)
+        if self.filter is not None:
+            # Nilai terakhir yang masih ditahan filter
+            for data in self.filter.akhiri():
+                if self.capture is not None:
+                    self._simpan_terpilih(data)
+                else:
+                    self._simpan_serial(*data)
+        self.writer.close()
+        if self.capture is not None:
+            self.capture.close()
+        if self.arsip and self._no_awal is not None:
+            self._arsipkan()
+
+    def _arsipkan(self):
+        """Menambahkan baris sesi ini ke arsip setelah writer ditutup"""
+        try:
+            self.sesi_arsip = arsipkan(self.excel_file, self.storage, self._no_awal, self._no_awal_sheet)
+        except Exception as e:
+            print(f"{self.label}⚠ Gagal mengarsip sesi: {e}")
@@ -0,0 +1,325 @@
+"""
+Mode daemon tanpa menu untuk logging mesin tekan di bawah process supervisor
+(systemd, NSSM, supervisord, dll).
+
+Semua pengaturan diambil dari argumen atau file konfigurasi JSON, tidak
+ada prompt. Modul berat (pyserial, openpyxl, NumPy) baru diimpor setelah
+argumen dibaca, dan openpyxl tidak diimpor sama sekali saat melanjutkan
+file yang index-nya valid, sehingga logging dimulai dalam hitungan
+milidetik. Jika adapter USB terlepas, port dicari dan dibuka ulang
+otomatis sampai daemon dihentikan (Ctrl+C atau SIGTERM).
+
+Contoh:
+    python pressureDaemon.py --port /dev/ttyUSB0 --baud 9600 --file mesin1.xlsx
+    python pressureDaemon.py --port auto --storage stream --stats-file stats.jsonl
+    python pressureDaemon.py --port auto --storage sqlite --file mesin1.db
+    python pressureDaemon.py --port auto --file mesin1.xlsx --arsip
+    python pressureDaemon.py --config mesin1.json
+
+Isi file konfigurasi memakai nama yang sama dengan argumen (dengan '_'),
+argumen di command line menimpa isi file:
+    {"port": "auto", "hwid": "VID:PID=0403:6001", "baud": 9600,
+     "file": "mesin1.xlsx", "flush_rows": 50, "flush_interval": 5.0,
+     "storage": "excel", "stats_file": "mesin1_stats.jsonl",
+     "deadband": 0.05, "max_gap": 30, "arsip": true}
+"""
+import argparse
+import json
+import signal
+import sys
+import threading
+
+# Nilai default untuk argumen yang tidak diisi di command line maupun config
+DEFAULT = {
+    "port": "auto",
+    "hwid": None,
+    "baud": 9600,
+    "data": 8,
+    "file": "pressure_data.xlsx",
+    "flush_rows": 50,
+    "flush_interval": 5.0,
+    "storage": "excel",
+    "shard_rows": 100000,
+    "specimen": None,
+    "hanya_ringkasan": False,
+    "capture_interval": None,
+    "stats_file": None,
+    "feed_port": None,
+    "deadband": None,
+    "deadband_rel": None,
+    "min_interval": None,
+    "max_gap": None,
+    "arsip": False,
+    "jeda_reconnect": 2.0,
+}
+
+
+def baca_config(path):
+    """
+    Membaca file konfigurasi JSON
+
+    Args:
+        path (str): Nama file
+
+    Returns:
+        dict: Pengaturan dengan kunci seperti DEFAULT
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"'{path}' harus berisi objek JSON")
+    tidak_dikenal = set(config) - set(DEFAULT)
+    if tidak_dikenal:
+        raise ValueError(f"Kunci tidak dikenal di '{path}': {', '.join(sorted(tidak_dikenal))}")
+    return config
+
+
+def gabung_pengaturan(args):
+    """
+    Menggabungkan DEFAULT, file config dan argumen (argumen paling kuat)
+
+    Args:
+        args (argparse.Namespace): Hasil parse argumen
+
+    Returns:
+        dict: Pengaturan lengkap
+    """
+    pengaturan = dict(DEFAULT)
+    if args.config:
+        pengaturan.update(baca_config(args.config))
+    for kunci in DEFAULT:
+        nilai = getattr(args, kunci, None)
+        if nilai is not None and nilai is not False:
+            pengaturan[kunci] = nilai
+    return pengaturan
+
+
+def cari_port(pengaturan):
+    """
+    Menentukan port dan baud rate yang dipakai
+
+    Port bisa ditulis langsung, dicari dari hardware ID (tetap cocok
+    walaupun nama port berubah setelah USB dicabut-pasang), atau 'auto'
+    lewat deteksi otomatis yang memakai cache hardware ID.
+
+    Args:
+        pengaturan (dict): Pengaturan daemon
+
+    Returns:
+        tuple: (port, baud), port None jika belum ditemukan
+    """
+    import serial.tools.list_ports
+
+    port = pengaturan["port"]
+    baud = pengaturan["baud"]
+    if pengaturan["hwid"]:
+        for info in serial.tools.list_ports.comports():
+            if pengaturan["hwid"].lower() in (info.hwid or "").lower():
+                return info.device, baud
+        return None, baud
+    if port != "auto":
+        return port, baud
+
+    from portDiscovery import temukan_port
+    for r in temukan_port():
+        if r["dari_cache"] or r["ovalue"]:
+            return r["port"], r["baud"]
+    return None, baud
+
+
+def buat_logger(port, baud, pengaturan, feed=None):
+    """
+    Membuat PortLogger dari pengaturan daemon
+
+    Args:
+        port (str): Nama port
+        baud (int): Baud rate
+        pengaturan (dict): Pengaturan daemon
+        feed (LiveFeed): Live feed yang sudah dibuka (default: None)
+
+    Returns:
+        PortLogger: Logger yang belum dibuka
+    """
+    from deadbandFilter import MAX_GAP, FilterPolicy
+    from excelWriter import FlushPolicy
+    from portLogger import PortLogger
+    from rawCapture import CapturePolicy
+    from shardedWriter import ShardPolicy
+    from specimenDetector import SegmentPolicy
+
+    flush_policy = FlushPolicy(pengaturan["flush_rows"], pengaturan["flush_interval"])
+    shard_policy = ShardPolicy(max_rows=pengaturan["shard_rows"])
+    segment_policy = None
+    if pengaturan["specimen"] is not None:
+        segment_policy = SegmentPolicy(ambang_mulai=pengaturan["specimen"])
+    capture_policy = None
+    if pengaturan["capture_interval"] is not None:
+        capture_policy = CapturePolicy(interval_excel=pengaturan["capture_interval"])
+    filter_policy = None
+    if any(pengaturan[k] is not None for k in ("deadband", "deadband_rel", "min_interval", "max_gap")):
+        max_gap = MAX_GAP if pengaturan["max_gap"] is None else pengaturan["max_gap"]
+        filter_policy = FilterPolicy(pengaturan["deadband"] or 0.0, pengaturan["deadband_rel"] or 0.0,
+                                     pengaturan["min_interval"] or 0.0, max_gap or None)
+
+    return PortLogger(port, baud, pengaturan["data"], pengaturan["file"], flush_policy,
+                      storage=pengaturan["storage"], shard_policy=shard_policy,
+                      segment_policy=segment_policy, simpan_raw=not pengaturan["hanya_ringkasan"],
+                      capture_policy=capture_policy, feed=feed, filter_policy=filter_policy,
+                      arsip=pengaturan["arsip"])
+
+
+class Daemon:
+    """
+    Menjalankan sesi logging berulang sampai dihentikan
+
+    Args:
+        pengaturan (dict): Pengaturan hasil gabung_pengaturan()
+    """
+
+    def __init__(self, pengaturan):
+        self.pengaturan = pengaturan
+        self.loop = None
+        self._berhenti = threading.Event()
+        self._pesan_terakhir = None
+
+    def hentikan(self, *_):
+        """Menghentikan daemon (dipanggil dari handler sinyal)"""
+        self._berhenti.set()
+        if self.loop is not None:
+            self.loop.hentikan()
+
+    def _lapor(self, pesan):
+        """Mencetak pesan status, pesan yang sama berturut-turut hanya sekali"""
+        if pesan != self._pesan_terakhir:
+            print(pesan, flush=True)
+            self._pesan_terakhir = pesan
+
+    def jalankan(self):
+        """
+        Loop utama: cari port, logging sampai port terputus, ulangi
+
+        Returns:
+            int: Kode keluar proses
+        """
+        from sessionLoop import SessionLoop
+
+        # Feed tetap terbuka selama daemon jalan, dashboard tidak putus saat reconnect
+        feed = None
+        if self.pengaturan["feed_port"] is not None:
+            from liveFeed import LiveFeed
+            feed = LiveFeed(port=self.pengaturan["feed_port"])
+            try:
+                feed.mulai()
+                print(f"Live feed: {feed.url}", flush=True)
+            except OSError as e:
+                print(f"⚠ Live feed tidak bisa dibuka: {e}", flush=True)
+                feed = None
+
+        try:
+            return self._jalankan(SessionLoop, feed)
+        finally:
+            if feed is not None:
+                feed.tutup()
+
+    def _jalankan(self, SessionLoop, feed):
+        """Loop reconnect"""
+        jeda = self.pengaturan["jeda_reconnect"]
+        while not self._berhenti.is_set():
+            try:
+                port, baud = cari_port(self.pengaturan)
+            except Exception as e:
+                self._lapor(f"⚠ Gagal mencari port: {e}")
+                port, baud = None, None
+            if port is None:
+                self._lapor(f"Port belum ditemukan, dicoba lagi setiap {jeda:g} detik")
+                self._berhenti.wait(jeda)
+                continue
+
+            logger = buat_logger(port, baud, self.pengaturan, feed)
+            try:
+                logger.buka()
+            except Exception as e:
+                self._lapor(f"⚠ Gagal membuka {port}: {e}")
+                if self.pengaturan["port"] == "auto" and not self.pengaturan["hwid"]:
+                    from portDiscovery import lupakan_device
+                    from serial import SerialException
+                    if isinstance(e, SerialException):
+                        # Port hasil deteksi otomatis dideteksi ulang pada percobaan berikutnya
+                        lupakan_device(port)
+                self._berhenti.wait(jeda)
+                continue
+
+            self._lapor(f"Logging {port} ({baud} baud) ke '{logger.writer.excel_file}', "
+                        f"lanjut dari No {logger.counter}")
+            try:
+                self.loop = SessionLoop([logger], stdin=None, stats_file=self.pengaturan["stats_file"])
+                if self._berhenti.is_set():
+                    break
+                self.loop.jalankan()
+            finally:
+                self.loop = None
+                logger.tutup()
+                self._lapor(f"✓ {port} ditutup, total data tersimpan: {logger.counter - 1}")
+                if logger.sesi_arsip is not None:
+                    from sessionArchive import arsip_path
+                    self._lapor(f"✓ Sesi diarsip: {logger.sesi_arsip['baris']} baris ke "
+                                f"'{arsip_path(logger.excel_file)}'")
+
+            if not self._berhenti.is_set():
+                print(f"Menyambung ulang dalam {jeda:g} detik...", flush=True)
+                self._berhenti.wait(jeda)
+        return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Logging mesin tekan tanpa menu (mode daemon)")
+    parser.add_argument("--config", help="File konfigurasi JSON")
+    parser.add_argument("--port", help="Nama port, atau 'auto' untuk deteksi otomatis (default: auto)")
+    parser.add_argument("--hwid", help="Cari port dari potongan hardware ID, misal 'VID:PID=0403:6001'")
+    parser.add_argument("--baud", type=int, help="Baud rate (default: 9600)")
+    parser.add_argument("--data", type=int, help="Data bits (default: 8)")
+    parser.add_argument("--file", help="File Excel (default: pressure_data.xlsx)")
+    parser.add_argument("--flush-rows", type=int, help="Simpan setelah N baris (default: 50)")
+    parser.add_argument("--flush-interval", type=float, help="Simpan paling lambat setiap N detik (default: 5)")
+    parser.add_argument("--storage", choices=["excel", "stream", "sqlite"],
+                        help="Mode penyimpanan (default: excel)")
+    parser.add_argument("--shard-rows", type=int, help="Baris per shard untuk --storage stream")
+    parser.add_argument("--specimen", type=float, metavar="AMBANG_KN",
+                        help="Aktifkan deteksi specimen dengan ambang mulai ini")
+    parser.add_argument("--hanya-ringkasan", action="store_true",
+                        help="Dengan --specimen: simpan ringkasan specimen saja")
+    parser.add_argument("--capture-interval", type=float, metavar="DETIK",
+                        help="Rekam semua nilai ke file .raw, Excel 1 baris per interval")
+    parser.add_argument("--stats-file", help="File JSON lines untuk statistik berkala")
+    parser.add_argument("--feed-port", type=int, help="Buka live feed SSE di http://127.0.0.1:<port>/")
+    parser.add_argument("--deadband", type=float, metavar="KN",
+                        help="Simpan nilai hanya jika berubah lebih dari N kN")
+    parser.add_argument("--deadband-rel", type=float, metavar="RASIO",
+                        help="Deadband relatif terhadap nilai terakhir, misal 0.01 = 1%%")
+    parser.add_argument("--min-interval", type=float, metavar="DETIK", help="Jarak minimum antar baris")
+    parser.add_argument("--max-gap", type=float, metavar="DETIK",
+                        help="Dengan filter: simpan minimal satu baris setiap N detik, 0 = tanpa (default: 60)")
+    parser.add_argument("--arsip", action="store_true",
+                        help="Tambahkan setiap sesi ke arsip kolom terkompresi '<nama>.arsip' saat ditutup")
+    parser.add_argument("--jeda-reconnect", type=float, help="Jeda sebelum menyambung ulang (default: 2)")
+    args = parser.parse_args(argv)
+
+    try:
+        pengaturan = gabung_pengaturan(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    # Log supervisor langsung terisi walaupun stdout bukan terminal
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=True) # type: ignore
+
+    daemon = Daemon(pengaturan)
+    signal.signal(signal.SIGINT, daemon.hentikan)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, daemon.hentikan)
+    return daemon.jalankan()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,41 @@
 # Test script untuk memverifikasi PySerial installation
+#
+# Dengan --preflight, script juga mengukur hal yang membatasi logger di
+# komputer ini: waktu append dan save openpyxl pada beberapa ukuran file,
+# latency write+fsync di folder output, dan throughput serial loopback
+# (loop:// dan pty). Dari hasil itu dihitung FlushPolicy yang disarankan
+# dan laju sampel maksimum yang masih bisa diikuti.
+#
+#   python pyseriesCheck.py
+#   python pyseriesCheck.py --preflight --dir D:\data --baud 9600
+#   python pyseriesCheck.py --preflight --cepat
+import argparse
+import math
+import os
+import threading
+import time
+from datetime import datetime
+
+# Ukuran file (jumlah baris data) yang diukur waktu save-nya
+UKURAN_EXCEL = (1000, 10000, 50000)
+UKURAN_EXCEL_CEPAT = (1000, 5000)
+# Jumlah baris yang di-append lewat jalur writer pada setiap ukuran
+SAMPEL_APPEND = 200
+
+# Jumlah record journal untuk mengukur fsync, dan jumlah frame loopback
+JUMLAH_FSYNC = 200
+JUMLAH_FSYNC_CEPAT = 50
+FRAME_LOOPBACK = 20000
+FRAME_LOOPBACK_CEPAT = 5000
+
+# Bagian waktu thread penulis yang boleh habis untuk save
+BEBAN_SAVE = 0.5
+# Save lebih lama dari ini: sarankan mode 'stream' atau 'sqlite'
+SAVE_MAKS = 10.0
+
+# Sama dengan HEADER_SERIAL di portLogger.py
+HEADER_PREFLIGHT = ["No", "Timestamp", "Nilai KN", "Sumber", "Raw Data/Keterangan"]
+FRAME_CONTOH = b"ovalue 12,50 kN\r\n"
 
 def test_pyserial_installation():
     """
@@ -102,7 +139,325 @@ def installation_guide():
     print("   atau")
     print("   python3 -m pip install pyserial")
 
+def ukur_excel(folder, ukuran=UKURAN_EXCEL, sampel=SAMPEL_APPEND):
+    """
+    Mengukur waktu append per baris dan waktu save openpyxl
+
+    Workbook diisi cepat sampai setiap ukuran, lalu 'sampel' baris terakhir
+    di-append persis seperti BufferedExcelWriter dan diukur waktunya. Biaya
+    append per baris hampir tetap; yang naik dengan ukuran sheet adalah
+    waktu save, yang diukur dengan simpan_atomik() di folder output.
+
+    Returns:
+        list: {'baris', 'append_us', 'save_s', 'ukuran_kb'} per ukuran
+    """
+    from openpyxl import Workbook
+
+    from cellFormat import atur_format, baris_bertipe, format_kolom
+    from excelWriter import simpan_atomik
+
+    path = os.path.join(folder, f"preflight_{os.getpid()}.xlsx")
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Pressure Data"
+    ws.append(HEADER_PREFLIGHT)
+    formats = format_kolom(HEADER_PREFLIGHT)
+    waktu = datetime.now().replace(microsecond=0)
+
+    def baris(no):
+        return baris_bertipe([no, waktu, 12.5, "SERIAL", "ovalue 12,50 kN"], formats)
+
+    hasil = []
+    no = 0
+    try:
+        for target in sorted(ukuran):
+            while no < target - sampel:
+                no += 1
+                ws.append(baris(no))
+                atur_format(ws, formats, no + 1)
+            diukur = target - no
+            t0 = time.perf_counter_ns()
+            while no < target:
+                no += 1
+                ws.append(baris(no))
+                atur_format(ws, formats, no + 1)
+            t1 = time.perf_counter_ns()
+            simpan_atomik(wb, path)
+            t2 = time.perf_counter_ns()
+            hasil.append({
+                "baris": target,
+                "append_us": round((t1 - t0) / max(diukur, 1) / 1e3, 1),
+                "save_s": round((t2 - t1) / 1e9, 3),
+                "ukuran_kb": os.path.getsize(path) // 1024,
+            })
+    finally:
+        for f in (path, path + ".tmp"):
+            if os.path.exists(f):
+                os.remove(f)
+    return hasil
+
+
+def ukur_disk(folder, jumlah=JUMLAH_FSYNC, mb=8):
+    """
+    Mengukur latency write+fsync satu record journal dan throughput tulis
+
+    Record ditulis lewat Journal yang sama dengan writer, jadi isi dan
+    ukurannya sama dengan record sesi sungguhan.
+
+    Returns:
+        dict: {'fsync': ringkasan Histogram (us), 'mb_per_detik'}
+    """
+    from cellFormat import waktu_sekarang
+    from excelJournal import Journal
+    from sessionStats import Histogram
+
+    path = os.path.join(folder, f"preflight_{os.getpid()}.journal")
+    hist = Histogram()
+    try:
+        journal = Journal(path)
+        journal.open()
+        try:
+            for no in range(1, jumlah + 1):
+                row = [no, waktu_sekarang(), 12.5, "SERIAL", "ovalue 12,50 kN"]
+                t0 = time.perf_counter_ns()
+                journal.append(row)
+                hist.catat(time.perf_counter_ns() - t0)
+        finally:
+            journal.close(hapus_jika_kosong=False)
+
+        blok = os.urandom(1 << 20)
+        t0 = time.perf_counter()
+        with open(path, "wb") as f:
+            for _ in range(mb):
+                f.write(blok)
+            f.flush()
+            os.fsync(f.fileno())
+        detik = time.perf_counter() - t0
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+    return {"fsync": hist.ringkasan(), "mb_per_detik": round(mb / detik, 1) if detik > 0 else None}
+
+
+def _buka_loopback(jalur, baud):
+    """
+    Membuka port loopback
+
+    Returns:
+        tuple: (serial.Serial untuk dibaca, fungsi tulis(bytes), fungsi tutup())
+    """
+    import serial
+
+    if jalur == "loop://":
+        ser = serial.serial_for_url("loop://", baudrate=baud, timeout=0.1)
+        return ser, ser.write, ser.close
+
+    import pty
+    import tty
+
+    master, slave = pty.openpty()
+    tty.setraw(slave)
+    ser = serial.Serial(os.ttyname(slave), baud, timeout=0.1)
+
+    def tutup():
+        ser.close()
+        os.close(master)
+        os.close(slave)
+
+    return ser, lambda data: os.write(master, data), tutup
+
+
+def ukur_serial(jalur, baud, frames, jumlah=FRAME_LOOPBACK, batas_waktu=30.0):
+    """
+    Mengukur throughput SerialReader + parse_ovalue lewat port loopback
+
+    Loopback tidak dibatasi baud rate, jadi hasilnya adalah batas atas
+    jalur baca dan parsing di komputer ini.
+
+    Args:
+        jalur (str): 'loop://' atau 'pty'
+        baud (int): Baud rate port
+        frames (list): Frame contoh (bytes, diakhiri '\\n') yang diulang
+        jumlah (int): Jumlah frame yang dikirim
+
+    Returns:
+        dict: {'jalur', 'frame', 'detik', 'frame_per_detik'}
+    """
+    from frameParser import parse_ovalue
+    from serialReader import SerialReader
+    from sessionStats import SessionStats
+
+    data = b"".join(frames[i % len(frames)] for i in range(jumlah))
+    ser, tulis, tutup = _buka_loopback(jalur, baud)
+    ada_data = threading.Event()
+    reader = SerialReader(ser, SessionStats(), ada_data.set, nama="preflight-reader")
+
+    def kirim():
+        for i in range(0, len(data), 4096):
+            tulis(data[i:i + 4096])
+
+    pengirim = threading.Thread(target=kirim, daemon=True)
+    diterima = 0
+    try:
+        reader.mulai()
+        t0 = time.perf_counter()
+        pengirim.start()
+        batas = time.monotonic() + batas_waktu
+        while diterima < jumlah and time.monotonic() < batas:
+            ada_data.wait(0.1)
+            ada_data.clear()
+            for _, frame in reader.ambil():
+                parse_ovalue(frame)
+                diterima += 1
+        detik = time.perf_counter() - t0
+    finally:
+        reader.hentikan()
+        tutup()
+    return {"jalur": jalur, "frame": diterima, "detik": round(detik, 3),
+            "frame_per_detik": round(diterima / detik) if detik > 0 else 0}
+
+
+def _perkiraan(hasil_excel, kunci, baris):
+    """Perkiraan 'append_us'/'save_s' untuk file sebesar 'baris', regresi linear dari pengukuran"""
+    x = [h["baris"] for h in hasil_excel]
+    y = [h[kunci] for h in hasil_excel]
+    if len(x) < 2:
+        return y[0] * baris / max(x[0], 1)
+    rx = sum(x) / len(x)
+    ry = sum(y) / len(y)
+    b = sum((xi - rx) * (yi - ry) for xi, yi in zip(x, y)) / sum((xi - rx) ** 2 for xi in x)
+    return max(ry + b * (baris - rx), min(y))
+
+
+def rekomendasi(hasil_excel, hasil_disk, hasil_serial, baud, panjang_frame, baris_target):
+    """
+    FlushPolicy dan laju sampel maksimum dari hasil pengukuran
+
+    Laju maksimum adalah yang paling kecil dari: baud rate (10 bit per byte),
+    jalur baca loopback, journal (satu write+fsync per baris di loop sesi)
+    dan append di thread penulis pada file sebesar baris_target. Interval flush dipilih agar save file
+    sebesar baris_target memakai paling banyak BEBAN_SAVE dari waktu thread
+    penulis; max_rows = jumlah baris pada laju maksimum selama interval itu.
+
+    Returns:
+        dict: {'policy', 'laju_maks', 'pembatas', 'batas', 'save_target_s', 'saran'}
+    """
+    from excelWriter import FlushPolicy
+
+    append_s = _perkiraan(hasil_excel, "append_us", baris_target) / 1e6
+    journal_s = hasil_disk["fsync"]["rata_us"] / 1e6
+    batas = {"baud rate": baud / 10 / panjang_frame}
+    if hasil_serial:
+        batas["baca serial"] = min(h["frame_per_detik"] for h in hasil_serial)
+    if journal_s > 0:
+        batas["journal fsync"] = 1 / journal_s
+    if append_s > 0:
+        batas["append Excel"] = (1 - BEBAN_SAVE) / append_s
+    pembatas = min(batas, key=batas.get)
+    laju_maks = batas[pembatas]
+
+    save_target = _perkiraan(hasil_excel, "save_s", baris_target)
+    interval = max(1.0, math.ceil(save_target / BEBAN_SAVE * 2) / 2)
+    policy = FlushPolicy(max_rows=max(1, math.ceil(laju_maks * interval)), max_interval=interval)
+
+    saran = []
+    if save_target > SAVE_MAKS:
+        saran.append(f"Save file {baris_target} baris ±{save_target:.1f} detik: pertimbangkan "
+                     f"--storage stream atau --storage sqlite")
+    if pembatas == "journal fsync":
+        saran.append("Journal (fsync per baris) paling lambat: gunakan disk lokal/SSD untuk folder "
+                     "output atau kurangi baris dengan filter deadband")
+    if pembatas == "append Excel":
+        saran.append("Append openpyxl paling lambat: gunakan --storage stream atau --storage sqlite")
+    return {"policy": policy, "laju_maks": laju_maks, "pembatas": pembatas, "batas": batas,
+            "save_target_s": save_target, "saran": saran}
+
+
+def preflight(folder=".", baud=9600, cepat=False, baris_target=None, trace=None, serial_ok=True):
+    """
+    Menjalankan semua pengukuran lalu mencetak rekomendasi
+
+    Args:
+        folder (str): Folder output logger (tempat file Excel dan journal)
+        baud (int): Baud rate mesin
+        cepat (bool): Pengukuran lebih singkat
+        baris_target (int): Ukuran file (baris) untuk rekomendasi,
+                            default ukuran terbesar yang diukur
+        trace (str): File trace mentah sebagai contoh frame
+        serial_ok (bool): False = lewati pengukuran serial
+
+    Returns:
+        dict: Hasil rekomendasi()
+    """
+    print("\n" + "=" * 50)
+    print("PREFLIGHT PERFORMA LOGGER")
+    print("=" * 50)
+    folder = os.path.abspath(folder)
+    print(f"Folder output: {folder}")
+
+    ukuran = UKURAN_EXCEL_CEPAT if cepat else UKURAN_EXCEL
+    baris_target = baris_target or max(ukuran)
+
+    print("\n1. openpyxl append dan save:")
+    hasil_excel = ukur_excel(folder, ukuran)
+    for h in hasil_excel:
+        print(f"   {h['baris']:>7} baris ({h['ukuran_kb']} kB): append {h['append_us']} us/baris, "
+              f"save {h['save_s']} detik")
+
+    print("\n2. Disk (write + fsync per record journal):")
+    hasil_disk = ukur_disk(folder, JUMLAH_FSYNC_CEPAT if cepat else JUMLAH_FSYNC)
+    f = hasil_disk["fsync"]
+    print(f"   fsync: rata {f['rata_us']} us, p50 {f['p50_us']} us, p99 {f['p99_us']} us, maks {f['maks_us']} us")
+    print(f"   Tulis berurutan: {hasil_disk['mb_per_detik']} MB/detik")
+
+    frames = [FRAME_CONTOH]
+    if trace:
+        with open(trace, "rb") as ft:
+            frames = [line for line in ft if line.strip()] or frames
+    panjang_frame = sum(len(fr) for fr in frames) / len(frames)
+
+    print("\n3. Serial loopback (SerialReader + parse):")
+    hasil_serial = []
+    if not serial_ok:
+        print("   ⚠️  Dilewati: PySerial tidak terinstall dengan benar")
+    else:
+        jalur = ["loop://"] + (["pty"] if os.name == "posix" else [])
+        for j in jalur:
+            try:
+                h = ukur_serial(j, baud, frames, FRAME_LOOPBACK_CEPAT if cepat else FRAME_LOOPBACK)
+            except Exception as e:
+                print(f"   ⚠️  {j}: gagal ({e})")
+                continue
+            hasil_serial.append(h)
+            print(f"   {j:<8} {h['frame']} frame dalam {h['detik']} detik = {h['frame_per_detik']} frame/detik")
+    print(f"   Batas baud {baud}: ±{baud / 10 / panjang_frame:.0f} frame/detik "
+          f"({panjang_frame:.0f} byte per frame)")
+
+    r = rekomendasi(hasil_excel, hasil_disk, hasil_serial, baud, panjang_frame, baris_target)
+    print("\n4. Rekomendasi:")
+    for nama, laju in sorted(r["batas"].items(), key=lambda x: x[1]):
+        print(f"   {nama:<14} ±{laju:,.0f} baris/detik")
+    print(f"✓ Laju sampel maksimum: ±{r['laju_maks']:,.0f} baris/detik (dibatasi {r['pembatas']})")
+    print(f"✓ Save file {baris_target} baris: ±{r['save_target_s']:.2f} detik")
+    p = r["policy"]
+    print(f"✓ Disarankan: {p} "
+          f"(--flush-rows {p.max_rows} --flush-interval {p.max_interval:g})")
+    for s in r["saran"]:
+        print(f"⚠️  {s}")
+    return r
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diagnosis PySerial dan preflight performa logger")
+    parser.add_argument("--preflight", action="store_true", help="Ukur performa dan sarankan FlushPolicy")
+    parser.add_argument("--dir", default=".", help="Folder output logger (default: folder saat ini)")
+    parser.add_argument("--baud", type=int, default=9600, help="Baud rate mesin (default: 9600)")
+    parser.add_argument("--baris-target", type=int, default=None,
+                        help="Ukuran file (baris) untuk rekomendasi (default: ukuran terbesar yang diukur)")
+    parser.add_argument("--trace", default=None, help="File trace mentah sebagai contoh frame")
+    parser.add_argument("--cepat", action="store_true", help="Pengukuran lebih singkat")
+    args = parser.parse_args()
+
     print("DIAGNOSIS MASALAH PYSERIAL")
     print("=" * 50)
     
@@ -115,6 +470,9 @@ if __name__ == "__main__":
     # Jika gagal, tampilkan panduan
     if not success:
         installation_guide()
+
+    if args.preflight:
+        preflight(args.dir, args.baud, args.cepat, args.baris_target, args.trace, serial_ok=success)
     
     print("\n" + "="*50)
     print("DIAGNOSIS SELESAI")
@@ -0,0 +1,302 @@
+"""
+Rekaman mentah resolusi penuh ke file biner yang di-memory-map.
+
+Pada sampling cepat, setiap nilai tidak mungkin lewat sel openpyxl. Semua
+nilai ditulis sebagai record lebar tetap (waktu, kN, sumber) ke file
+'<nama>.raw' lewat mmap, sedangkan Excel hanya menerima satu baris per
+interval (nilai terbesar di interval itu, agar puncak tidak hilang).
+
+Format file:
+    header 64 byte  : magic, versi, ukuran record, kapasitas, jumlah record,
+                      epoch (time.time() saat file dibuat)
+    record 16 byte  : t float64 (detik sejak epoch, dari time.monotonic),
+                      kN float32, sumber uint8, 3 byte padding
+
+Dengan kapasitas > 0 file berupa ring buffer (record terlama ditimpa),
+kapasitas 0 berarti file terus diperbesar. File bisa dimuat tanpa parsing
+teks dengan muat_capture() (butuh NumPy).
+"""
+import mmap
+import os
+import struct
+import time
+
+MAGIC = b"PYSRAW01"
+VERSI = 1
+
+HEADER = struct.Struct("<8sHHIQQd")
+UKURAN_HEADER = 64
+RECORD = struct.Struct("<dfB3x")
+# Offset field 'jumlah' di header, diperbarui setelah setiap record
+_OFFSET_JUMLAH = 24
+
+# Flag kolom 'sumber'
+SUMBER_SERIAL = 1
+SUMBER_MANUAL = 2
+
+# Default: ring 1 juta record (16 MB), Excel 1 baris per detik
+KAPASITAS = 1_000_000
+INTERVAL_EXCEL = 1.0
+# Pertambahan ukuran file untuk kapasitas 0 (record)
+_TAMBAH = 65536
+
+
+def capture_path(excel_file):
+    """
+    Nama file rekaman mentah untuk sebuah file Excel
+
+    Args:
+        excel_file (str): Nama file Excel
+
+    Returns:
+        str: Nama file rekaman (misal: 'pressure_data.raw')
+    """
+    return os.path.splitext(excel_file)[0] + ".raw"
+
+
+class CapturePolicy:
+    """
+    Pengaturan rekaman mentah
+
+    Args:
+        kapasitas (int): Jumlah record di ring buffer, 0 = file terus bertambah
+                         (default: 1.000.000)
+        interval_excel (float): Satu baris Excel per interval ini dalam detik,
+                                0 = setiap nilai tetap ke Excel (default: 1.0)
+    """
+
+    def __init__(self, kapasitas=KAPASITAS, interval_excel=INTERVAL_EXCEL):
+        if kapasitas < 0:
+            raise ValueError("kapasitas tidak boleh negatif")
+        if interval_excel < 0:
+            raise ValueError("interval_excel tidak boleh negatif")
+        self.kapasitas = int(kapasitas)
+        self.interval_excel = float(interval_excel)
+
+    def __repr__(self):
+        return f"CapturePolicy(kapasitas={self.kapasitas}, interval_excel={self.interval_excel})"
+
+
+class RawCapture:
+    """
+    Penulis record mentah ke file mmap
+
+    File yang sudah ada dilanjutkan; kapasitasnya mengikuti header file.
+
+    Args:
+        path (str): Nama file rekaman
+        kapasitas (int): Kapasitas ring untuk file baru, 0 = terus bertambah
+    """
+
+    def __init__(self, path, kapasitas=KAPASITAS):
+        self.path = path
+        self.kapasitas = int(kapasitas)
+        self.jumlah = 0
+        self.epoch = 0.0
+        self._file = None
+        self._mm = None
+        self._slot = 0
+        self._offset = 0.0
+
+    def open(self):
+        """Membuka atau membuat file rekaman"""
+        baru = not os.path.exists(self.path) or os.path.getsize(self.path) < UKURAN_HEADER
+        self._file = open(self.path, "w+b" if baru else "r+b")
+        try:
+            if baru:
+                self.epoch = time.time()
+                self._file.write(HEADER.pack(MAGIC, VERSI, RECORD.size, 0, self.kapasitas, 0, self.epoch))
+                self._file.flush()
+            else:
+                magic, versi, ukuran, _, kapasitas, jumlah, epoch = HEADER.unpack(
+                    self._file.read(HEADER.size))
+                if magic != MAGIC or versi != VERSI or ukuran != RECORD.size:
+                    raise ValueError(f"'{self.path}' bukan file rekaman mentah yang dikenal")
+                self.kapasitas = kapasitas
+                self.jumlah = jumlah
+                self.epoch = epoch
+            self._petakan(UKURAN_HEADER + (self.kapasitas or _TAMBAH) * RECORD.size if baru else None)
+        except Exception:
+            self._file.close()
+            self._file = None
+            raise
+
+        # Waktu monotonic sesi ini dipetakan ke detik sejak epoch file
+        self._offset = time.time() - time.monotonic() - self.epoch
+
+    def _petakan(self, ukuran=None):
+        """
+        Membuat ulang mmap sesuai ukuran file
+
+        Args:
+            ukuran (int): Ubah ukuran file lebih dulu (default: ukuran tetap)
+        """
+        # Windows menolak mengubah ukuran file yang masih dipetakan
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if ukuran is not None:
+            self._file.truncate(ukuran) # type: ignore
+        self._mm = mmap.mmap(self._file.fileno(), 0) # type: ignore
+        self._slot = (len(self._mm) - UKURAN_HEADER) // RECORD.size
+
+    def waktu(self):
+        """
+        Waktu sekarang dalam skala file
+
+        Returns:
+            float: Detik sejak epoch file (monotonic selama sesi)
+        """
+        return time.monotonic() + self._offset
+
+    def waktu_dari(self, monotonic):
+        """
+        Mengubah waktu time.monotonic() sesi ini ke skala file
+
+        Args:
+            monotonic (float): Waktu dari time.monotonic()
+
+        Returns:
+            float: Detik sejak epoch file
+        """
+        return monotonic + self._offset
+
+    def tambah(self, nilai, sumber=SUMBER_SERIAL, t=None):
+        """
+        Menambahkan satu record
+
+        Args:
+            nilai (float): Nilai kN
+            sumber (int): SUMBER_SERIAL atau SUMBER_MANUAL
+            t (float): Waktu record dari waktu() (default: sekarang)
+
+        Returns:
+            float: Waktu record
+        """
+        if t is None:
+            t = time.monotonic() + self._offset
+        if self.kapasitas:
+            i = self.jumlah % self.kapasitas
+        else:
+            i = self.jumlah
+            if i >= self._slot:
+                self._petakan(UKURAN_HEADER + (self._slot + _TAMBAH) * RECORD.size)
+        RECORD.pack_into(self._mm, UKURAN_HEADER + i * RECORD.size, t, nilai, sumber) # type: ignore
+        # Jumlah diperbarui setelah record utuh tertulis
+        self.jumlah += 1
+        struct.pack_into("<Q", self._mm, _OFFSET_JUMLAH, self.jumlah) # type: ignore
+        return t
+
+    def flush(self):
+        """Menulis halaman mmap yang berubah ke disk"""
+        if self._mm is not None:
+            self._mm.flush()
+
+    def close(self):
+        """Menyimpan dan menutup file rekaman"""
+        if self._mm is not None:
+            self._mm.flush()
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class Decimator:
+    """
+    Memilih satu nilai per interval untuk tampilan Excel
+
+    Nilai terbesar di setiap interval yang diteruskan, sehingga puncak
+    pembebanan tetap terlihat di Excel.
+
+    Args:
+        interval (float): Panjang interval dalam detik, 0 = semua nilai lolos
+    """
+
+    def __init__(self, interval=INTERVAL_EXCEL):
+        self.interval = interval
+        self._mulai = None
+        self._terbaik = None
+        self._nilai = 0.0
+        self.jumlah = 0
+
+    def proses(self, t, nilai, data):
+        """
+        Memasukkan satu nilai
+
+        Args:
+            t (float): Waktu nilai (detik)
+            nilai (float): Nilai kN
+            data: Data pendamping yang ikut diteruskan (misal nilai terformat)
+
+        Returns:
+            tuple: (data, jumlah sampel) dari interval yang baru selesai, atau None
+        """
+        if not self.interval:
+            return data, 1
+
+        keluar = None
+        if self._mulai is not None and t - self._mulai >= self.interval:
+            keluar = self.akhiri()
+        if self._mulai is None:
+            self._mulai = t
+        self.jumlah += 1
+        if self._terbaik is None or nilai > self._nilai:
+            self._nilai = nilai
+            self._terbaik = data
+        return keluar
+
+    def akhiri(self):
+        """
+        Mengeluarkan interval yang sedang berjalan
+
+        Returns:
+            tuple: (data, jumlah sampel), atau None jika kosong
+        """
+        if self._terbaik is None:
+            return None
+        keluar = (self._terbaik, self.jumlah)
+        self._mulai = None
+        self._terbaik = None
+        self.jumlah = 0
+        return keluar
+
+
+def muat_capture(path):
+    """
+    Memuat seluruh rekaman sebagai array NumPy, urut dari yang terlama
+
+    Args:
+        path (str): Nama file rekaman (.raw)
+
+    Returns:
+        dict: {'t': float64 detik sejak epoch, 'kn': float32, 'sumber': uint8,
+               'epoch': float time.time() saat file dibuat, 'jumlah': total record
+               yang pernah ditulis}
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("NumPy diperlukan untuk memuat rekaman mentah (pip install numpy)") from None
+
+    with open(path, "rb") as f:
+        magic, versi, ukuran, _, kapasitas, jumlah, epoch = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC or versi != VERSI or ukuran != RECORD.size:
+        raise ValueError(f"'{path}' bukan file rekaman mentah yang dikenal")
+
+    dtype = np.dtype([("t", "<f8"), ("kn", "<f4"), ("sumber", "u1"), ("_", "V3")])
+    n = min(jumlah, kapasitas) if kapasitas else jumlah
+    rec = np.fromfile(path, dtype=dtype, count=n, offset=UKURAN_HEADER)
+    if kapasitas and jumlah > kapasitas:
+        # Ring sudah berputar: record terlama ada di posisi tulis berikutnya
+        i = jumlah % kapasitas
+        rec = np.concatenate((rec[i:], rec[:i]))
+
+    return {
+        "t": np.ascontiguousarray(rec["t"]),
+        "kn": np.ascontiguousarray(rec["kn"]),
+        "sumber": np.ascontiguousarray(rec["sumber"]),
+        "epoch": epoch,
+        "jumlah": jumlah,
+    }
@@ -0,0 +1,144 @@
+"""
+Index sidecar untuk melanjutkan sesi logging tanpa memuat seluruh workbook.
+
+Setelah setiap penyimpanan, penulis Excel mencatat jumlah baris, nomor
+'No' terakhir dan timestamp terakhir ke '<file>.idx'. Index hanya dipakai
+jika mtime dan ukuran file Excel masih sama dengan yang tercatat.
+"""
+import json
+import os
+
+
+def index_path(excel_file):
+    """
+    Nama file index untuk sebuah file Excel
+
+    Args:
+        excel_file (str): Nama file Excel
+
+    Returns:
+        str: Nama file index (misal: 'pressure_data.xlsx.idx')
+    """
+    return excel_file + ".idx"
+
+
+def tulis_index(excel_file, rows, last_no, last_ts, sheets=None):
+    """
+    Mencatat kondisi terakhir file Excel ke index sidecar
+
+    Args:
+        excel_file (str): Nama file Excel yang baru disimpan
+        rows (int): Jumlah baris di sheet termasuk header
+        last_no (int): Nomor 'No' baris terakhir
+        last_ts (str): Timestamp baris terakhir
+        sheets (dict): Nomor 'No' terakhir per sheet tambahan (misal 'Specimens')
+    """
+    st = os.stat(excel_file)
+    info = {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "rows": rows,
+        "last_no": last_no,
+        "last_ts": last_ts,
+        "sheets": dict(sheets or {}),
+    }
+
+    path = index_path(excel_file)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(info, f)
+    os.replace(tmp, path)
+
+
+def baca_index(excel_file):
+    """
+    Membaca index sidecar jika masih cocok dengan file Excel
+
+    Args:
+        excel_file (str): Nama file Excel
+
+    Returns:
+        dict: Isi index, atau None jika tidak ada / sudah basi
+    """
+    try:
+        with open(index_path(excel_file), "r", encoding="utf-8") as f:
+            info = json.load(f)
+        st = os.stat(excel_file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(info, dict):
+        return None
+    if info.get("mtime_ns") != st.st_mtime_ns or info.get("size") != st.st_size:
+        return None
+    if not isinstance(info.get("rows"), int):
+        return None
+    return info
+
+
+def scan_ringkas(excel_file, sheets=()):
+    """
+    Menghitung jumlah baris dan baris terakhir dengan mode read-only
+
+    Dipakai jika index tidak ada atau basi. Sel tidak disimpan di memori,
+    baris hanya dilewati secara streaming.
+
+    Args:
+        excel_file (str): Nama file Excel
+        sheets (tuple): Nama sheet tambahan yang nomor terakhirnya dicari
+
+    Returns:
+        dict: {'rows', 'last_no', 'last_ts', 'sheets'}
+    """
+    from openpyxl import load_workbook
+    wb = load_workbook(excel_file, read_only=True)
+    try:
+        rows, last = _scan_sheet(wb.worksheets[0])
+        nomor_sheets = {}
+        for nama in sheets:
+            nomor_sheets[nama] = 0
+            if nama in wb.sheetnames:
+                n, akhir = _scan_sheet(wb[nama])
+                if akhir and n > 1:
+                    nomor_sheets[nama] = akhir[0]
+    finally:
+        wb.close()
+
+    last_no = last[0] if last and rows > 1 else 0
+    last_ts = str(last[1]) if last and rows > 1 and len(last) > 1 else None
+    return {"rows": rows, "last_no": last_no, "last_ts": last_ts, "sheets": nomor_sheets}
+
+
+def _scan_sheet(ws):
+    """Jumlah baris dan baris terakhir sebuah sheet read-only"""
+    rows = 0
+    last = None
+    for row in ws.iter_rows(values_only=True):
+        rows += 1
+        last = row
+    return rows, last
+
+
+def info_resume(excel_file, sheets=()):
+    """
+    Informasi untuk melanjutkan file Excel, dari index jika masih valid
+
+    Jika index basi, file dipindai secara streaming lalu index ditulis ulang.
+
+    Args:
+        excel_file (str): Nama file Excel yang sudah ada
+        sheets (tuple): Nama sheet tambahan yang nomor terakhirnya diperlukan
+
+    Returns:
+        dict: {'rows', 'last_no', 'last_ts', 'sheets'}
+    """
+    info = baca_index(excel_file)
+    if info is not None and all(nama in info.get("sheets", {}) for nama in sheets):
+        return info
+
+    info = scan_ringkas(excel_file, sheets)
+    try:
+        tulis_index(excel_file, info["rows"], info["last_no"], info["last_ts"], info["sheets"])
+    except OSError:
+        pass
+    return info
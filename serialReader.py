@@ -0,0 +1,142 @@
+"""
+Thread pembaca serial khusus dengan antrean frame terbatas.
+
+Pembacaan port tidak lagi berbagi thread dengan parsing, journal dan
+input keyboard. Thread ini hanya membaca byte, memecahnya menjadi frame,
+memberi setiap frame waktu kedatangan lalu memasukkannya ke antrean.
+
+Jika antrean penuh (penyimpanan atau loop sesi tertinggal), thread
+berhenti membaca sehingga data menumpuk di buffer OS/driver
+(backpressure). Frame hanya dibuang jika antrean tetap penuh melewati
+batas tunggu, dan setiap kejadian dihitung di statistik port.
+"""
+import threading
+import time
+from collections import deque
+
+import serial
+
+from frameParser import FrameBuffer
+from sessionStats import TAHAP_BACA
+
+# Kapasitas antrean (frame) dan batas tunggu saat antrean penuh (detik)
+KAPASITAS_ANTREAN = 10000
+BATAS_TUNGGU = 5.0
+
+
+class SerialReader:
+    """
+    Thread yang membaca satu port serial ke antrean frame
+
+    Args:
+        ser (serial.Serial): Port yang sudah dibuka (dengan timeout)
+        stats (SessionStats): Statistik port
+        bangunkan (callable): Dipanggil saat antrean berubah dari kosong
+                              menjadi berisi, atau saat port terputus
+        kapasitas (int): Jumlah frame maksimum di antrean (default: 10000)
+        batas_tunggu (float): Lama menunggu antrean kosong sebelum frame
+                              dibuang, None = tunggu terus (default: 5.0)
+        nama (str): Nama thread
+    """
+
+    def __init__(self, ser, stats, bangunkan, kapasitas=KAPASITAS_ANTREAN, batas_tunggu=BATAS_TUNGGU,
+                 nama="serial-reader"):
+        self.ser = ser
+        self.stats = stats
+        self.bangunkan = bangunkan
+        self.kapasitas = kapasitas
+        self.batas_tunggu = batas_tunggu
+        self.buffer = FrameBuffer()
+        self.error = None
+
+        self._antrean = deque()
+        self._cond = threading.Condition()
+        self._berhenti = False
+        self._thread = threading.Thread(target=self._run, name=nama, daemon=True)
+
+    def mulai(self):
+        """Menjalankan thread pembaca"""
+        self._thread.start()
+
+    def hentikan(self):
+        """Menghentikan thread pembaca dan menunggu sampai selesai"""
+        with self._cond:
+            self._berhenti = True
+            self._cond.notify_all()
+        cancel = getattr(self.ser, "cancel_read", None)
+        if cancel is not None:
+            try:
+                cancel()
+            except Exception:
+                pass
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def ambil(self):
+        """
+        Mengambil semua frame yang sudah mengantre
+
+        Returns:
+            list: Daftar (waktu kedatangan time.monotonic(), frame bytes)
+        """
+        with self._cond:
+            frames = list(self._antrean)
+            self._antrean.clear()
+            self._cond.notify_all()
+        return frames
+
+    def _run(self):
+        """Loop thread pembaca"""
+        stats = self.stats
+        while not self._berhenti:
+            try:
+                t0 = time.perf_counter_ns()
+                menunggu = self.ser.in_waiting
+                data = self.ser.read(menunggu or 1)
+                stats.catat(TAHAP_BACA, time.perf_counter_ns() - t0)
+            except (serial.SerialException, OSError, TypeError) as e:
+                # TypeError: pyserial saat port ditutup di tengah read
+                if not self._berhenti:
+                    self.error = e
+                    self.bangunkan()
+                return
+            if not data:
+                continue
+
+            waktu = time.monotonic()
+            if menunggu > stats.counter["antrean_os_maks"]:
+                stats.counter["antrean_os_maks"] = menunggu
+            stats.tambah("bytes", len(data))
+
+            self.buffer.isi(data)
+            frames = [bytes(frame) for frame in self.buffer.frames()]
+            stats.counter["frame_dibuang"] = self.buffer.frame_dibuang
+            if frames:
+                stats.tambah("frame_dibaca", len(frames))
+                self._antre(waktu, frames)
+
+    def _antre(self, waktu, frames):
+        """Memasukkan frame ke antrean, menunggu jika penuh"""
+        with self._cond:
+            if len(self._antrean) + len(frames) > self.kapasitas:
+                # Backpressure: berhenti membaca port sampai loop sesi mengejar
+                self.stats.tambah("backpressure")
+                batas = None if self.batas_tunggu is None else time.monotonic() + self.batas_tunggu
+                while not self._berhenti and len(self._antrean) + len(frames) > self.kapasitas:
+                    sisa = None if batas is None else batas - time.monotonic()
+                    if sisa is not None and sisa <= 0:
+                        break
+                    self._cond.wait(sisa)
+
+                ruang = max(0, self.kapasitas - len(self._antrean))
+                if len(frames) > ruang:
+                    self.stats.tambah("frame_overflow", len(frames) - ruang)
+                    frames = frames[:ruang]
+
+            kosong = not self._antrean
+            self._antrean.extend((waktu, frame) for frame in frames)
+            if len(self._antrean) > self.stats.counter["antrean_maks"]:
+                self.stats.counter["antrean_maks"] = len(self._antrean)
+
+        if kosong and frames:
+            self.bangunkan()
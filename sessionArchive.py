@@ -0,0 +1,736 @@
+"""
+Arsip kolom terkompresi untuk sesi logging yang sudah selesai.
+
+File Excel lama besar dan lambat dimuat ulang untuk audit. Arsip
+menyimpan setiap sesi sebagai chunk kolom yang dikompres zlib:
+
+    No         int64, delta dari baris sebelumnya
+    Timestamp  int64 detik sejak 1970-01-01 (waktu lokal apa adanya),
+               delta dari baris sebelumnya; 0 = timestamp kosong
+    Nilai KN   float32 (NaN = kosong)
+    Sumber     uint8, index ke daftar sumber sesi ('SERIAL', 'MANUAL', ...)
+    Raw/Ket.   teks UTF-8, didahului panjang byte tiap baris (uint32)
+
+Format file:
+    magic 8 byte, lalu chunk-chunk dan sheet tambahan (JSON zlib) per sesi,
+    lalu footer JSON zlib berisi index sesi dan chunk (offset, jumlah baris,
+    rentang waktu), ditutup trailer 24 byte: offset footer, panjang footer,
+    magic.
+
+Sesi baru ditambahkan di akhir file beserta footer baru; chunk lama tidak
+ditulis ulang. Footer lama tetap ada di file, sehingga jika penambahan
+terputus arsip kembali ke footer valid terakhir. Pembaca hanya membuka
+chunk yang rentang waktunya beririsan dengan jendela yang diminta, dan
+ekspor ke Excel tetap tersedia untuk pelanggan.
+
+Contoh:
+    python sessionArchive.py arsip pressure_data.xlsx data/
+    python sessionArchive.py info pressure_data.arsip
+    python sessionArchive.py ekspor pressure_data.arsip audit.xlsx --mulai "2026-10-16 08:00" --sampai "2026-10-16 09:00"
+"""
+import json
+import math
+import os
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime, timedelta
+
+from cellFormat import FORMAT_TIMESTAMP, KOLOM_WAKTU, baris_bertipe, format_kolom, ke_angka, ke_waktu, \
+    sel_write_only
+
+MAGIC = b"PYSARC01"
+VERSI = 2
+TRAILER = struct.Struct("<QQ8s")
+
+# Jumlah baris per chunk dan level kompresi zlib
+CHUNK_BARIS = 4096
+LEVEL_ZLIB = 6
+EKSTENSI_ARSIP = ".arsip"
+
+# Penanda timestamp kosong
+T_KOSONG = 0
+
+_EPOCH = datetime(1970, 1, 1)
+_BIG_ENDIAN = sys.byteorder == "big"
+
+# Kolom sheet utama yang bisa diarsip, dipetakan ke kolom arsip
+KOLOM_ARSIP = {
+    "No": "no",
+    "Timestamp": "t",
+    "Nilai KN": "kn",
+    "Sumber": "sumber",
+    "Raw Data/Keterangan": "raw",
+    "Keterangan": "raw",
+}
+
+# Kode kolom 'Sumber' di chunk arsip. Bagian dari format file, terpisah
+# dari kode record rawCapture; daftar lengkapnya disimpan per sesi di footer
+KODE_SERIAL = 1
+KODE_MANUAL = 2
+
+# Daftar sumber awal setiap sesi; index = kode di kolom 'Sumber'
+_SUMBER_AWAL = [None] * (max(KODE_SERIAL, KODE_MANUAL) + 1)
+_SUMBER_AWAL[KODE_SERIAL] = "SERIAL"
+_SUMBER_AWAL[KODE_MANUAL] = "MANUAL"
+
+
+def arsip_path(excel_file):
+    """
+    Nama file arsip untuk sebuah file Excel logger
+
+    Args:
+        excel_file (str): Nama file Excel (atau database/file dasar shard)
+
+    Returns:
+        str: Nama file arsip (misal: 'pressure_data.arsip')
+    """
+    return os.path.splitext(excel_file)[0] + EKSTENSI_ARSIP
+
+
+def _ke_detik(waktu):
+    """datetime ke detik sejak epoch, T_KOSONG jika bukan waktu"""
+    waktu = ke_waktu(waktu)
+    if not isinstance(waktu, datetime):
+        return T_KOSONG
+    return int((waktu.replace(tzinfo=None) - _EPOCH).total_seconds())
+
+
+def _dari_detik(detik):
+    """Detik sejak epoch ke datetime, None untuk T_KOSONG"""
+    return None if detik == T_KOSONG else _EPOCH + timedelta(seconds=detik)
+
+
+def _delta(nilai):
+    """array int64 berisi selisih berurutan (nilai pertama apa adanya)"""
+    hasil = array("q", nilai)
+    for i in range(len(hasil) - 1, 0, -1):
+        hasil[i] -= hasil[i - 1]
+    return hasil
+
+
+def _kumulatif(delta):
+    """Kebalikan _delta()"""
+    hasil = array("q", delta)
+    for i in range(1, len(hasil)):
+        hasil[i] += hasil[i - 1]
+    return hasil
+
+
+def _bytes(arr):
+    """Isi array dalam urutan byte little-endian"""
+    if _BIG_ENDIAN:
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _array(typecode, data):
+    """array dari byte little-endian"""
+    arr = array(typecode)
+    arr.frombytes(data)
+    if _BIG_ENDIAN:
+        arr.byteswap()
+    return arr
+
+
+def _kodekan_chunk(rows, sumber):
+    """
+    Mengubah baris arsip menjadi satu chunk terkompresi
+
+    Args:
+        rows (list): Baris (no, detik, kn, sumber, raw)
+        sumber (list): Daftar sumber sesi, ditambah jika ada sumber baru
+
+    Returns:
+        bytes: Chunk terkompresi
+    """
+    kode = []
+    for r in rows:
+        s = r[3]
+        if s not in sumber:
+            if len(sumber) > 255:
+                raise ValueError("terlalu banyak nilai 'Sumber' yang berbeda")
+            sumber.append(s)
+        kode.append(sumber.index(s))
+
+    kn = array("f", (r[2] if isinstance(r[2], float) else math.nan for r in rows))
+    # Panjang per baris, bukan pemisah: teks raw boleh berisi karakter apa pun
+    raw = [b"" if r[4] is None else str(r[4]).encode("utf-8") for r in rows]
+    data = b"".join((
+        struct.pack("<I", len(rows)),
+        _bytes(_delta(r[0] for r in rows)),
+        _bytes(_delta(r[1] for r in rows)),
+        _bytes(kn),
+        bytes(kode),
+        _bytes(array("I", map(len, raw))),
+        *raw,
+    ))
+    return zlib.compress(data, LEVEL_ZLIB)
+
+
+def _dekode_chunk(data):
+    """
+    Kebalikan _kodekan_chunk()
+
+    Returns:
+        tuple: (array No, array detik, array kN float32, bytes kode sumber, list raw)
+    """
+    data = zlib.decompress(data)
+    (n,) = struct.unpack_from("<I", data)
+    pos = 4
+    no = _kumulatif(_array("q", data[pos:pos + 8 * n]))
+    pos += 8 * n
+    detik = _kumulatif(_array("q", data[pos:pos + 8 * n]))
+    pos += 8 * n
+    kn = _array("f", data[pos:pos + 4 * n])
+    pos += 4 * n
+    kode = data[pos:pos + n]
+    pos += n
+    raw = []
+    teks = pos + 4 * n
+    for panjang in _array("I", data[pos:teks]):
+        raw.append(data[teks:teks + panjang].decode("utf-8"))
+        teks += panjang
+    return no, detik, kn, kode, raw
+
+
+def _nilai_kn(v):
+    """float32 kembali ke nilai desimal aslinya (7 digit signifikan), None untuk NaN"""
+    return None if math.isnan(v) else float(f"{v:.7g}")
+
+
+def _baca_trailer(f, ukuran):
+    """Footer dari trailer yang berakhir di posisi 'ukuran', None jika tidak valid"""
+    if ukuran < len(MAGIC) + TRAILER.size:
+        return None
+    f.seek(ukuran - TRAILER.size)
+    offset, panjang, magic = TRAILER.unpack(f.read(TRAILER.size))
+    if magic != MAGIC or offset + panjang + TRAILER.size != ukuran:
+        return None
+    f.seek(offset)
+    try:
+        footer = json.loads(zlib.decompress(f.read(panjang)))
+    except (zlib.error, ValueError):
+        return None
+    return footer if isinstance(footer, dict) and footer.get("versi") == VERSI else None
+
+
+def baca_footer(path):
+    """
+    Membaca index arsip
+
+    Jika trailer terakhir rusak (penambahan sesi terputus), footer valid
+    sebelumnya dicari dari belakang.
+
+    Args:
+        path (str): File arsip
+
+    Returns:
+        tuple: (footer dict, ukuran file yang valid)
+
+    Raises:
+        ValueError: Jika file bukan arsip atau tidak ada footer yang valid
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{path}' bukan file arsip")
+        f.seek(0, os.SEEK_END)
+        ukuran = f.tell()
+        footer = _baca_trailer(f, ukuran)
+        if footer is not None:
+            return footer, ukuran
+
+        f.seek(0)
+        isi = f.read()
+        akhir = isi.rfind(MAGIC)
+        while akhir > 0:
+            footer = _baca_trailer(f, akhir + len(MAGIC))
+            if footer is not None:
+                return footer, akhir + len(MAGIC)
+            akhir = isi.rfind(MAGIC, 0, akhir)
+    raise ValueError(f"'{path}': index arsip tidak ditemukan")
+
+
+def tulis_sesi(path, rows, header, title="Pressure Data", lampiran=None, info=None):
+    """
+    Menambahkan satu sesi ke arsip (file dibuat jika belum ada)
+
+    Args:
+        path (str): File arsip
+        rows (iterable): Baris sheet utama sesuai header, boleh berupa generator
+        header (list): Header sheet utama; kolomnya harus ada di KOLOM_ARSIP
+        title (str): Judul sheet utama untuk ekspor
+        lampiran (dict): Sheet tambahan {judul: (header, rows)}, misal 'Specimens'
+        info (dict): Keterangan sesi tambahan (misal file sumber)
+
+    Returns:
+        dict: Entri sesi di index, None jika tidak ada baris sama sekali
+    """
+    kolom = [KOLOM_ARSIP.get(h) for h in header]
+    if None in kolom or "kn" not in kolom:
+        raise ValueError(f"kolom tidak bisa diarsip: {[h for h, k in zip(header, kolom) if k is None]}")
+    posisi = {k: kolom.index(k) for k in kolom}
+    sumber_tetap = None if "sumber" in posisi else "MANUAL"
+
+    def ambil(row, k):
+        i = posisi.get(k)
+        return row[i] if i is not None and i < len(row) else None
+
+    baru = not os.path.exists(path)
+    if baru:
+        footer, ukuran = {"versi": VERSI, "sesi": []}, len(MAGIC)
+        f = open(path, "w+b")
+        f.write(MAGIC)
+    else:
+        footer, ukuran = baca_footer(path)
+        f = open(path, "r+b")
+        f.truncate(ukuran)
+        f.seek(ukuran)
+
+    sumber = list(_SUMBER_AWAL)
+    sesi = dict(info or {}, id=1 + max((s["id"] for s in footer["sesi"]), default=0),
+                dibuat=datetime.now().strftime(FORMAT_TIMESTAMP), header=list(header), title=title,
+                baris=0, no_awal=None, no_akhir=None, t_awal=None, t_akhir=None, chunk=[], lampiran={})
+    selesai = False
+    try:
+        def tulis_chunk(buf):
+            t = [r[1] for r in buf if r[1] != T_KOSONG]
+            data = _kodekan_chunk(buf, sumber)
+            sesi["chunk"].append({"offset": f.tell(), "panjang": len(data), "baris": len(buf),
+                                  "t_awal": min(t, default=None), "t_akhir": max(t, default=None)})
+            f.write(data)
+
+        buf = []
+        for row in rows:
+            no = ambil(row, "no")
+            no = no if isinstance(no, int) and not isinstance(no, bool) else 0
+            if sesi["no_awal"] is None:
+                sesi["no_awal"] = no
+            sesi["no_akhir"] = no
+            kn = ke_angka(ambil(row, "kn"))
+            buf.append((no, _ke_detik(ambil(row, "t")),
+                        float(kn) if isinstance(kn, (int, float)) and not isinstance(kn, bool) else None,
+                        sumber_tetap or ambil(row, "sumber"), ambil(row, "raw")))
+            if len(buf) >= CHUNK_BARIS:
+                tulis_chunk(buf)
+                sesi["baris"] += len(buf)
+                buf = []
+        if buf:
+            tulis_chunk(buf)
+            sesi["baris"] += len(buf)
+
+        for judul, (h, isi) in (lampiran or {}).items():
+            isi = [list(r) for r in isi]
+            if not isi:
+                continue
+            data = zlib.compress(json.dumps(isi, default=str).encode("utf-8"), LEVEL_ZLIB)
+            nomor = [r[0] for r in isi if r and isinstance(r[0], int)]
+            sesi["lampiran"][judul] = {"header": list(h), "offset": f.tell(), "panjang": len(data),
+                                       "baris": len(isi), "no_akhir": max(nomor, default=None)}
+            f.write(data)
+
+        if not sesi["baris"] and not sesi["lampiran"]:
+            return None
+
+        chunks = sesi["chunk"]
+        t_awal = [c["t_awal"] for c in chunks if c["t_awal"] is not None]
+        t_akhir = [c["t_akhir"] for c in chunks if c["t_akhir"] is not None]
+        sesi["t_awal"] = min(t_awal, default=None)
+        sesi["t_akhir"] = max(t_akhir, default=None)
+        sesi["sumber"] = sumber
+        footer["sesi"].append(sesi)
+
+        offset = f.tell()
+        data = zlib.compress(json.dumps(footer).encode("utf-8"), LEVEL_ZLIB)
+        f.write(data)
+        f.write(TRAILER.pack(offset, len(data), MAGIC))
+        f.flush()
+        os.fsync(f.fileno())
+        selesai = True
+        return sesi
+    finally:
+        if not selesai and not baru:
+            # Batal atau gagal: arsip kembali ke footer sebelumnya
+            f.truncate(ukuran)
+        f.close()
+        if not selesai and baru:
+            os.remove(path)
+
+
+def _baca(f, entri):
+    """Isi satu chunk atau lampiran dari file arsip yang terbuka"""
+    f.seek(entri["offset"])
+    return f.read(entri["panjang"])
+
+
+def _batas(teks, akhir=False):
+    """
+    Batas jendela waktu dalam detik sejak epoch
+
+    Args:
+        teks (str | datetime): Timestamp, tanggal saja = awal/akhir hari
+        akhir (bool): True untuk batas akhir (inklusif)
+
+    Returns:
+        int: Detik, atau None jika tidak dibatasi
+    """
+    if teks is None or teks == "":
+        return None
+    if isinstance(teks, str) and len(teks.strip()) == 10:
+        teks = teks.strip() + (" 23:59:59" if akhir else " 00:00:00")
+    detik = _ke_detik(teks)
+    if detik == T_KOSONG:
+        raise ValueError(f"timestamp tidak dikenal: '{teks}'")
+    return detik
+
+
+def _dalam(t_awal, t_akhir, mulai, sampai):
+    """Apakah rentang [t_awal, t_akhir] beririsan dengan jendela"""
+    if mulai is None and sampai is None:
+        return True
+    if t_awal is None:
+        return False
+    return (mulai is None or t_akhir >= mulai) and (sampai is None or t_awal <= sampai)
+
+
+def baca_jendela(path, mulai=None, sampai=None, sesi=None):
+    """
+    Baris sheet utama dalam jendela waktu, hanya dari chunk yang beririsan
+
+    Args:
+        path (str): File arsip
+        mulai (str | datetime): Timestamp awal, inklusif (default: tanpa batas)
+        sampai (str | datetime): Timestamp akhir, inklusif; tanggal saja = sampai akhir hari
+        sesi (int): Hanya sesi ini
+
+    Yields:
+        tuple: (entri sesi, baris [No, Timestamp, Nilai KN, Sumber, Raw])
+    """
+    mulai = _batas(mulai)
+    sampai = _batas(sampai, akhir=True)
+    footer, _ = baca_footer(path)
+    with open(path, "rb") as f:
+        for s in footer["sesi"]:
+            if sesi is not None and s["id"] != sesi:
+                continue
+            if not _dalam(s["t_awal"], s["t_akhir"], mulai, sampai):
+                continue
+            for c in s["chunk"]:
+                if not _dalam(c["t_awal"], c["t_akhir"], mulai, sampai):
+                    continue
+                no, detik, kn, kode, raw = _dekode_chunk(_baca(f, c))
+                for i in range(len(no)):
+                    t = detik[i]
+                    if mulai is not None and (t == T_KOSONG or t < mulai):
+                        continue
+                    if sampai is not None and (t == T_KOSONG or t > sampai):
+                        continue
+                    yield s, [no[i], _dari_detik(t), _nilai_kn(kn[i]), s["sumber"][kode[i]], raw[i] or None]
+
+
+def baca_lampiran(path, judul, mulai=None, sampai=None, sesi=None):
+    """
+    Baris sheet tambahan (misal 'Specimens') dalam jendela waktu
+
+    Baris masuk jendela berdasarkan kolom waktu pertamanya (misal 'Mulai').
+
+    Returns:
+        tuple: (header, list baris) - header None jika sheet tidak ada
+    """
+    mulai = _batas(mulai)
+    sampai = _batas(sampai, akhir=True)
+    footer, _ = baca_footer(path)
+    header = None
+    hasil = []
+    with open(path, "rb") as f:
+        for s in footer["sesi"]:
+            entri = s["lampiran"].get(judul)
+            if entri is None or (sesi is not None and s["id"] != sesi):
+                continue
+            header = header or entri["header"]
+            i_waktu = next((i for i, h in enumerate(entri["header"]) if h in KOLOM_WAKTU), None)
+            for row in json.loads(zlib.decompress(_baca(f, entri))):
+                if mulai is not None or sampai is not None:
+                    t = _ke_detik(row[i_waktu]) if i_waktu is not None and i_waktu < len(row) else T_KOSONG
+                    if t == T_KOSONG or (mulai is not None and t < mulai) or (sampai is not None and t > sampai):
+                        continue
+                hasil.append(row)
+    return header, hasil
+
+
+def ekspor_xlsx(path, xlsx_file, mulai=None, sampai=None, sesi=None):
+    """
+    Membuat file Excel dari isi arsip (semua atau satu jendela waktu)
+
+    Args:
+        path (str): File arsip
+        xlsx_file (str): File Excel tujuan (ditimpa)
+        mulai (str): Timestamp awal 'YYYY-MM-DD[ HH:MM[:SS]]', inklusif
+        sampai (str): Timestamp akhir, inklusif; tanggal saja = sampai akhir hari
+        sesi (int): Hanya sesi ini
+
+    Returns:
+        dict: {'baris': jumlah baris sheet utama, 'sheets': {judul: jumlah baris}}
+    """
+    from openpyxl import Workbook
+
+    from excelWriter import simpan_atomik
+
+    footer, _ = baca_footer(path)
+    if not footer["sesi"]:
+        raise ValueError(f"'{path}' belum berisi sesi")
+    pertama = footer["sesi"][0]
+    header = pertama["header"]
+    urutan = {"no": 0, "t": 1, "kn": 2, "sumber": 3, "raw": 4}
+    ambil = [urutan[KOLOM_ARSIP[h]] for h in header]
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(pertama["title"])
+    ws.append(header)
+    formats = format_kolom(header)
+    jumlah = 0
+    for _, row in baca_jendela(path, mulai, sampai, sesi):
+        ws.append(sel_write_only(ws, [row[i] for i in ambil], formats))
+        jumlah += 1
+
+    jumlah_sheet = {}
+    judul_lain = dict.fromkeys(j for s in footer["sesi"] for j in s["lampiran"])
+    for judul in judul_lain:
+        h, rows = baca_lampiran(path, judul, mulai, sampai, sesi)
+        ws_lain = wb.create_sheet(judul)
+        ws_lain.append(h)
+        formats = format_kolom(h)
+        for row in rows:
+            ws_lain.append(sel_write_only(ws_lain, baris_bertipe(row, formats), formats))
+        jumlah_sheet[judul] = len(rows)
+
+    simpan_atomik(wb, xlsx_file)
+    return {"baris": jumlah, "sheets": jumlah_sheet}
+
+
+def _baris_sheet(ws, no_awal=1):
+    """
+    Baris data sebuah sheet read-only dengan 'No' >= no_awal
+
+    'No' biasanya sama dengan nomor baris - 1, jadi pembacaan langsung
+    dimulai di sekitar no_awal; jika ternyata ada baris yang terlewat,
+    sheet dibaca dari awal.
+    """
+    mulai = max(2, no_awal)
+    if mulai > 2:
+        pertama = next(ws.iter_rows(min_row=mulai, max_row=mulai, values_only=True), None)
+        if not pertama or not isinstance(pertama[0], int) or pertama[0] > no_awal:
+            mulai = 2
+    for row in ws.iter_rows(min_row=mulai, values_only=True):
+        if all(v is None for v in row):
+            continue
+        if isinstance(row[0], int) and row[0] < no_awal:
+            continue
+        yield row
+
+
+def _sumber_xlsx(files, no_awal, no_awal_sheet):
+    """Header, judul, baris utama dan sheet tambahan dari file Excel (satu atau beberapa shard)"""
+    from openpyxl import load_workbook
+
+    wbs = [load_workbook(f, read_only=True) for f in files]
+    try:
+        utama = wbs[0].worksheets[0]
+        header = list(next(utama.iter_rows(max_row=1, values_only=True), None) or [])
+
+        def rows():
+            for wb in wbs:
+                yield from _baris_sheet(wb.worksheets[0], no_awal)
+
+        lampiran = {}
+        for ws in wbs[0].worksheets[1:]:
+            h = list(next(ws.iter_rows(max_row=1, values_only=True), None) or [])
+            isi = []
+            for wb in wbs:
+                if ws.title in wb.sheetnames:
+                    isi.extend(_baris_sheet(wb[ws.title], no_awal_sheet.get(ws.title, 1)))
+            lampiran[ws.title] = (h, isi)
+        return header, utama.title, rows(), lampiran, wbs
+    except Exception:
+        for wb in wbs:
+            wb.close()
+        raise
+
+
+def arsipkan(excel_file, storage="excel", no_awal=1, no_awal_sheet=None, arsip=None, info=None):
+    """
+    Mengarsip baris logger mulai dari 'No' tertentu (misal satu sesi yang baru selesai)
+
+    Args:
+        excel_file (str): Nama file Excel logger (dasar shard untuk 'stream',
+                          nama database untuk 'sqlite')
+        storage (str): Mode penyimpanan sesi ('excel', 'stream' atau 'sqlite')
+        no_awal (int): 'No' pertama yang diarsip di sheet utama
+        no_awal_sheet (dict): 'No' pertama per sheet tambahan (default: 1)
+        arsip (str): File arsip (default: arsip_path(excel_file))
+        info (dict): Keterangan tambahan untuk entri sesi
+
+    Returns:
+        dict: Entri sesi di index, None jika tidak ada baris baru
+    """
+    from storageBackend import STORAGE_SQLITE, STORAGE_STREAM
+
+    arsip = arsip or arsip_path(excel_file)
+    no_awal_sheet = dict(no_awal_sheet or {})
+    info = dict(info or {}, file=os.path.basename(excel_file), storage=storage)
+
+    if storage == STORAGE_SQLITE:
+        from sqliteWriter import KOLOM, _meta, buka_database, database_path
+
+        con = buka_database(database_path(excel_file), baca_saja=True)
+        try:
+            header, title, sheets = _meta(con)
+            kolom = ", ".join(KOLOM[h] for h in header)
+            rows = con.execute(f"SELECT {kolom} FROM data WHERE no >= ? ORDER BY no", (no_awal,))
+            lampiran = {
+                nama: (h, [json.loads(isi) for (isi,) in con.execute(
+                    "SELECT isi FROM sheet WHERE nama = ? AND no >= ? ORDER BY no",
+                    (nama, no_awal_sheet.get(nama, 1)))])
+                for nama, h in sheets.items()
+            }
+            return tulis_sesi(arsip, rows, header, title, lampiran, info)
+        finally:
+            con.close()
+
+    if storage == STORAGE_STREAM:
+        from shardedWriter import baca_manifest
+        files = [s["file"] for s in baca_manifest(excel_file)
+                 if s.get("closed") and (s.get("last_no") or 0) >= no_awal and os.path.exists(s["file"])]
+        if not files:
+            return None
+    else:
+        files = [excel_file]
+
+    header, title, rows, lampiran, wbs = _sumber_xlsx(files, no_awal, no_awal_sheet)
+    try:
+        return tulis_sesi(arsip, rows, header, title, lampiran, info)
+    finally:
+        for wb in wbs:
+            wb.close()
+
+
+def arsipkan_file(path, arsip=None):
+    """
+    Mengarsip file Excel atau database logger secara utuh (mode bulk)
+
+    Jika file ini sudah pernah diarsip, hanya baris dengan 'No' setelah
+    sesi arsip terakhirnya yang ditambahkan; file yang tidak berubah dilewati.
+
+    Args:
+        path (str): File .xlsx atau database .db
+        arsip (str): File arsip (default: arsip_path(path))
+
+    Returns:
+        dict: Entri sesi baru, None jika tidak ada yang perlu diarsip
+    """
+    from sqliteWriter import EKSTENSI_DB
+    from storageBackend import STORAGE_EXCEL, STORAGE_SQLITE
+
+    arsip = arsip or arsip_path(path)
+    st = os.stat(path)
+    stempel = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+    no_awal = 1
+    no_awal_sheet = {}
+    if os.path.exists(arsip):
+        footer, _ = baca_footer(arsip)
+        lama = [s for s in footer["sesi"] if s.get("file") == os.path.basename(path)]
+        if lama and lama[-1].get("stempel") == stempel:
+            return None
+        for s in lama:
+            if s["no_akhir"] is not None:
+                no_awal = max(no_awal, s["no_akhir"] + 1)
+            for judul, entri in s["lampiran"].items():
+                if entri.get("no_akhir") is not None:
+                    no_awal_sheet[judul] = max(no_awal_sheet.get(judul, 1), entri["no_akhir"] + 1)
+
+    storage = STORAGE_SQLITE if os.path.splitext(path)[1].lower() in EKSTENSI_DB else STORAGE_EXCEL
+    # Stempel file sumber dicatat agar run berikutnya bisa melewatinya
+    return arsipkan(path, storage, no_awal, no_awal_sheet, arsip, {"stempel": stempel})
+
+
+def _ukuran(n):
+    """Ukuran byte untuk ditampilkan"""
+    for satuan in ("B", "kB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {satuan}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def main(argv=None):
+    import argparse
+    import glob
+
+    parser = argparse.ArgumentParser(description="Arsip kolom terkompresi untuk file logger tekanan")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+
+    p = sub.add_parser("arsip", help="Arsipkan file Excel/database logger (file, pola atau folder)")
+    p.add_argument("file", nargs="+")
+
+    p = sub.add_parser("info", help="Tampilkan daftar sesi di arsip")
+    p.add_argument("arsip")
+
+    p = sub.add_parser("ekspor", help="Buat file Excel dari rentang waktu atau sesi")
+    p.add_argument("arsip")
+    p.add_argument("xlsx", help="File Excel tujuan (ditimpa)")
+    p.add_argument("--mulai", help="Timestamp awal, misal '2026-10-01' atau '2026-10-01 08:00'")
+    p.add_argument("--sampai", help="Timestamp akhir (inklusif)")
+    p.add_argument("--sesi", type=int, help="Nomor sesi")
+    args = parser.parse_args(argv)
+
+    if args.perintah == "arsip":
+        files = []
+        for pola in args.file:
+            if os.path.isdir(pola):
+                cocok = sorted(glob.glob(os.path.join(pola, "*.xlsx")) + glob.glob(os.path.join(pola, "*.db")))
+            else:
+                cocok = sorted(glob.glob(pola)) or [pola]
+            files.extend(f for f in cocok if not f.endswith(".tmp"))
+        status = 0
+        for path in dict.fromkeys(files):
+            if not os.path.exists(path):
+                print(f"Error: '{path}' tidak ditemukan", file=sys.stderr)
+                status = 2
+                continue
+            try:
+                sesi = arsipkan_file(path)
+            except Exception as e:
+                print(f"⚠ {path}: {e}", file=sys.stderr)
+                status = 1
+                continue
+            if sesi is None:
+                print(f"- {path}: sudah diarsip, tidak ada baris baru")
+                continue
+            print(f"✓ {path} -> {arsip_path(path)}: sesi {sesi['id']}, {sesi['baris']} baris "
+                  f"({_ukuran(os.path.getsize(path))} -> arsip {_ukuran(os.path.getsize(arsip_path(path)))})")
+        return status
+
+    if not os.path.exists(args.arsip):
+        print(f"Error: '{args.arsip}' tidak ditemukan", file=sys.stderr)
+        return 2
+
+    if args.perintah == "info":
+        footer, _ = baca_footer(args.arsip)
+        print(f"{'Sesi':>5} | {'Mulai':<19} | {'Selesai':<19} | {'Baris':>8} | {'Chunk':>5} | File")
+        for s in footer["sesi"]:
+            mulai = _dari_detik(s["t_awal"]) if s["t_awal"] is not None else "-"
+            selesai = _dari_detik(s["t_akhir"]) if s["t_akhir"] is not None else "-"
+            print(f"{s['id']:>5} | {str(mulai):<19} | {str(selesai):<19} | {s['baris']:>8} | "
+                  f"{len(s['chunk']):>5} | {s.get('file', '')}")
+        return 0
+
+    hasil = ekspor_xlsx(args.arsip, args.xlsx, args.mulai, args.sampai, args.sesi)
+    lain = "".join(f", {n} {nama}" for nama, n in hasil["sheets"].items())
+    print(f"✓ {hasil['baris']} baris{lain} diekspor ke {args.xlsx}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""
+Event loop sesi logging: serial dan keyboard ditunggu bersamaan.
+
+Loop tidur di selectors sampai ada frame serial atau stdin yang siap,
+lalu langsung memproses sumber tersebut. Tidak ada timeout polling,
+sehingga CPU saat idle mendekati nol dan input manual diproses begitu
+Enter ditekan.
+
+Setiap port dibaca oleh thread SerialReader sendiri yang membangunkan
+selector lewat socketpair, sehingga journal, print atau input manual
+yang lambat tidak pernah menahan pembacaan port. Di Linux/Mac fd stdin
+didaftarkan langsung ke selector; di Windows (konsol tidak bisa
+di-select) dan jika stdin dialihkan dari file, stdin dibaca thread
+pembantu.
+"""
+import os
+import queue
+import selectors
+import socket
+import sys
+import threading
+import time
+
+from sessionStats import INTERVAL_DUMP, tulis_stats
+
+# Sumber event dari thread pembantu / hentikan()
+_EVENT_STDIN = "stdin"
+_EVENT_SERIAL = "serial"
+_EVENT_STOP = "stop"
+
+
+class SessionLoop:
+    """
+    Menjalankan satu sesi logging untuk satu atau beberapa PortLogger
+
+    Args:
+        loggers (list): PortLogger yang sudah dibuka
+        stdin (file): Sumber perintah keyboard, None = tanpa input manual
+                      (default: sys.stdin)
+        stats_file (str): File JSON lines untuk snapshot statistik berkala
+                          (default: None = tidak ditulis)
+        stats_interval (float): Jarak antar snapshot dalam detik (default: 10)
+    """
+
+    def __init__(self, loggers, stdin=sys.stdin, stats_file=None, stats_interval=INTERVAL_DUMP):
+        self.loggers = list(loggers)
+        self.stdin = stdin
+        self.aktif = self.loggers[0]
+        self.stats_file = stats_file
+        self.stats_interval = stats_interval
+
+        self._sel = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._events = queue.SimpleQueue()
+        self._berhenti = False
+
+        # Status input manual detail: None, 'nilai' atau 'keterangan'
+        self._mode = None
+        self._nilai = None
+        self._sisa_stdin = b""
+
+        self._posix = os.name == "posix"
+
+    def hentikan(self):
+        """Meminta loop berhenti (aman dipanggil dari thread lain)"""
+        self._kirim_event(_EVENT_STOP, None, None)
+
+    def jalankan(self):
+        """
+        Menjalankan loop sampai Ctrl+C, hentikan() dipanggil atau semua
+        port terputus. EOF di stdin hanya mematikan input manual.
+        """
+        self._sel.register(self._wake_r, selectors.EVENT_READ, (_EVENT_STOP, None))
+
+        for logger in self.loggers:
+            logger.mulai_baca(lambda logger=logger: self._kirim_event(_EVENT_SERIAL, logger, None))
+
+        if self.stdin is not None:
+            thread_stdin = not self._posix
+            if self._posix:
+                try:
+                    self._sel.register(self.stdin.fileno(), selectors.EVENT_READ, (_EVENT_STDIN, None))
+                except PermissionError:
+                    # epoll menolak file biasa dan /dev/null ('< file', service)
+                    thread_stdin = True
+            if thread_stdin:
+                threading.Thread(target=self._baca_stdin_thread, name="stdin", daemon=True).start()
+
+        dump_berikutnya = time.monotonic() + self.stats_interval
+        timeout = None
+
+        try:
+            while not self._berhenti:
+                if self.stats_file is not None:
+                    timeout = max(0.0, dump_berikutnya - time.monotonic())
+
+                for key, _ in self._sel.select(timeout):
+                    jenis, _ = key.data
+                    if jenis == _EVENT_STDIN:
+                        self._stdin_siap()
+                    else:
+                        self._proses_events()
+
+                if self.stats_file is not None and time.monotonic() >= dump_berikutnya:
+                    self._dump_stats()
+                    dump_berikutnya = time.monotonic() + self.stats_interval
+
+                if not any(logger.aktif for logger in self.loggers):
+                    print("Semua koneksi serial terputus")
+                    break
+        except KeyboardInterrupt:
+            print("\n\nProses dihentikan oleh user")
+        finally:
+            if self.stats_file is not None:
+                self._dump_stats()
+            self._sel.close()
+            self._wake_r.close()
+            self._wake_w.close()
+
+    def _dump_stats(self):
+        """Menambahkan snapshot statistik semua port ke stats_file"""
+        try:
+            tulis_stats(self.stats_file, {logger.port: logger.ringkasan_stats().ringkasan()
+                                          for logger in self.loggers})
+        except OSError as e:
+            print(f"⚠ Gagal menulis statistik: {e}")
+
+    def cetak_stats(self):
+        """Mencetak statistik semua port ke console"""
+        for logger in self.loggers:
+            label = f"{logger.port} " if len(self.loggers) > 1 else ""
+            print(logger.ringkasan_stats().teks(label))
+        print("-" * 60)
+
+    def _kirim_event(self, jenis, logger, isi):
+        """Mengantre event dari thread lain lalu membangunkan selector"""
+        self._events.put((jenis, logger, isi))
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            # Buffer socket penuh (selector sudah pasti bangun) atau sudah ditutup
+            pass
+
+    def _proses_events(self):
+        """Memproses event dari thread pembantu"""
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+        while True:
+            try:
+                jenis, logger, isi = self._events.get_nowait()
+            except queue.Empty:
+                return
+
+            if jenis == _EVENT_STOP:
+                self._berhenti = True
+            elif jenis == _EVENT_SERIAL:
+                logger.proses_antrean()
+            elif jenis == _EVENT_STDIN:
+                if isi is None:
+                    self._eof()
+                else:
+                    self._proses_input(isi)
+
+    def _stdin_siap(self):
+        """Membaca baris-baris yang tersedia dari stdin"""
+        data = os.read(self.stdin.fileno(), 4096) # type: ignore
+        if not data:
+            self._sel.unregister(self.stdin.fileno()) # type: ignore
+            self._eof()
+            return
+
+        data = self._sisa_stdin + data
+        *lines, self._sisa_stdin = data.split(b"\n")
+        for line in lines:
+            self._proses_input(line.decode("utf-8", errors="ignore"))
+
+    def _eof(self):
+        """stdin ditutup (misal '< /dev/null' atau service): logging jalan terus tanpa input manual"""
+        if self._sisa_stdin:
+            # Baris terakhir tanpa '\n'
+            line, self._sisa_stdin = self._sisa_stdin, b""
+            self._proses_input(line.decode("utf-8", errors="ignore"))
+        print("Input keyboard ditutup, logging tetap berjalan (Ctrl+C untuk berhenti)")
+
+    def _baca_stdin_thread(self):
+        """Thread pembantu (Windows, stdin file): membaca stdin lalu meneruskan baris ke loop"""
+        while True:
+            try:
+                line = self.stdin.readline()
+            except (OSError, ValueError):
+                line = ""
+            if not line:
+                self._kirim_event(_EVENT_STDIN, None, None)
+                return
+            self._kirim_event(_EVENT_STDIN, None, line)
+
+    def _proses_input(self, user_input):
+        """
+        Memproses satu baris perintah keyboard
+
+        Args:
+            user_input (str): Baris yang diketik user
+        """
+        user_input = user_input.strip()
+        try:
+            if self._mode == "nilai":
+                self._input_nilai(user_input)
+            elif self._mode == "keterangan":
+                self._input_keterangan(user_input)
+            else:
+                self._perintah(user_input)
+        except Exception as e:
+            print(f"⚠ Error: {e}")
+
+    def _perintah(self, user_input):
+        """Perintah di mode otomatis: 's', 'p <nomor>', 'm <nilai>' atau 'm'"""
+        # Statistik jalur data: 's'
+        if user_input.lower() in ['s', 'stats']:
+            self.cetak_stats()
+            return
+
+        # Pilih mesin tujuan: 'p <nomor>'
+        if user_input.lower().startswith('p') and len(self.loggers) > 1:
+            parts = user_input.split()
+            try:
+                self.aktif = self.loggers[int(parts[1]) - 1]
+                print(f"✓ Input manual diarahkan ke {self.aktif.port}")
+            except (IndexError, ValueError):
+                print(f"⚠ Gunakan format: p <nomor 1-{len(self.loggers)}>")
+            return
+
+        # Cek jika input dimulai dengan 'm' atau 'manual'
+        if not user_input.lower().startswith('m'):
+            return
+
+        parts = user_input.split(maxsplit=1)
+
+        # Jika ada nilai langsung setelah 'm' (contoh: m 25.5)
+        if len(parts) > 1:
+            try:
+                nilaiKN = float(parts[1])
+            except ValueError:
+                print(f"⚠ Nilai tidak valid: '{parts[1]}' - gunakan format: m <angka>")
+                return
+            self.aktif.tambah_manual(nilaiKN, "Input cepat")
+            print("-" * 40)
+            return
+
+        # Jika hanya 'm' tanpa nilai, masuk mode input detail
+        print("\n" + "="*60)
+        print(f"MODE INPUT MANUAL{f' - {self.aktif.port}' if len(self.loggers) > 1 else ''}")
+        print("="*60)
+        self._mode = "nilai"
+        self._prompt(f"[Data #{self.aktif.counter}] Masukkan nilai kN: ")
+
+    def _input_nilai(self, nilai_input):
+        """Langkah 1 input detail: nilai kN"""
+        if nilai_input.lower() in ['batal', 'cancel']:
+            print("Input manual dibatalkan\n")
+            self._selesai_manual()
+            return
+
+        try:
+            self._nilai = float(nilai_input)
+        except ValueError:
+            print("⚠ Input harus berupa angka! (atau ketik 'batal' untuk keluar)")
+            self._prompt(f"[Data #{self.aktif.counter}] Masukkan nilai kN: ")
+            return
+
+        self._mode = "keterangan"
+        self._prompt("   Keterangan (Enter untuk skip): ")
+
+    def _input_keterangan(self, keterangan):
+        """Langkah 2 input detail: keterangan, lalu simpan"""
+        self.aktif.tambah_manual(self._nilai, keterangan or "Input manual")
+        print("="*60 + "\n")
+        self._selesai_manual()
+
+    def _selesai_manual(self):
+        """Kembali ke mode otomatis setelah input detail"""
+        self._mode = None
+        self._nilai = None
+        print("Kembali ke mode otomatis...\n")
+        print("Ketik 'm <nilai>' atau 'm' lalu Enter untuk input manual lagi")
+
+    def _prompt(self, teks):
+        """Mencetak prompt tanpa baris baru"""
+        print(teks, end="", flush=True)
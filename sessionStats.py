@@ -0,0 +1,173 @@
+"""
+Statistik jalur data sesi logging: waktu per tahap dan penghitung frame.
+
+Setiap tahap (baca serial, antre, parse, journal, append ke sheet, simpan
+file) dicatat ke histogram log2 dalam nanodetik. Satu pencatatan hanya berupa
+beberapa penjumlahan integer, jadi statistik selalu aktif tanpa beban
+yang berarti. Setiap histogram hanya diisi oleh satu thread (pembaca
+serial, loop sesi atau thread penulis), sehingga tidak perlu lock.
+"""
+import json
+import time
+from datetime import datetime
+
+# Tahap jalur data
+TAHAP_BACA = "baca"
+TAHAP_ANTRE = "antre"
+TAHAP_PARSE = "parse"
+TAHAP_JOURNAL = "journal"
+TAHAP_APPEND = "append"
+TAHAP_SAVE = "save"
+
+TAHAP = (TAHAP_BACA, TAHAP_ANTRE, TAHAP_PARSE, TAHAP_JOURNAL, TAHAP_APPEND, TAHAP_SAVE)
+
+# Penghitung
+PENGHITUNG = ("bytes", "frame_dibaca", "frame_ovalue", "frame_ditolak", "frame_lain", "frame_dibuang",
+              "frame_overflow", "backpressure", "antrean_maks", "antrean_os_maks",
+              "baris_disimpan", "baris_pending", "baris_difilter")
+
+# Interval default dump statistik ke file (detik)
+INTERVAL_DUMP = 10.0
+
+_BUCKETS = 64
+
+
+class Histogram:
+    """Histogram durasi dengan bucket pangkat dua (nanodetik)"""
+
+    __slots__ = ("n", "total_ns", "max_ns", "bucket")
+
+    def __init__(self):
+        self.n = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.bucket = [0] * _BUCKETS
+
+    def catat(self, ns):
+        """
+        Mencatat satu durasi
+
+        Args:
+            ns (int): Durasi dalam nanodetik
+        """
+        self.n += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.bucket[ns.bit_length()] += 1
+
+    def persentil(self, p):
+        """
+        Perkiraan persentil (batas atas bucket)
+
+        Args:
+            p (float): Persentil 0-100
+
+        Returns:
+            int: Durasi dalam nanodetik
+        """
+        if not self.n:
+            return 0
+        target = self.n * p / 100
+        jumlah = 0
+        for i, n in enumerate(self.bucket):
+            jumlah += n
+            if jumlah >= target:
+                return min((1 << i) - 1, self.max_ns)
+        return self.max_ns
+
+    def ringkasan(self):
+        """
+        Returns:
+            dict: {'n', 'total_ms', 'rata_us', 'p50_us', 'p99_us', 'maks_us'}
+        """
+        return {
+            "n": self.n,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "rata_us": round(self.total_ns / self.n / 1e3, 1) if self.n else 0.0,
+            "p50_us": round(self.persentil(50) / 1e3, 1),
+            "p99_us": round(self.persentil(99) / 1e3, 1),
+            "maks_us": round(self.max_ns / 1e3, 1),
+        }
+
+
+class SessionStats:
+    """
+    Histogram per tahap dan penghitung untuk satu port
+    """
+
+    def __init__(self):
+        self.mulai = time.monotonic()
+        self.tahap = {nama: Histogram() for nama in TAHAP}
+        self.counter = dict.fromkeys(PENGHITUNG, 0)
+
+    def catat(self, tahap, ns):
+        """
+        Mencatat durasi satu tahap
+
+        Args:
+            tahap (str): Salah satu TAHAP_*
+            ns (int): Durasi dalam nanodetik (dari time.perf_counter_ns)
+        """
+        self.tahap[tahap].catat(ns)
+
+    def tambah(self, nama, n=1):
+        """
+        Menambah penghitung
+
+        Args:
+            nama (str): Nama penghitung
+            n (int): Pertambahan (default: 1)
+        """
+        self.counter[nama] += n
+
+    def ringkasan(self):
+        """
+        Returns:
+            dict: {'durasi_s', 'counter', 'tahap'} siap di-JSON-kan
+        """
+        return {
+            "durasi_s": round(time.monotonic() - self.mulai, 1),
+            "counter": dict(self.counter),
+            "tahap": {nama: h.ringkasan() for nama, h in self.tahap.items() if h.n},
+        }
+
+    def teks(self, label=""):
+        """
+        Ringkasan untuk dicetak ke console
+
+        Args:
+            label (str): Judul (misal nama port)
+
+        Returns:
+            str: Beberapa baris teks
+        """
+        r = self.ringkasan()
+        c = r["counter"]
+        baris = [
+            f"Statistik {label}({r['durasi_s']} detik)",
+            f"  Frame: {c['frame_dibaca']} dibaca, {c['frame_ovalue']} ovalue, "
+            f"{c['frame_ditolak']} tidak lengkap, {c['frame_lain']} lain, {c['frame_dibuang']} dibuang",
+            f"  Antrean: maks {c['antrean_maks']} frame, OS maks {c['antrean_os_maks']} byte, "
+            f"{c['backpressure']} backpressure, {c['frame_overflow']} frame hilang",
+            f"  Baris: {c['baris_disimpan']} tersimpan, {c['baris_pending']} menunggu, "
+            f"{c['baris_difilter']} difilter | {c['bytes']} byte",
+            f"  {'Tahap':<8} {'n':>8} {'rata us':>10} {'p50 us':>10} {'p99 us':>10} {'maks us':>10}",
+        ]
+        for nama, h in r["tahap"].items():
+            baris.append(f"  {nama:<8} {h['n']:>8} {h['rata_us']:>10} {h['p50_us']:>10} "
+                         f"{h['p99_us']:>10} {h['maks_us']:>10}")
+        return "\n".join(baris)
+
+
+def tulis_stats(path, ringkasan_port):
+    """
+    Menambahkan satu snapshot statistik ke file JSON lines
+
+    Args:
+        path (str): Nama file statistik
+        ringkasan_port (dict): {port: SessionStats.ringkasan()}
+    """
+    record = {"waktu": datetime.now().isoformat(timespec="seconds"), "ports": ringkasan_port}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
@@ -0,0 +1,311 @@
+"""
+Penulis Excel streaming (write-only) dengan rollover otomatis.
+
+Baris di-stream ke workbook write-only openpyxl sehingga memori tetap
+datar berapa pun panjang sesinya. File dipecah (shard) per jumlah baris,
+per hari atau per perkiraan ukuran, misal 'pressure_data_2026-10-16_001.xlsx',
+dan daftar shard dicatat di manifest 'pressure_data.manifest.json'.
+
+Workbook write-only hanya bisa disimpan sekali, jadi sebuah shard baru
+tertulis ke disk saat ditutup. Sampai saat itu barisnya dijaga oleh journal.
+"""
+import json
+import os
+import time
+from datetime import date, datetime
+
+from cellFormat import baris_bertipe, sel_write_only
+from excelWriter import BufferedExcelWriter, simpan_atomik
+from sessionStats import TAHAP_APPEND, TAHAP_SAVE
+
+# Kebijakan rollover default
+SHARD_ROWS = 100000
+
+# Perkiraan overhead XML per sel untuk batas ukuran
+_BYTES_PER_SEL = 30
+
+
+class ShardPolicy:
+    """
+    Kapan shard aktif ditutup dan shard baru dimulai
+
+    Args:
+        max_rows (int): Jumlah baris data maksimum per shard (default: 100000)
+        harian (bool): Mulai shard baru saat tanggal berganti (default: True)
+        max_bytes (int): Perkiraan ukuran data sheet maksimum per shard, None = tanpa batas
+    """
+
+    def __init__(self, max_rows=SHARD_ROWS, harian=True, max_bytes=None):
+        if max_rows < 1:
+            raise ValueError("max_rows minimal 1")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("max_bytes harus lebih dari 0")
+        self.max_rows = int(max_rows)
+        self.harian = bool(harian)
+        self.max_bytes = max_bytes
+
+    def __repr__(self):
+        return (f"ShardPolicy(max_rows={self.max_rows}, harian={self.harian}, "
+                f"max_bytes={self.max_bytes})")
+
+
+def manifest_path(excel_file):
+    """
+    Nama file manifest untuk sebuah nama file Excel dasar
+
+    Args:
+        excel_file (str): Nama file Excel dasar (misal: 'pressure_data.xlsx')
+
+    Returns:
+        str: Nama file manifest (misal: 'pressure_data.manifest.json')
+    """
+    root, _ = os.path.splitext(excel_file)
+    return root + ".manifest.json"
+
+
+def baca_manifest(excel_file):
+    """
+    Membaca daftar shard dari manifest
+
+    Args:
+        excel_file (str): Nama file Excel dasar
+
+    Returns:
+        list: Daftar entri shard (dict), kosong jika manifest belum ada
+    """
+    try:
+        with open(manifest_path(excel_file), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return []
+    return list(manifest.get("shards", []))
+
+
+def tulis_manifest(excel_file, shards):
+    """
+    Menulis daftar shard ke manifest secara atomik
+
+    Args:
+        excel_file (str): Nama file Excel dasar
+        shards (list): Daftar entri shard
+    """
+    path = manifest_path(excel_file)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"base": os.path.basename(excel_file), "shards": shards}, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class ShardedExcelWriter(BufferedExcelWriter):
+    """
+    Writer streaming dengan rollover; antarmuka sama dengan BufferedExcelWriter
+
+    Args:
+        excel_file (str): Nama file Excel dasar, dipakai untuk nama shard
+        header (list): Baris header setiap shard
+        title (str): Judul sheet setiap shard
+        policy (FlushPolicy): Kebijakan flush buffer ke stream
+        shard_policy (ShardPolicy): Kebijakan rollover (default: ShardPolicy())
+        journal (bool): Catat setiap baris ke journal sebelum di-buffer (default: True)
+        extra_sheets (dict): Sheet tambahan {judul: header} di setiap shard
+        stats (SessionStats): Tempat mencatat waktu journal/append/save (default: None)
+    """
+
+    def __init__(self, excel_file, header, title, policy=None, shard_policy=None, journal=True,
+                 extra_sheets=None, stats=None):
+        super().__init__(excel_file, header, title, policy, journal, extra_sheets, stats)
+        self.shard_policy = shard_policy or ShardPolicy()
+        self.shards = []
+        self._shard = None
+        self._shard_bytes = 0
+        self._sheets_ws = {}
+        # Nomor terakhir sebelum shard aktif dibuka, untuk pemulihan jika gagal disimpan
+        self._awal = (0, {})
+
+    @property
+    def shard_file(self):
+        """Nama file shard yang sedang ditulis, None jika belum ada"""
+        return self._shard["file"] if self._shard else None
+
+    def open(self):
+        """
+        Membaca manifest lalu menjalankan thread penulis
+
+        Nomor 'No' berikutnya diambil dari shard terakhir yang sudah
+        ditutup; baris shard yang belum sempat ditutup diputar ulang dari
+        journal.
+
+        Returns:
+            int: Nomor 'No' berikutnya untuk baris baru
+        """
+        shards = baca_manifest(self.excel_file)
+        for entry in shards:
+            if not entry.get("closed") and os.path.exists(entry["file"]):
+                # Shard tersimpan tapi manifest belum diperbarui; barisnya
+                # masih ada di journal dan akan ditulis ulang ke shard baru
+                os.remove(entry["file"])
+        self.shards = [entry for entry in shards if entry.get("closed")]
+        if len(self.shards) != len(shards):
+            tulis_manifest(self.excel_file, self.shards)
+
+        self.file_baru = not self.shards
+        if self.shards:
+            terakhir = self.shards[-1]
+            self._last_no = terakhir["last_no"] or 0
+            for nama in self.extra_sheets:
+                self._last_no_sheet[nama] = terakhir.get("sheets", {}).get(nama, 0)
+        self.next_no = self._last_no + 1
+        self._mulai()
+        return self.next_no
+
+    def _tulis(self, rows):
+        """Men-stream baris ke shard aktif, berganti shard bila perlu"""
+        t0 = time.perf_counter_ns()
+        for sheet, row in rows:
+            formats = self._formats[sheet]
+            row = baris_bertipe(row, formats)
+            tanggal = _tanggal_baris(row)
+            if self._shard is None:
+                self._buka_shard(tanggal)
+            elif sheet is None and self._perlu_rollover(tanggal):
+                self._tutup_shard()
+                self._buka_shard(tanggal)
+
+            # Baris sheet tambahan ikut shard yang sedang aktif
+            ws = self.ws if sheet is None else self._sheets_ws[sheet]
+            try:
+                ws.append(sel_write_only(ws, row, formats)) # type: ignore
+            except Exception as e:
+                print(f"⚠ Baris No {row[0]} dilewati, tidak bisa ditulis ke shard "
+                      f"'{self._shard['file']}': {e}") # type: ignore
+                continue
+            if sheet is not None:
+                self._last_no_sheet[sheet] = row[0]
+                continue
+
+            self._last_no = row[0]
+            self._shard_bytes += sum(len(str(v)) for v in row) + _BYTES_PER_SEL * len(row)
+
+            entry = self._shard
+            if entry["first_no"] is None: # type: ignore
+                entry["first_no"] = row[0] # type: ignore
+                entry["start"] = str(row[1]) # type: ignore
+            entry["last_no"] = row[0] # type: ignore
+            entry["end"] = str(row[1]) # type: ignore
+            entry["rows"] += 1 # type: ignore
+
+        if self.stats is not None:
+            # Termasuk penyimpanan shard saat rollover di tengah batch
+            self.stats.catat(TAHAP_APPEND, time.perf_counter_ns() - t0)
+
+    def _akhiri(self):
+        """Menutup shard aktif saat writer ditutup"""
+        if self._shard is not None:
+            self._tutup_shard()
+
+    def _perlu_rollover(self, tanggal):
+        """True jika baris berikutnya harus masuk shard baru"""
+        sp = self.shard_policy
+        entry = self._shard
+        if entry["rows"] >= sp.max_rows: # type: ignore
+            return True
+        if sp.harian and entry["tanggal"] != tanggal: # type: ignore
+            return True
+        if sp.max_bytes is not None and self._shard_bytes >= sp.max_bytes:
+            return True
+        return False
+
+    def _buka_shard(self, tanggal):
+        """Memulai workbook write-only baru untuk shard berikutnya"""
+        root, ext = os.path.splitext(self.excel_file)
+        ext = ext or ".xlsx"
+        nomor = 1 + max((entry.get("nomor", 0) for entry in self.shards
+                         if entry.get("tanggal") == tanggal), default=0)
+        while os.path.exists(f"{root}_{tanggal}_{nomor:03d}{ext}"):
+            nomor += 1
+
+        from openpyxl import Workbook
+        self.wb = Workbook(write_only=True)
+        self.ws = self.wb.create_sheet(self.title)
+        self.ws.append(self.header)
+        self._sheets_ws = {}
+        for nama, header in self.extra_sheets.items():
+            self._sheets_ws[nama] = self.wb.create_sheet(nama)
+            self._sheets_ws[nama].append(header)
+        self._awal = (self._last_no, dict(self._last_no_sheet))
+        self._shard_bytes = 0
+        self._shard = {
+            "file": f"{root}_{tanggal}_{nomor:03d}{ext}",
+            "tanggal": tanggal,
+            "nomor": nomor,
+            "first_no": None,
+            "last_no": None,
+            "rows": 0,
+            "start": None,
+            "end": None,
+            "closed": False,
+        }
+        self.shards.append(self._shard)
+        tulis_manifest(self.excel_file, self.shards)
+
+    def _tutup_shard(self):
+        """Menyimpan shard aktif, memperbarui manifest dan memadatkan journal"""
+        entry = self._shard
+        self._shard = None
+        try:
+            t0 = time.perf_counter_ns()
+            simpan_atomik(self.wb, entry["file"]) # type: ignore
+            if self.stats is not None:
+                self.stats.catat(TAHAP_SAVE, time.perf_counter_ns() - t0)
+        except Exception as e:
+            print(f"⚠ Gagal menyimpan shard '{entry['file']}': {e}") # type: ignore
+            self.shards.remove(entry)
+            self._pulihkan_shard()
+            return
+        finally:
+            self.wb = None
+            self.ws = None
+            self._sheets_ws = {}
+
+        entry["closed"] = True # type: ignore
+        entry["sheets"] = dict(self._last_no_sheet) # type: ignore
+        tulis_manifest(self.excel_file, self.shards)
+        self.rows_saved += entry["rows"] # type: ignore
+
+        if self.journal is not None:
+            try:
+                self.journal.buang_sampai(self._last_no, self._last_no_sheet)
+            except OSError as e:
+                print(f"⚠ Gagal memadatkan journal: {e}")
+
+    def _pulihkan_shard(self):
+        """Mengambil lagi baris shard yang gagal disimpan dari journal ke buffer"""
+        awal_no, awal_sheet = self._awal
+        akhir_no, akhir_sheet = self._last_no, dict(self._last_no_sheet)
+        self._last_no, self._last_no_sheet = awal_no, dict(awal_sheet)
+        if self.journal is None:
+            print("⚠ Journal tidak aktif, baris shard tersebut hilang")
+            return
+
+        records = []
+        for sheet, row in self.journal.baca():
+            if sheet is None:
+                if awal_no < row[0] <= akhir_no:
+                    records.append((sheet, row))
+            elif awal_sheet.get(sheet, 0) < row[0] <= akhir_sheet.get(sheet, 0):
+                records.append((sheet, row))
+        with self._cond:
+            self._pending[:0] = records
+            self._flush_requested = True
+
+
+def _tanggal_baris(row):
+    """Tanggal (YYYY-MM-DD) dari kolom Timestamp sebuah baris"""
+    ts = row[1] if len(row) > 1 else None
+    if isinstance(ts, (datetime, date)):
+        return ts.strftime('%Y-%m-%d')
+    if isinstance(ts, str) and len(ts) >= 10:
+        return ts[:10]
+    return date.today().strftime('%Y-%m-%d')
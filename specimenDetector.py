@@ -0,0 +1,132 @@
+"""
+Deteksi puncak dan segmentasi specimen secara streaming.
+
+Setiap nilai kN dari serial diproses sekali dengan memori tetap per
+specimen: mulai pembebanan, nilai maksimum berjalan, lalu akhir karena
+specimen gagal (nilai turun tajam dari puncak) atau beban dilepas (nilai
+kembali di bawah ambang). Ringkasan specimen ditulis ke sheet 'Specimens'.
+"""
+
+SHEET_SPECIMENS = "Specimens"
+HEADER_SPECIMENS = ["No", "Mulai", "Selesai", "Puncak KN", "Waktu Puncak", "Jumlah Sampel", "Akhir"]
+
+# Ambang default
+AMBANG_MULAI = 1.0
+RASIO_GAGAL = 0.3
+MIN_SAMPEL = 3
+
+
+class SegmentPolicy:
+    """
+    Ambang deteksi specimen
+
+    Args:
+        ambang_mulai (float): Pembebanan dianggap mulai saat nilai >= ambang ini (kN, default: 1.0)
+        ambang_akhir (float): Beban dianggap dilepas saat nilai < ambang ini
+                              (kN, default: sama dengan ambang_mulai)
+        rasio_gagal (float): Specimen dianggap gagal saat nilai turun lebih dari
+                             rasio ini terhadap puncak (default: 0.3 = 30%)
+        min_sampel (int): Segmen dengan sampel lebih sedikit dianggap noise (default: 3)
+    """
+
+    def __init__(self, ambang_mulai=AMBANG_MULAI, ambang_akhir=None, rasio_gagal=RASIO_GAGAL,
+                 min_sampel=MIN_SAMPEL):
+        if ambang_akhir is None:
+            ambang_akhir = ambang_mulai
+        if ambang_akhir > ambang_mulai:
+            raise ValueError("ambang_akhir tidak boleh lebih besar dari ambang_mulai")
+        if not 0 < rasio_gagal < 1:
+            raise ValueError("rasio_gagal harus di antara 0 dan 1")
+        self.ambang_mulai = float(ambang_mulai)
+        self.ambang_akhir = float(ambang_akhir)
+        self.rasio_gagal = float(rasio_gagal)
+        self.min_sampel = int(min_sampel)
+
+    def __repr__(self):
+        return (f"SegmentPolicy(ambang_mulai={self.ambang_mulai}, ambang_akhir={self.ambang_akhir}, "
+                f"rasio_gagal={self.rasio_gagal}, min_sampel={self.min_sampel})")
+
+
+class SpecimenDetector:
+    """
+    State machine deteksi specimen untuk satu mesin
+
+    Args:
+        policy (SegmentPolicy): Ambang deteksi (default: SegmentPolicy())
+    """
+
+    def __init__(self, policy=None):
+        self.policy = policy or SegmentPolicy()
+        self.aktif = False
+        # Setelah specimen selesai, nilai harus kembali di bawah ambang_akhir
+        # sebelum specimen berikutnya bisa dimulai
+        self._siap = True
+        self._mulai = None
+        self._selesai = None
+        self._puncak = 0.0
+        self._sebelumnya = 0.0
+        self._waktu_puncak = None
+        self._n = 0
+
+    def proses(self, nilai, waktu):
+        """
+        Memproses satu nilai
+
+        Args:
+            nilai (float): Nilai kN
+            waktu: Timestamp nilai (disalin apa adanya ke ringkasan)
+
+        Returns:
+            dict: Ringkasan specimen jika specimen baru saja selesai, selain itu None
+        """
+        p = self.policy
+
+        if not self.aktif:
+            if nilai < p.ambang_akhir:
+                self._siap = True
+            if self._siap and nilai >= p.ambang_mulai:
+                self.aktif = True
+                self._mulai = self._selesai = self._waktu_puncak = waktu
+                self._puncak = self._sebelumnya = nilai
+                self._n = 1
+            return None
+
+        self._n += 1
+        self._selesai = waktu
+        if nilai > self._puncak:
+            self._puncak = nilai
+            self._waktu_puncak = waktu
+
+        batas_turun = self._puncak * p.rasio_gagal
+        if nilai <= self._puncak - batas_turun or nilai < p.ambang_akhir:
+            # Jatuh sekaligus dalam satu sampel = gagal, turun bertahap = beban dilepas
+            return self._tutup("GAGAL" if self._sebelumnya - nilai >= batas_turun else "UNLOADING")
+
+        self._sebelumnya = nilai
+        return None
+
+    def akhiri(self):
+        """
+        Menutup specimen yang masih berjalan (misal saat sesi berakhir)
+
+        Returns:
+            dict: Ringkasan specimen, atau None jika tidak ada
+        """
+        if not self.aktif:
+            return None
+        return self._tutup("SESI BERAKHIR")
+
+    def _tutup(self, akhir):
+        """Mengakhiri specimen aktif dan membuat ringkasannya"""
+        self.aktif = False
+        self._siap = False
+        if self._n < self.policy.min_sampel:
+            return None
+        return {
+            "mulai": self._mulai,
+            "selesai": self._selesai,
+            "puncak": self._puncak,
+            "waktu_puncak": self._waktu_puncak,
+            "sampel": self._n,
+            "akhir": akhir,
+        }
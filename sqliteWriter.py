@@ -0,0 +1,424 @@
+"""
+Penyimpanan data logger ke database SQLite dengan ekspor Excel sesuai permintaan.
+
+Baris ditulis oleh thread penulis dalam satu transaksi per batch, dengan
+database dalam mode WAL sehingga ekspor atau dashboard bisa membaca saat
+logging berjalan. Kolomnya sama dengan sheet Excel (No, Timestamp, Nilai KN,
+Sumber, Raw Data/Keterangan), ditambah nomor sesi, dan kolom Timestamp serta
+Sumber diberi index agar rentang waktu bisa diambil tanpa membaca semua data.
+Nilai kN disimpan sebagai REAL dan Timestamp sebagai teks 'YYYY-MM-DD HH:MM:SS'
+agar urutan teks sama dengan urutan waktu; ekspor menulis keduanya sebagai
+sel angka dan datetime.
+
+File workbook dibuat hanya saat diminta lewat ekspor_xlsx(), untuk rentang
+waktu atau sesi tertentu.
+
+Contoh:
+    python sqliteWriter.py sesi pressure_data.db
+    python sqliteWriter.py ekspor pressure_data.db hasil.xlsx --sesi 3
+    python sqliteWriter.py ekspor pressure_data.db hasil.xlsx --mulai 2026-10-01 --sampai "2026-10-02 12:00"
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from cellFormat import FORMAT_TIMESTAMP, baris_bertipe, format_kolom, sel_write_only
+from excelWriter import BufferedExcelWriter
+from sessionStats import TAHAP_APPEND, TAHAP_SAVE
+
+# Ekstensi yang dianggap sudah nama database
+EKSTENSI_DB = (".db", ".sqlite", ".sqlite3")
+
+# Nama kolom tabel 'data' untuk setiap judul kolom sheet
+KOLOM = {
+    "No": "no",
+    "Timestamp": "timestamp",
+    "Nilai KN": "nilai_kn",
+    "Sumber": "sumber",
+    "Raw Data/Keterangan": "keterangan",
+    "Keterangan": "keterangan",
+}
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS meta (kunci TEXT PRIMARY KEY, nilai TEXT);
+CREATE TABLE IF NOT EXISTS sesi (
+    id INTEGER PRIMARY KEY,
+    mulai TEXT NOT NULL,
+    selesai TEXT,
+    baris INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS data (
+    no INTEGER PRIMARY KEY,
+    timestamp TEXT,
+    nilai_kn,
+    sumber TEXT,
+    keterangan TEXT,
+    sesi INTEGER
+);
+CREATE INDEX IF NOT EXISTS data_timestamp ON data (timestamp);
+CREATE INDEX IF NOT EXISTS data_sumber ON data (sumber, timestamp);
+CREATE INDEX IF NOT EXISTS data_sesi ON data (sesi);
+CREATE TABLE IF NOT EXISTS sheet (
+    nama TEXT NOT NULL,
+    no INTEGER NOT NULL,
+    timestamp TEXT,
+    sesi INTEGER,
+    isi TEXT NOT NULL,
+    PRIMARY KEY (nama, no)
+) WITHOUT ROWID;
+"""
+
+
+def database_path(excel_file):
+    """
+    Nama file database untuk sebuah nama file Excel
+
+    Args:
+        excel_file (str): Nama file Excel (misal: 'pressure_data.xlsx')
+
+    Returns:
+        str: Nama file database (misal: 'pressure_data.db'); nama yang sudah
+             berakhiran .db/.sqlite dipakai apa adanya
+    """
+    root, ext = os.path.splitext(excel_file)
+    if ext.lower() in EKSTENSI_DB:
+        return excel_file
+    return root + ".db"
+
+
+def buka_database(db_file, baca_saja=False):
+    """
+    Membuka koneksi database dalam mode WAL
+
+    Args:
+        db_file (str): Nama file database
+        baca_saja (bool): Buka read-only, file harus sudah ada (default: False)
+
+    Returns:
+        sqlite3.Connection: Koneksi dengan isolation_level None (transaksi manual)
+    """
+    if baca_saja:
+        con = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True, isolation_level=None)
+    else:
+        con = sqlite3.connect(db_file, isolation_level=None)
+        con.execute("PRAGMA journal_mode=WAL")
+        # Journal dipadatkan setelah commit, jadi commit harus benar-benar di disk
+        con.execute("PRAGMA synchronous=FULL")
+    con.execute("PRAGMA busy_timeout=5000")
+    return con
+
+
+def buat_skema(con, header, title, extra_sheets=None):
+    """
+    Membuat tabel dan index jika belum ada, serta mencatat header sheet
+
+    Header hanya dicatat saat database baru, ekspor memakai header ini.
+
+    Args:
+        con (sqlite3.Connection): Koneksi database
+        header (list): Header sheet utama
+        title (str): Judul sheet utama
+        extra_sheets (dict): Sheet tambahan {judul: header}
+
+    Returns:
+        bool: True jika database baru dibuat
+    """
+    tidak_dikenal = [h for h in header if h not in KOLOM]
+    if tidak_dikenal:
+        raise ValueError(f"Kolom tidak didukung mode SQLite: {', '.join(tidak_dikenal)}")
+
+    con.executescript(SKEMA)
+    baru = con.execute("SELECT 1 FROM meta WHERE kunci = 'header'").fetchone() is None
+    con.execute("BEGIN")
+    if baru:
+        con.executemany("INSERT INTO meta (kunci, nilai) VALUES (?, ?)",
+                        [("header", json.dumps(list(header))), ("title", title)])
+    for nama, h in (extra_sheets or {}).items():
+        con.execute("INSERT OR IGNORE INTO meta (kunci, nilai) VALUES (?, ?)",
+                    (f"sheet:{nama}", json.dumps(list(h))))
+    con.execute("COMMIT")
+    return baru
+
+
+def _baris_db(row, formats):
+    """Baris dengan kN sebagai float dan waktu sebagai teks timestamp"""
+    row = baris_bertipe(row, formats)
+    return [v.strftime(FORMAT_TIMESTAMP) if isinstance(v, datetime) else v for v in row]
+
+
+def _meta(con):
+    """Header, judul dan header sheet tambahan yang tercatat di database"""
+    meta = dict(con.execute("SELECT kunci, nilai FROM meta"))
+    sheets = {k[len("sheet:"):]: json.loads(v) for k, v in meta.items() if k.startswith("sheet:")}
+    return json.loads(meta["header"]), meta.get("title") or "Pressure Data", sheets
+
+
+class SqliteWriter(BufferedExcelWriter):
+    """
+    Writer ke database SQLite; antarmuka sama dengan BufferedExcelWriter
+
+    Setiap open() mencatat satu sesi baru, dan setiap baris diberi nomor
+    sesi tersebut. Koneksi tulis hanya dipakai oleh thread penulis.
+
+    Args:
+        excel_file (str): Nama file Excel, database disimpan di database_path()
+        header (list): Header sheet utama (judul kolom harus ada di KOLOM)
+        title (str): Judul sheet untuk hasil ekspor
+        policy (FlushPolicy): Ukuran dan interval batch transaksi
+        journal (bool): Catat setiap baris ke journal sebelum di-buffer (default: True)
+        extra_sheets (dict): Sheet tambahan {judul: header}, misal ringkasan 'Specimens'
+        stats (SessionStats): Tempat mencatat waktu journal/insert/commit (default: None)
+    """
+
+    def __init__(self, excel_file, header, title, policy=None, journal=True, extra_sheets=None,
+                 stats=None):
+        super().__init__(database_path(excel_file), header, title, policy, journal, extra_sheets, stats)
+        self.db_file = self.excel_file
+        self.sesi = None
+        self._con = None
+        self._insert = "INSERT OR REPLACE INTO data ({}, sesi) VALUES ({}, ?)".format(
+            ", ".join(KOLOM[h] for h in self.header), ", ".join("?" * len(self.header)))
+
+    def open(self):
+        """
+        Membuka atau membuat database, mencatat sesi baru lalu menjalankan thread penulis
+
+        Returns:
+            int: Nomor 'No' berikutnya untuk baris baru
+        """
+        con = buka_database(self.db_file)
+        try:
+            self.file_baru = buat_skema(con, self.header, self.title, self.extra_sheets)
+            self._last_no = con.execute("SELECT COALESCE(MAX(no), 0) FROM data").fetchone()[0]
+            for nama in self.extra_sheets:
+                self._last_no_sheet[nama] = con.execute(
+                    "SELECT COALESCE(MAX(no), 0) FROM sheet WHERE nama = ?", (nama,)).fetchone()[0]
+            self.sesi = con.execute("INSERT INTO sesi (mulai) VALUES (?)",
+                                    (datetime.now().strftime(FORMAT_TIMESTAMP),)).lastrowid
+        finally:
+            con.close()
+
+        self.next_no = self._last_no + 1
+        self._mulai()
+        return self.next_no
+
+    def _tulis(self, rows):
+        """Menulis satu batch baris dalam satu transaksi"""
+        if self._con is None:
+            self._con = buka_database(self.db_file)
+
+        data = []
+        lain = []
+        for sheet, row in rows:
+            row = _baris_db(row, self._formats[sheet])
+            if sheet is None:
+                data.append((*row, self.sesi))
+            else:
+                ts = row[1] if len(row) > 1 else None
+                lain.append((sheet, row[0], str(ts) if ts is not None else None, self.sesi,
+                             json.dumps(row, ensure_ascii=False, default=str)))
+        self._belum_tersimpan += len(rows)
+
+        try:
+            t0 = time.perf_counter_ns()
+            self._con.execute("BEGIN")
+            if data:
+                self._con.executemany(self._insert, data)
+            if lain:
+                self._con.executemany("INSERT OR REPLACE INTO sheet (nama, no, timestamp, sesi, isi) "
+                                      "VALUES (?, ?, ?, ?, ?)", lain)
+            self._con.execute("UPDATE sesi SET baris = baris + ? WHERE id = ?", (len(data), self.sesi))
+            t1 = time.perf_counter_ns()
+            self._con.execute("COMMIT")
+            if self.stats is not None:
+                self.stats.catat(TAHAP_APPEND, t1 - t0)
+                self.stats.catat(TAHAP_SAVE, time.perf_counter_ns() - t1)
+        except sqlite3.Error as e:
+            if self._con.in_transaction:
+                self._con.execute("ROLLBACK")
+            self._belum_tersimpan -= len(rows)
+            print(f"⚠ Gagal menyimpan ke '{self.db_file}': {e}")
+            # Kembalikan ke buffer, dicoba lagi pada flush berikutnya
+            with self._cond:
+                self._pending[:0] = rows
+            return
+
+        for sheet, row in rows:
+            if sheet is None:
+                self._last_no = row[0]
+            else:
+                self._last_no_sheet[sheet] = row[0]
+        self.rows_saved += self._belum_tersimpan
+        self._belum_tersimpan = 0
+
+        # Compaction: record yang sudah di-commit dibuang dari journal
+        if self.journal is not None:
+            try:
+                self.journal.buang_sampai(self._last_no, self._last_no_sheet)
+            except OSError as e:
+                print(f"⚠ Gagal memadatkan journal: {e}")
+
+    def _akhiri(self):
+        """Mencatat akhir sesi lalu menutup koneksi thread penulis"""
+        try:
+            if self._con is None:
+                self._con = buka_database(self.db_file)
+            self._con.execute("UPDATE sesi SET selesai = ? WHERE id = ?",
+                              (datetime.now().strftime(FORMAT_TIMESTAMP), self.sesi))
+        except sqlite3.Error as e:
+            print(f"⚠ Gagal mencatat akhir sesi: {e}")
+        finally:
+            if self._con is not None:
+                self._con.close()
+                self._con = None
+
+
+def daftar_sesi(db_file):
+    """
+    Daftar sesi logging di database
+
+    Args:
+        db_file (str): Nama file database
+
+    Returns:
+        list: dict per sesi dengan 'id', 'mulai', 'selesai', 'baris',
+              'no_awal' dan 'no_akhir'
+    """
+    con = buka_database(db_file, baca_saja=True)
+    try:
+        hasil = con.execute(
+            "SELECT s.id, s.mulai, s.selesai, s.baris, MIN(d.no), MAX(d.no) "
+            "FROM sesi s LEFT JOIN data d ON d.sesi = s.id GROUP BY s.id ORDER BY s.id").fetchall()
+    finally:
+        con.close()
+    kunci = ("id", "mulai", "selesai", "baris", "no_awal", "no_akhir")
+    return [dict(zip(kunci, r)) for r in hasil]
+
+
+# Pelengkap batas --sampai yang tidak sampai detik
+_AKHIR_BATAS = "0000-00-00 23:59:59"
+
+
+def _filter(mulai=None, sampai=None, sesi=None, sumber=None):
+    """Syarat WHERE dan parameternya untuk ekspor"""
+    syarat = []
+    param = []
+    if mulai:
+        syarat.append("timestamp >= ?")
+        param.append(mulai)
+    if sampai:
+        # Timestamp dibandingkan sebagai teks, jadi batas yang tidak lengkap
+        # dilengkapi sampai detik terakhirnya: tanggal saja = sampai akhir
+        # hari, 'YYYY-MM-DD HH:MM' = sampai detik :59 menit tersebut
+        syarat.append("timestamp <= ?")
+        param.append(sampai + _AKHIR_BATAS[len(sampai):] if len(sampai) in (10, 13, 16) else sampai)
+    if sesi is not None:
+        syarat.append("sesi = ?")
+        param.append(sesi)
+    if sumber:
+        syarat.append("sumber = ?")
+        param.append(sumber)
+    return syarat, param
+
+
+def ekspor_xlsx(db_file, xlsx_file, mulai=None, sampai=None, sesi=None, sumber=None):
+    """
+    Membuat file Excel dari isi database
+
+    Baris di-stream ke workbook write-only, jadi memori tetap kecil
+    berapa pun banyaknya data. Sheet tambahan (misal 'Specimens') ikut
+    diekspor dengan filter waktu dan sesi yang sama.
+
+    Args:
+        db_file (str): Nama file database
+        xlsx_file (str): File Excel tujuan (ditimpa)
+        mulai (str): Timestamp awal 'YYYY-MM-DD[ HH:MM[:SS]]', inklusif
+        sampai (str): Timestamp akhir, inklusif; tanggal saja = sampai akhir hari,
+                      tanpa detik = sampai akhir menit
+        sesi (int): Nomor sesi dari daftar_sesi()
+        sumber (str): Hanya baris dengan sumber ini, misal 'SERIAL' atau 'MANUAL'
+
+    Returns:
+        dict: {'baris': jumlah baris sheet utama, 'sheets': {judul: jumlah baris}}
+    """
+    from openpyxl import Workbook
+
+    from excelWriter import simpan_atomik
+
+    con = buka_database(db_file, baca_saja=True)
+    try:
+        header, title, sheets = _meta(con)
+        kolom = ", ".join(KOLOM[h] for h in header)
+        syarat, param = _filter(mulai, sampai, sesi, sumber if "Sumber" in header else None)
+        where = " WHERE " + " AND ".join(syarat) if syarat else ""
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title)
+        ws.append(header)
+        formats = format_kolom(header)
+        jumlah = 0
+        for row in con.execute(f"SELECT {kolom} FROM data{where} ORDER BY no", param):
+            # Data lama bisa berisi teks '12,5', ikut diubah menjadi angka
+            ws.append(sel_write_only(ws, baris_bertipe(row, formats), formats))
+            jumlah += 1
+
+        jumlah_sheet = {}
+        syarat, param = _filter(mulai, sampai, sesi)
+        where = "".join(" AND " + s for s in syarat)
+        for nama, h in sheets.items():
+            ws_lain = wb.create_sheet(nama)
+            ws_lain.append(h)
+            formats = format_kolom(h)
+            jumlah_sheet[nama] = 0
+            for (isi,) in con.execute(f"SELECT isi FROM sheet WHERE nama = ?{where} ORDER BY no",
+                                      [nama, *param]):
+                ws_lain.append(sel_write_only(ws_lain, baris_bertipe(json.loads(isi), formats), formats))
+                jumlah_sheet[nama] += 1
+    finally:
+        con.close()
+
+    simpan_atomik(wb, xlsx_file)
+    return {"baris": jumlah, "sheets": jumlah_sheet}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Daftar sesi dan ekspor Excel dari database logger")
+    sub = parser.add_subparsers(dest="perintah", required=True)
+
+    p = sub.add_parser("sesi", help="Tampilkan daftar sesi")
+    p.add_argument("database")
+
+    p = sub.add_parser("ekspor", help="Buat file Excel dari rentang waktu atau sesi")
+    p.add_argument("database")
+    p.add_argument("xlsx", help="File Excel tujuan (ditimpa)")
+    p.add_argument("--mulai", help="Timestamp awal, misal '2026-10-01' atau '2026-10-01 08:00'")
+    p.add_argument("--sampai", help="Timestamp akhir (inklusif)")
+    p.add_argument("--sesi", type=int, help="Nomor sesi")
+    p.add_argument("--sumber", help="Hanya sumber ini, misal SERIAL atau MANUAL")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.database):
+        print(f"Error: '{args.database}' tidak ditemukan", file=sys.stderr)
+        return 2
+
+    if args.perintah == "sesi":
+        sesi = daftar_sesi(args.database)
+        print(f"{'Sesi':>5} | {'Mulai':<19} | {'Selesai':<19} | {'Baris':>8} | No")
+        for s in sesi:
+            rentang = f"{s['no_awal']}-{s['no_akhir']}" if s["no_awal"] is not None else "-"
+            print(f"{s['id']:>5} | {s['mulai']:<19} | {s['selesai'] or 'berjalan/terputus':<19} | "
+                  f"{s['baris']:>8} | {rentang}")
+        return 0
+
+    hasil = ekspor_xlsx(args.database, args.xlsx, args.mulai, args.sampai, args.sesi, args.sumber)
+    lain = "".join(f", {n} {nama}" for nama, n in hasil["sheets"].items())
+    print(f"✓ {hasil['baris']} baris{lain} diekspor ke {args.xlsx}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
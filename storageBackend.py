@@ -0,0 +1,50 @@
+"""
+Pemilihan mode penyimpanan untuk fungsi-fungsi logging.
+
+Semua writer punya antarmuka yang sama: open(), append(row),
+append_banyak(rows), flush(), close(), serta atribut next_no, file_baru dan
+rows_replayed. Mode 'sqlite' menyimpan ke database dan workbook baru dibuat
+saat diekspor.
+"""
+from excelWriter import BufferedExcelWriter
+from shardedWriter import ShardedExcelWriter
+from sqliteWriter import SqliteWriter
+
+# Mode penyimpanan yang tersedia
+STORAGE_EXCEL = "excel"
+STORAGE_STREAM = "stream"
+STORAGE_SQLITE = "sqlite"
+
+STORAGE_MODES = (STORAGE_EXCEL, STORAGE_STREAM, STORAGE_SQLITE)
+
+
+def buat_writer(excel_file, header, title, flush_policy=None, storage=STORAGE_EXCEL, shard_policy=None,
+                extra_sheets=None, stats=None):
+    """
+    Membuat writer sesuai mode penyimpanan
+
+    Args:
+        excel_file (str): Nama file Excel (nama dasar shard untuk mode 'stream',
+                          nama dasar database '.db' untuk mode 'sqlite')
+        header (list): Baris header
+        title (str): Judul sheet
+        flush_policy (FlushPolicy): Kapan buffer disimpan (default: FlushPolicy())
+        storage (str): 'excel' = satu workbook biasa,
+                       'stream' = workbook write-only dengan rollover,
+                       'sqlite' = database SQLite, Excel lewat ekspor (default: 'excel')
+        shard_policy (ShardPolicy): Kebijakan rollover untuk mode 'stream'
+        extra_sheets (dict): Sheet tambahan {judul: header}
+        stats (SessionStats): Tempat mencatat waktu per tahap (default: None)
+
+    Returns:
+        BufferedExcelWriter: Writer yang belum dibuka
+    """
+    if storage == STORAGE_EXCEL:
+        return BufferedExcelWriter(excel_file, header, title, flush_policy, extra_sheets=extra_sheets,
+                                   stats=stats)
+    if storage == STORAGE_STREAM:
+        return ShardedExcelWriter(excel_file, header, title, flush_policy, shard_policy,
+                                  extra_sheets=extra_sheets, stats=stats)
+    if storage == STORAGE_SQLITE:
+        return SqliteWriter(excel_file, header, title, flush_policy, extra_sheets=extra_sheets, stats=stats)
+    raise ValueError(f"Mode penyimpanan tidak dikenal: '{storage}' (pilih: {', '.join(STORAGE_MODES)})")
@@ -0,0 +1,50 @@
+"""
+Segmentasi specimen batch (batchAnalysis) harus sama dengan deteksi live
+(SpecimenDetector) untuk deret nilai yang sama.
+"""
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from batchAnalysis import segmen_specimen
+from specimenDetector import SegmentPolicy, SpecimenDetector
+
+
+def _live(kn, policy):
+    """(awal, akhir eksklusif, keterangan akhir) per specimen dari SpecimenDetector"""
+    detector = SpecimenDetector(policy)
+    hasil = [detector.proses(nilai, i) for i, nilai in enumerate(kn)] + [detector.akhiri()]
+    return [(r["mulai"], r["selesai"] + 1, r["akhir"]) for r in hasil if r is not None]
+
+
+def _batch(kn, policy):
+    kn = np.array(kn, dtype=np.float64)
+    t = np.arange(len(kn)).astype("datetime64[s]")
+    return segmen_specimen(t, kn, policy)
+
+
+@pytest.mark.parametrize("kn, diharapkan", [
+    # Patah langsung ke ~0: sampel penutup ikut specimen
+    ([0, 0, 5, 10, 20, 30, 40, 50, 60, 0, 0], [(2, 10, "GAGAL")]),
+    # Beban dilepas bertahap
+    ([0, 10, 20, 30, 25, 20, 15, 10, 5, 0], [(1, 6, "UNLOADING")]),
+    # Specimen berikutnya menunggu nilai lain di bawah ambang_akhir
+    ([0, 10, 20, 0, 10, 20, 30, 0.5, 10, 20, 30], [(1, 4, "GAGAL"), (8, 11, "SESI BERAKHIR")]),
+    ([], []),
+])
+def test_sama_dengan_detector(kn, diharapkan):
+    policy = SegmentPolicy()
+    assert _live(kn, policy) == diharapkan
+    assert _batch(kn, policy) == diharapkan
+
+
+def test_deret_acak_sama_dengan_detector():
+    acak = random.Random(20261016)
+    for _ in range(500):
+        mulai = acak.choice([1.0, 3.0, 5.0])
+        policy = SegmentPolicy(ambang_mulai=mulai, ambang_akhir=acak.choice([0.5, mulai]),
+                               rasio_gagal=acak.choice([0.1, 0.3, 0.5]), min_sampel=acak.choice([1, 3]))
+        kn = [max(0.0, round(acak.gauss(5, 6), 1)) for _ in range(acak.randint(0, 60))]
+        assert _batch(kn, policy) == _live(kn, policy)